@@ -16,6 +16,12 @@ export async function POST(request: NextRequest) {
     const heightValue = formData.get('height')
     const width = widthValue ? parseFloat(widthValue as string) : undefined
     const height = heightValue ? parseFloat(heightValue as string) : undefined
+    const pagesValue = formData.get('pages')
+    const pages = !pagesValue
+      ? undefined
+      : pagesValue === 'all'
+        ? 'all'
+        : (pagesValue as string).split(',').map((value) => parseInt(value, 10))
 
     if (!fileName || !imageFile || Number.isNaN(x) || Number.isNaN(y)) {
       return handleApiError(new Error('Invalid parameters: fileName, image, x, and y are required'))
@@ -30,7 +36,7 @@ export async function POST(request: NextRequest) {
     const operation = await addImageToPDF(
       { buffer: pdfBuffer, filename: fileName, contentType: pdfBlob.type },
       { buffer: imageBuffer, filename: imageFile.name, contentType: imageFile.type },
-      { x, y, page, width, height }
+      { x, y, page, width, height, pages }
     )
 
     // Upload new PDF and cleanup
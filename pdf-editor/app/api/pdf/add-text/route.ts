@@ -6,7 +6,7 @@ import { handleApiError, createSuccessResponse, validateRequired } from '@/lib/a
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json()
-    const { fileName, text, x, y, page, fontSize, fontName, color } = body
+    const { fileName, text, x, y, page, fontSize, fontName, fontId, color } = body
 
     // Validate required fields
     const validation = validateRequired(body, ['fileName', 'text'])
@@ -20,7 +20,7 @@ export async function POST(request: NextRequest) {
     const result = await withPdfOperation(
       fileName,
       addTextToPDF,
-      { text, x, y, page, fontSize, fontName, color }
+      { text, x, y, page, fontSize, fontName, fontId, color }
     )
 
     return createSuccessResponse({
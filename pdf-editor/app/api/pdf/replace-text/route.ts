@@ -36,6 +36,7 @@ export async function POST(request: NextRequest) {
       replacement,
       fontSize,
       fontName,
+      fontId,
       color,
       align,
       fillColor
@@ -64,6 +65,7 @@ export async function POST(request: NextRequest) {
         replacement: replacement === undefined ? undefined : String(replacement),
         fontSize: fontSize === undefined ? undefined : Number(fontSize),
         fontName: fontName || undefined,
+        fontId: fontId || undefined,
         color: colorTuple as [number, number, number] | undefined,
         align: align === undefined ? undefined : Number(align),
         fillColor: fillTuple as [number, number, number] | undefined
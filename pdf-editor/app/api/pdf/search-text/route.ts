@@ -6,7 +6,7 @@ import { handleApiError, createSuccessResponse, validateRequired } from '@/lib/a
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json()
-    const { fileName, query, caseSensitive, wholeWord, maxHits } = body
+    const { fileName, query, caseSensitive, wholeWord, maxHits, contextWords } = body
 
     const validation = validateRequired(body, ['fileName', 'query'])
     if (!validation.valid) {
@@ -26,7 +26,8 @@ export async function POST(request: NextRequest) {
         query,
         caseSensitive: Boolean(caseSensitive),
         wholeWord: Boolean(wholeWord),
-        maxHits: typeof maxHits === 'number' ? maxHits : undefined
+        maxHits: typeof maxHits === 'number' ? maxHits : undefined,
+        contextWords: typeof contextWords === 'number' ? contextWords : undefined
       }
     )
 
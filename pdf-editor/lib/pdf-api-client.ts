@@ -101,6 +101,7 @@ export class PdfApiClient {
     page?: number
     fontSize?: number
     fontName?: string
+    fontId?: string
     color?: [number, number, number]
   }): Promise<ApiResponse<{ fileName: string }>> {
     return requestJson<ApiResponse<{ fileName: string }>>(`${API_BASE}/add-text`, {
@@ -121,6 +122,7 @@ export class PdfApiClient {
     page?: number
     width?: number
     height?: number
+    pages?: number[] | 'all'
   }): Promise<ApiResponse<{ fileName: string }>> {
     const formData = new FormData()
     formData.append('fileName', params.fileName)
@@ -130,6 +132,9 @@ export class PdfApiClient {
     formData.append('page', (params.page ?? 0).toString())
     appendOptional(formData, 'width', params.width)
     appendOptional(formData, 'height', params.height)
+    if (params.pages !== undefined) {
+      formData.append('pages', params.pages === 'all' ? 'all' : params.pages.join(','))
+    }
 
     return requestJson<ApiResponse<{ fileName: string }>>(`${API_BASE}/add-image`, {
       method: 'POST',
@@ -171,9 +176,10 @@ export class PdfApiClient {
     caseSensitive?: boolean
     wholeWord?: boolean
     maxHits?: number
+    contextWords?: number
   }): Promise<ApiResponse<{
     query: string
-    matches: Array<{ page: number; rect: [number, number, number, number]; text: string }>
+    matches: Array<{ page: number; rect: [number, number, number, number]; text: string; context?: string }>
     matchCount: number
   }>> {
     return requestJson(`${API_BASE}/search-text`, {
@@ -193,6 +199,7 @@ export class PdfApiClient {
     replacement?: string
     fontSize?: number
     fontName?: string
+    fontId?: string
     color?: [number, number, number]
     align?: number
     fillColor?: [number, number, number]
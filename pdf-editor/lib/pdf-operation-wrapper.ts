@@ -1,4 +1,11 @@
 import { downloadPDF, uploadPDF, deletePDF } from './supabase'
+import {
+  openPdfSession,
+  applyPdfSessionOperation,
+  exportPdfSession,
+  closePdfSession,
+  PdfSessionOperation
+} from './python-bridge'
 import { PdfFilePayload, PdfBinaryResponse } from '@/types/pdf'
 import { randomUUID } from 'crypto'
 
@@ -50,27 +57,76 @@ export async function withPdfOperation<TParams = void>(
     params
   )
 
-  // 3. Generate new filename (preserve original name, add new UUID)
+  // 3-5. Upload result under a new name and remove the old file
+  const updatedFileName = await replaceStoredPdf(fileName, result.buffer)
+
+  return {
+    fileName: updatedFileName,
+    message: result.message,
+    removedCount: result.removedCount
+  }
+}
+
+/**
+ * Apply several operations with a single download/upload cycle:
+ * the PDF is opened once as a server-side session, every operation is
+ * applied to the open document, and the result is exported once.
+ *
+ * @param fileName - Current PDF file name
+ * @param operations - Ordered operations (names match PDFProcessor methods)
+ * @returns Result with new fileName and the last operation message
+ */
+export async function withPdfSession(
+  fileName: string,
+  operations: PdfSessionOperation[]
+): Promise<PdfOperationResult> {
+  const pdfBlob = await downloadPDF(fileName)
+  const session = await openPdfSession({
+    buffer: Buffer.from(await pdfBlob.arrayBuffer()),
+    filename: fileName,
+    contentType: pdfBlob.type
+  })
+
+  let message: string | undefined
+  let removedCount: number | undefined
+  try {
+    for (const operation of operations) {
+      const result = await applyPdfSessionOperation(session.session_id, operation)
+      message = result.message
+      removedCount = result.removed_count ?? removedCount
+    }
+
+    const exported = await exportPdfSession(session.session_id)
+    const updatedFileName = await replaceStoredPdf(fileName, exported.buffer)
+
+    return { fileName: updatedFileName, message, removedCount }
+  } finally {
+    try {
+      await closePdfSession(session.session_id)
+    } catch (closeError) {
+      console.warn('Failed to close PDF session:', closeError)
+    }
+  }
+}
+
+async function replaceStoredPdf(fileName: string, buffer: Buffer): Promise<string> {
+  // Generate new filename (preserve original name, add new UUID)
   const originalName = fileName.replace(/^[a-f0-9-]+-/, '')
   const updatedFileName = `${randomUUID()}-${originalName}`
 
-  // 4. Upload new PDF
-  const editedBlob = new Blob([result.buffer], { type: 'application/pdf' })
+  // Upload new PDF
+  const editedBlob = new Blob([buffer], { type: 'application/pdf' })
   const editedFile = new File([editedBlob], updatedFileName, { type: 'application/pdf' })
   await uploadPDF(editedFile, updatedFileName)
 
-  // 5. Clean up old file (non-blocking)
+  // Clean up old file (non-blocking)
   try {
     await deletePDF(fileName)
   } catch (cleanupError) {
     console.warn('Failed to delete old PDF:', cleanupError)
   }
 
-  return {
-    fileName: updatedFileName,
-    message: result.message,
-    removedCount: result.removedCount
-  }
+  return updatedFileName
 }
 
 /**
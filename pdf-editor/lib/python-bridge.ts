@@ -110,6 +110,7 @@ export async function addTextToPDF(
     page?: number
     fontSize?: number
     fontName?: string
+    fontId?: string
     color?: [number, number, number]
   }
 ): Promise<PdfBinaryResponse> {
@@ -121,6 +122,7 @@ export async function addTextToPDF(
   formData.append('page', (params.page ?? 0).toString())
   formData.append('font_size', (params.fontSize ?? 12).toString())
   formData.append('font_name', params.fontName ?? 'helv')
+  appendOptional(formData, 'font_id', params.fontId)
   const [r, g, b] = params.color ?? [0, 0, 0]
   formData.append('color_r', r.toString())
   formData.append('color_g', g.toString())
@@ -138,6 +140,8 @@ export async function addImageToPDF(
     page?: number
     width?: number | null
     height?: number | null
+    // Stamp the same image onto these pages (or all of them) instead of `page`.
+    pages?: number[] | 'all'
   }
 ): Promise<PdfBinaryResponse> {
   const formData = new FormData()
@@ -152,10 +156,59 @@ export async function addImageToPDF(
   if (params.height !== undefined && params.height !== null) {
     formData.append('height', params.height.toString())
   }
+  if (params.pages !== undefined) {
+    formData.append('pages', params.pages === 'all' ? 'all' : params.pages.join(','))
+  }
 
   return postPdf('/pdf/add-image', formData)
 }
 
+export async function stampPdf(
+  pdf: PdfFilePayload,
+  params: {
+    text?: string
+    image?: PdfFilePayload
+    pages?: number[] | 'all'
+    // [x0, y0, x1, y1] the stamp is fitted into; defaults to the whole page.
+    rect?: [number, number, number, number]
+    fontSize?: number
+    fontName?: string
+    fontId?: string
+    color?: [number, number, number]
+    rotate?: number
+    opacity?: number
+    // false puts the stamp behind the page content.
+    overlay?: boolean
+  }
+): Promise<PdfBinaryResponse> {
+  const formData = new FormData()
+  formData.append('pdf_file', toFileField(pdf))
+  if (params.image) {
+    formData.append('image_file', toFileField(params.image))
+  }
+  appendOptional(formData, 'text', params.text)
+  if (params.pages !== undefined) {
+    formData.append('pages', params.pages === 'all' ? 'all' : params.pages.join(','))
+  }
+  if (params.rect) {
+    formData.append('rect', params.rect.join(','))
+  }
+  appendOptional(formData, 'font_size', params.fontSize)
+  appendOptional(formData, 'font_name', params.fontName)
+  appendOptional(formData, 'font_id', params.fontId)
+  if (params.color) {
+    const [r, g, b] = params.color
+    formData.append('color_r', r.toString())
+    formData.append('color_g', g.toString())
+    formData.append('color_b', b.toString())
+  }
+  appendOptional(formData, 'rotate', params.rotate)
+  appendOptional(formData, 'opacity', params.opacity)
+  appendOptional(formData, 'overlay', params.overlay)
+
+  return postPdf('/pdf/stamp', formData)
+}
+
 export async function deletePages(
   pdf: PdfFilePayload,
   pageNumbers: number[]
@@ -186,14 +239,52 @@ export async function extractPages(
   return postPdf('/pdf/extract-pages', formData)
 }
 
+export type PdfSaveProfile = 'fast' | 'balanced' | 'smallest'
+
+export async function optimizePdf(
+  pdf: PdfFilePayload,
+  saveProfile: PdfSaveProfile = 'balanced'
+): Promise<PdfBinaryResponse> {
+  const formData = new FormData()
+  formData.append('pdf_file', toFileField(pdf))
+  formData.append('save_profile', saveProfile)
+  return postPdf('/pdf/optimize', formData)
+}
+
+// Each range is a page list such as "0-4,9"; the result is a ZIP with one PDF per range.
+export async function splitPdf(
+  pdf: PdfFilePayload,
+  ranges: string[],
+  options: { parallel?: boolean; workers?: number } = {}
+): Promise<PdfBinaryResponse> {
+  const formData = new FormData()
+  formData.append('pdf_file', toFileField(pdf))
+  formData.append('ranges', ranges.join(';'))
+  appendOptional(formData, 'parallel', options.parallel)
+  appendOptional(formData, 'workers', options.workers)
+  return postPdf('/pdf/split', formData)
+}
+
 export async function redactText(
   pdf: PdfFilePayload,
   targets: string[],
-  params?: { fillColor?: [number, number, number] }
+  params?: {
+    fillColor?: [number, number, number]
+    patterns?: string[]
+    presets?: string[]
+    caseSensitive?: boolean
+  }
 ): Promise<PdfBinaryResponse> {
   const formData = new FormData()
   formData.append('pdf_file', toFileField(pdf))
   formData.append('targets', targets.join(','))
+  if (params?.patterns?.length) {
+    formData.append('patterns', params.patterns.join('\n'))
+  }
+  if (params?.presets?.length) {
+    formData.append('presets', params.presets.join(','))
+  }
+  appendOptional(formData, 'case_sensitive', params?.caseSensitive)
   const [r, g, b] = params?.fillColor ?? [1, 1, 1]
   formData.append('fill_r', r.toString())
   formData.append('fill_g', g.toString())
@@ -208,6 +299,7 @@ export async function searchPdfText(
     caseSensitive?: boolean
     wholeWord?: boolean
     maxHits?: number
+    contextWords?: number
   }
 ) {
   try {
@@ -217,6 +309,7 @@ export async function searchPdfText(
     appendOptional(formData, 'case_sensitive', params.caseSensitive)
     appendOptional(formData, 'whole_word', params.wholeWord)
     appendOptional(formData, 'max_hits', params.maxHits)
+    appendOptional(formData, 'context_words', params.contextWords)
 
     const response = await fetch(`${PDF_API_BASE_URL}/pdf/search-text`, {
       method: 'POST',
@@ -246,6 +339,96 @@ export async function searchPdfText(
   }
 }
 
+export type PdfTextMode = 'text' | 'words' | 'layout'
+
+export interface PdfPageText {
+  page: number
+  width: number
+  height: number
+  text?: string
+  // [x0, y0, x1, y1, word, block, line, word index]
+  words?: Array<[number, number, number, number, string, number, number, number]>
+  blocks?: Array<{
+    bbox: [number, number, number, number]
+    lines: Array<{
+      bbox: [number, number, number, number]
+      dir: [number, number]
+      spans: Array<{
+        bbox: [number, number, number, number]
+        text: string
+        font: string
+        size: number
+        flags: number
+        color: number
+      }>
+    }>
+  }>
+}
+
+/**
+ * Stream page text from /pdf/extract-text as it is extracted, one page at a time.
+ */
+export async function* extractPdfText(
+  pdf: PdfFilePayload,
+  params: {
+    mode?: PdfTextMode
+    pages?: string
+    sort?: boolean
+  } = {}
+): AsyncGenerator<PdfPageText> {
+  const formData = new FormData()
+  formData.append('pdf_file', toFileField(pdf))
+  appendOptional(formData, 'mode', params.mode)
+  appendOptional(formData, 'pages', params.pages)
+  appendOptional(formData, 'sort', params.sort)
+
+  let response: Response
+  try {
+    response = await fetch(`${PDF_API_BASE_URL}/pdf/extract-text`, {
+      method: 'POST',
+      body: formData
+    })
+  } catch (error) {
+    if (error instanceof TypeError && error.message.includes('fetch')) {
+      throw new PdfApiError(
+        `PDF service unavailable at ${PDF_API_BASE_URL}. Please ensure the FastAPI service is running.`,
+        503,
+        true
+      )
+    }
+    throw error
+  }
+
+  if (!response.ok || !response.body) {
+    let payload: unknown
+    try {
+      payload = await response.json()
+    } catch {
+      payload = await response.text()
+    }
+    ensureOk(response, payload)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffered = ''
+  while (true) {
+    const { done, value } = await reader.read()
+    buffered += decoder.decode(value, { stream: !done })
+    const lines = buffered.split('\n')
+    buffered = lines.pop() ?? ''
+    for (const line of lines) {
+      if (!line.trim()) continue
+      const row = JSON.parse(line)
+      if (row.error) {
+        throw new PdfApiError(row.error, 500)
+      }
+      yield row as PdfPageText
+    }
+    if (done) return
+  }
+}
+
 export async function replaceTextInstance(
   pdf: PdfFilePayload,
   params: {
@@ -254,6 +437,7 @@ export async function replaceTextInstance(
     replacement?: string
     fontSize?: number
     fontName?: string
+    fontId?: string
     color?: [number, number, number]
     align?: number
     fillColor?: [number, number, number]
@@ -268,6 +452,7 @@ export async function replaceTextInstance(
   }
   appendOptional(formData, 'font_size', params.fontSize)
   appendOptional(formData, 'font_name', params.fontName)
+  appendOptional(formData, 'font_id', params.fontId)
   appendOptional(formData, 'align', params.align)
 
   const [cr, cg, cb] = params.color ?? [0, 0, 0]
@@ -283,10 +468,65 @@ export async function replaceTextInstance(
   return postPdf('/pdf/replace-text', formData)
 }
 
-export async function getPDFInfo(pdf: PdfFilePayload) {
+// Sent as-is, so fields use the API's snake_case names.
+export type PdfTextReplacement = {
+  replacement?: string
+  font_size?: number
+  color?: [number, number, number]
+  align?: 0 | 1 | 2
+} & (
+  | { page: number; rect: [number, number, number, number] }
+  | { search: string; page?: number; case_sensitive?: boolean; whole_word?: boolean }
+)
+
+export async function replacePdfTextBulk(
+  pdf: PdfFilePayload,
+  replacements: PdfTextReplacement[],
+  params: {
+    fontSize?: number
+    fontName?: string
+    fontId?: string
+    color?: [number, number, number]
+    fillColor?: [number, number, number]
+    saveProfile?: PdfSaveProfile
+  } = {}
+): Promise<PdfBinaryResponse> {
+  const formData = new FormData()
+  formData.append('pdf_file', toFileField(pdf))
+  formData.append('replacements', JSON.stringify(replacements))
+  appendOptional(formData, 'font_size', params.fontSize)
+  appendOptional(formData, 'font_name', params.fontName)
+  appendOptional(formData, 'font_id', params.fontId)
+  appendOptional(formData, 'save_profile', params.saveProfile)
+
+  const [cr, cg, cb] = params.color ?? [0, 0, 0]
+  formData.append('color_r', cr.toString())
+  formData.append('color_g', cg.toString())
+  formData.append('color_b', cb.toString())
+
+  const [fr, fg, fb] = params.fillColor ?? [1, 1, 1]
+  formData.append('fill_r', fr.toString())
+  formData.append('fill_g', fg.toString())
+  formData.append('fill_b', fb.toString())
+
+  return postPdf('/pdf/replace-text-bulk', formData)
+}
+
+export interface PdfInfoOptions {
+  offset?: number
+  limit?: number
+  fields?: Array<'page_number' | 'width' | 'height' | 'rotation'>
+  columnar?: boolean
+}
+
+export async function getPDFInfo(pdf: PdfFilePayload, options: PdfInfoOptions = {}) {
   try {
     const formData = new FormData()
     formData.append('pdf_file', toFileField(pdf))
+    appendOptional(formData, 'offset', options.offset)
+    appendOptional(formData, 'limit', options.limit)
+    appendOptional(formData, 'fields', options.fields?.join(','))
+    appendOptional(formData, 'columnar', options.columnar)
 
     const response = await fetch(`${PDF_API_BASE_URL}/pdf/get-info`, {
       method: 'POST',
@@ -315,3 +555,225 @@ export async function getPDFInfo(pdf: PdfFilePayload) {
     throw error
   }
 }
+
+export interface PdfSessionInfo {
+  session_id: string
+  filename: string
+  page_count: number
+  size: number
+  operations_applied: number
+}
+
+export interface PdfSessionOperation {
+  operation: string
+  params?: Record<string, unknown>
+  image?: PdfFilePayload
+}
+
+async function requestSession(endpoint: string, init: RequestInit): Promise<Response> {
+  try {
+    const response = await fetch(`${PDF_API_BASE_URL}${endpoint}`, init)
+
+    if (!response.ok) {
+      let payload: unknown
+      try {
+        payload = await response.json()
+      } catch {
+        payload = await response.text()
+      }
+      ensureOk(response, payload)
+    }
+
+    return response
+  } catch (error) {
+    if (error instanceof TypeError && error.message.includes('fetch')) {
+      throw new PdfApiError(
+        `PDF service unavailable at ${PDF_API_BASE_URL}. Please ensure the FastAPI service is running.`,
+        503,
+        true
+      )
+    }
+    throw error
+  }
+}
+
+export async function openPdfSession(pdf: PdfFilePayload): Promise<PdfSessionInfo> {
+  const formData = new FormData()
+  formData.append('pdf_file', toFileField(pdf))
+  const response = await requestSession('/sessions', { method: 'POST', body: formData })
+  return response.json()
+}
+
+export async function applyPdfSessionOperation(
+  sessionId: string,
+  { operation, params, image }: PdfSessionOperation
+): Promise<{ message?: string; removed_count?: number; page_count: number }> {
+  const formData = new FormData()
+  formData.append('operation', operation)
+  formData.append('params', JSON.stringify(params ?? {}))
+  if (image) {
+    formData.append('image_file', toFileField(image))
+  }
+  const response = await requestSession(`/sessions/${sessionId}/operations`, {
+    method: 'POST',
+    body: formData
+  })
+  return response.json()
+}
+
+export async function exportPdfSession(sessionId: string): Promise<PdfBinaryResponse> {
+  const response = await requestSession(`/sessions/${sessionId}/export`, { method: 'GET' })
+  return extractBinaryResponse(response)
+}
+
+export async function closePdfSession(sessionId: string): Promise<void> {
+  await requestSession(`/sessions/${sessionId}`, { method: 'DELETE' })
+}
+
+export interface PdfFontInfo {
+  font_id: string
+  name: string
+  glyph_count: number
+  bytes: number
+}
+
+// Fonts are stored by content hash, so uploading the same file again returns the same font_id.
+export async function uploadPdfFont(font: PdfFilePayload): Promise<PdfFontInfo> {
+  const formData = new FormData()
+  formData.append('font_file', toFileField({ contentType: 'font/ttf', ...font }))
+  const response = await requestSession('/fonts', { method: 'POST', body: formData })
+  return response.json()
+}
+
+export async function listPdfFonts(): Promise<PdfFontInfo[]> {
+  const response = await requestSession('/fonts', { method: 'GET' })
+  return (await response.json()).fonts
+}
+
+export type PdfJobOperation =
+  | 'merge'
+  | 'redact-text'
+  | 'replace-text'
+  | 'replace-text-bulk'
+  | 'pipeline'
+  | 'optimize'
+  | 'extract-pages'
+  | 'split'
+  | 'render'
+  | 'get-info'
+
+export interface PdfJobStatus {
+  job_id: string
+  operation: PdfJobOperation
+  status: 'queued' | 'running' | 'succeeded' | 'failed'
+  attempts: number
+  progress: { pages_done: number; pages_total: number | null; percent: number | null }
+  created_at: number
+  started_at: number | null
+  finished_at: number | null
+  expires_at: number | null
+  error: string | null
+  result: Record<string, unknown> | null
+  status_url: string
+  result_url?: string
+}
+
+// Queue a long-running operation; params are the PDFProcessor arguments besides the files.
+export async function submitPdfJob(
+  operation: PdfJobOperation,
+  files: PdfFilePayload[],
+  params: Record<string, unknown> = {}
+): Promise<PdfJobStatus> {
+  const formData = new FormData()
+  formData.append('operation', operation)
+  formData.append('params', JSON.stringify(params))
+  for (const file of files) {
+    formData.append('files', toFileField(file))
+  }
+  const response = await requestSession('/jobs', { method: 'POST', body: formData })
+  return response.json()
+}
+
+export async function getPdfJob(jobId: string): Promise<PdfJobStatus> {
+  const response = await requestSession(`/jobs/${jobId}`, { method: 'GET' })
+  return response.json()
+}
+
+// PDF or ZIP results come back as a buffer; get-info results are returned as JSON.
+export async function getPdfJobResult(jobId: string): Promise<PdfBinaryResponse | Record<string, unknown>> {
+  const response = await requestSession(`/jobs/${jobId}/result`, { method: 'GET' })
+  if (response.headers.get('content-type')?.includes('application/json')) {
+    return response.json()
+  }
+  return extractBinaryResponse(response)
+}
+
+export async function deletePdfJob(jobId: string): Promise<void> {
+  await requestSession(`/jobs/${jobId}`, { method: 'DELETE' })
+}
+
+export interface PdfPipelineStep {
+  operation: string
+  params?: Record<string, unknown>
+}
+
+export async function runPdfPipeline(
+  pdf: PdfFilePayload,
+  operations: PdfPipelineStep[],
+  images: PdfFilePayload[] = []
+): Promise<PdfBinaryResponse> {
+  const formData = new FormData()
+  formData.append('pdf_file', toFileField(pdf))
+  formData.append('operations', JSON.stringify(operations))
+  for (const image of images) {
+    formData.append('images', toFileField(image))
+  }
+  return postPdf('/pdf/pipeline', formData)
+}
+
+export interface PdfRenderOptions {
+  pages?: string
+  zoom?: number
+  width?: number
+  imageFormat?: 'png' | 'jpeg' | 'webp'
+  tileSize?: number
+  tileX?: number
+  tileY?: number
+}
+
+export interface PdfRenderResponse {
+  buffer: Buffer
+  contentType: string
+  documentHash: string
+  cached: boolean
+}
+
+// Pass the PDF, or just the documentHash of an earlier render to be served
+// from the server's render cache without uploading the file again.
+export async function renderPdfPages(
+  source: PdfFilePayload | { documentHash: string },
+  options: PdfRenderOptions = {}
+): Promise<PdfRenderResponse> {
+  const formData = new FormData()
+  if ('documentHash' in source) {
+    formData.append('document_hash', source.documentHash)
+  } else {
+    formData.append('pdf_file', toFileField(source))
+  }
+  appendOptional(formData, 'pages', options.pages)
+  appendOptional(formData, 'zoom', options.zoom)
+  appendOptional(formData, 'width', options.width)
+  appendOptional(formData, 'image_format', options.imageFormat)
+  appendOptional(formData, 'tile_size', options.tileSize)
+  appendOptional(formData, 'tile_x', options.tileX)
+  appendOptional(formData, 'tile_y', options.tileY)
+
+  const response = await requestSession('/pdf/render', { method: 'POST', body: formData })
+  const arrayBuffer = await response.arrayBuffer()
+  return {
+    buffer: Buffer.from(arrayBuffer),
+    contentType: response.headers.get('content-type') ?? 'application/octet-stream',
+    documentHash: response.headers.get('x-document-hash') ?? '',
+    cached: response.headers.get('x-cache') === 'hit'
+  }
+}
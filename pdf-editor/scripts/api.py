@@ -2,7 +2,6 @@ from fastapi import FastAPI, File, UploadFile, Form
 from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 import fitz
-import io
 from typing import Optional
 
 app = FastAPI(title="PDF Processor API")
@@ -47,12 +46,11 @@ async def add_text(
         fontname=font_name
     )
 
-    output = io.BytesIO()
-    doc.save(output)
+    output = doc.tobytes()
     doc.close()
 
     return Response(
-        content=output.getvalue(),
+        content=output,
         media_type="application/pdf",
         headers={"x-operation-message": "Text added successfully"}
     )
@@ -91,12 +89,11 @@ async def add_image(
 
     page_obj.insert_image(rect, stream=image_bytes)
 
-    output = io.BytesIO()
-    doc.save(output)
+    output = doc.tobytes()
     doc.close()
 
     return Response(
-        content=output.getvalue(),
+        content=output,
         media_type="application/pdf",
         headers={"x-operation-message": "Image added successfully"}
     )
@@ -122,12 +119,11 @@ async def delete_pages(
     for page_num in sorted(pages, reverse=True):
         doc.delete_page(page_num)
 
-    output = io.BytesIO()
-    doc.save(output)
+    output = doc.tobytes()
     doc.close()
 
     return Response(
-        content=output.getvalue(),
+        content=output,
         media_type="application/pdf",
         headers={"x-operation-message": f"Deleted {len(pages)} pages"}
     )
@@ -158,12 +154,11 @@ async def reorder_pages(
 
     doc.select(order)
 
-    output = io.BytesIO()
-    doc.save(output)
+    output = doc.tobytes()
     doc.close()
 
     return Response(
-        content=output.getvalue(),
+        content=output,
         media_type="application/pdf",
         headers={"x-operation-message": f"Reordered {len(order)} pages"}
     )
@@ -188,12 +183,11 @@ async def extract_pages(
 
     doc.select(pages)
 
-    output = io.BytesIO()
-    doc.save(output)
+    output = doc.tobytes()
     doc.close()
 
     return Response(
-        content=output.getvalue(),
+        content=output,
         media_type="application/pdf",
         headers={"x-operation-message": f"Extracted {len(pages)} pages"}
     )
@@ -221,12 +215,11 @@ async def redact_text(
                 removed += 1
         page.apply_redactions()
 
-    output = io.BytesIO()
-    doc.save(output)
+    output = doc.tobytes()
     doc.close()
 
     return Response(
-        content=output.getvalue(),
+        content=output,
         media_type="application/pdf",
         headers={
             "x-operation-message": f"Redacted {removed} instances",
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Digests of files already hashed in this process, by (path, size, mtime).
+_stat_digests: Dict[Tuple[str, int, float], str] = {}
+_stat_digests_lock = threading.Lock()
+_STAT_DIGESTS_MAX = 4096
+
+
+def stat_digest(path: str) -> str:
+    """
+    file_digest(path), remembered for as long as the file keeps its size
+    and modification time.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    with _stat_digests_lock:
+        digest = _stat_digests.get(key)
+    if digest is None:
+        digest = file_digest(path)
+        with _stat_digests_lock:
+            if len(_stat_digests) >= _STAT_DIGESTS_MAX:
+                _stat_digests.clear()
+            _stat_digests[key] = digest
+    return digest
+
+
+def source_digest(source: Union[str, bytes, bytearray, memoryview]) -> str:
+    """
+    SHA-256 of a PDF given either as a file path or as in-memory bytes.
+    """
+    if isinstance(source, str):
+        return file_digest(source)
+    return hashlib.sha256(source).hexdigest()
+
+
+class DiskLRUCache:
+    """
+    Size-bounded byte cache under a local directory.
+
+    Entries are files named by the SHA-256 of their key. Reads refresh the
+    file's mtime, and once the directory grows past ``max_bytes`` the least
+    recently used files are deleted. Several processes may share a directory;
+    the size estimate is per process, and eviction rescans the directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name[:2], name)
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        entries: List[Tuple[str, int, float]] = []
+        for root, _dirs, files in os.walk(self.directory):
+            for filename in files:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def contains(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.max_bytes or len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict_locked(self) -> None:
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% so a full cache is not rescanned on every write.
+        target = int(self.max_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._scan()
+        return {
+            "directory": self.directory,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+class MemoryLRUCache:
+    """
+    Size-bounded in-process byte cache with least-recently-used eviction.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.max_bytes or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous)
+            self._entries[key] = data
+            self._total_bytes += len(data)
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            data = self._entries.pop(key, None)
+            if data is not None:
+                self._total_bytes -= len(data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class ResultCache:
+    """
+    Content-addressed cache of operation results.
+
+    Keys are derived from the SHA-256 of every input document plus the
+    operation name and its normalized parameters, so identical requests map
+    to the same entry whatever the upload's filename. Each entry is a small
+    JSON metadata dict and a payload, stored with its expiry time in a
+    MemoryLRUCache or DiskLRUCache backend.
+    """
+
+    BACKENDS = ("memory", "disk", "off")
+    _HEADER = struct.Struct("<dI")
+
+    def __init__(
+        self,
+        backend: Union[MemoryLRUCache, DiskLRUCache, None],
+        ttl: Optional[float] = None
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        kind = os.environ.get("PDF_API_RESULT_CACHE", "memory").strip().lower() or "memory"
+        if kind not in cls.BACKENDS:
+            raise ValueError(f"PDF_API_RESULT_CACHE must be one of {cls.BACKENDS}, got '{kind}'.")
+        max_bytes = int(os.environ.get("PDF_API_RESULT_CACHE_MB", "") or 128) * 1024 * 1024
+        ttl = float(os.environ.get("PDF_API_RESULT_CACHE_TTL", "") or 3600)
+
+        backend: Union[MemoryLRUCache, DiskLRUCache, None] = None
+        if kind == "memory":
+            backend = MemoryLRUCache(max_bytes)
+        elif kind == "disk":
+            directory = os.environ.get("PDF_API_RESULT_CACHE_DIR", "").strip() or os.path.join(
+                tempfile.gettempdir(), "pdf_result_cache"
+            )
+            backend = DiskLRUCache(directory, max_bytes)
+        return cls(backend, ttl)
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.backend.max_bytes > 0
+
+    @property
+    def backend_name(self) -> str:
+        if isinstance(self.backend, DiskLRUCache):
+            return "disk"
+        return "memory" if self.backend is not None else "off"
+
+    @staticmethod
+    def make_key(operation: str, digests: Iterable[str], params: Dict[str, Any]) -> str:
+        normalized = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(
+            "\0".join([operation, ",".join(digests), normalized]).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        if not self.enabled:
+            return None
+
+        entry = self.backend.get(key)
+        if entry is not None:
+            expires_at, meta_size = self._HEADER.unpack_from(entry)
+            if expires_at and expires_at < time.time():
+                self.backend.delete(key)
+                entry = None
+                with self._lock:
+                    self.expired += 1
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        offset = self._HEADER.size
+        meta = json.loads(entry[offset:offset + meta_size])
+        return meta, entry[offset + meta_size:]
+
+    def put(self, key: str, meta: Dict[str, Any], payload: bytes) -> None:
+        if not self.enabled:
+            return
+        encoded = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        expires_at = time.time() + self.ttl if self.ttl else 0.0
+        self.backend.put(key, self._HEADER.pack(expires_at, len(encoded)) + encoded + bytes(payload))
+        with self._lock:
+            self.stores += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "backend": self.backend_name,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "stores": self.stores,
+            }
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
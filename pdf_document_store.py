@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from contextvars import ContextVar
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class DocumentNotFound(KeyError):
+    pass
+
+
+def _default_directory() -> str:
+    # tmpfs keeps stored documents in shared memory instead of on disk.
+    base = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+    return os.path.join(base, "pdf_documents")
+
+
+class DocumentStore:
+    """
+    Content-addressed PDF files in one local directory, shared by every API
+    and pool process on the host.
+
+    A document is written once, named by its SHA-256, and handed to workers
+    as a path: PyMuPDF reads files on demand, so the bytes sit once in the
+    (tmpfs) page cache instead of being copied into each process the way a
+    pickled buffer is. Each process counts its references per document and
+    holds a shared flock on the file while any are live; eviction takes an
+    exclusive flock first, so a document is only deleted once no process
+    still references it, even across crashes. Unreferenced documents stay
+    for reuse by identical uploads until the store outgrows ``max_bytes``.
+    """
+
+    SUFFIX = ".pdf"
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max(0, max_bytes)
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._refs: Dict[str, int] = {}
+        self._handles: Dict[str, int] = {}
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+        self.reused = 0
+        self.stored = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_env(cls) -> "DocumentStore":
+        directory = os.environ.get("PDF_API_DOCUMENT_STORE_DIR", "").strip() or _default_directory()
+        max_bytes = int(os.environ.get("PDF_API_DOCUMENT_STORE_MB", "") or 1024) * 1024 * 1024
+        return cls(directory, max_bytes)
+
+    def path(self, doc_id: str) -> str:
+        return os.path.join(self.directory, doc_id + self.SUFFIX)
+
+    def put(self, stream: BinaryIO) -> str:
+        """
+        Store the rest of stream and return its id with one reference held.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in iter(lambda: stream.read(self.CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    handle.write(chunk)
+                    size += len(chunk)
+
+            doc_id = digest.hexdigest()
+            with self._lock:
+                if self._refs.get(doc_id):
+                    self._refs[doc_id] += 1
+                    self.reused += 1
+                    return doc_id
+
+                handle_fd = self._open_shared(doc_id)
+                if handle_fd is None:
+                    handle_fd = os.open(temp_path, os.O_RDONLY)
+                    self._lock_shared(handle_fd)
+                    try:
+                        # link() rather than replace() never swaps out a copy
+                        # another process has just stored and locked.
+                        os.link(temp_path, self.path(doc_id))
+                        self._total_bytes += size
+                        self.stored += 1
+                    except FileExistsError:
+                        os.close(handle_fd)
+                        handle_fd = self._open_shared(doc_id)
+                        if handle_fd is None:
+                            raise
+                        self.reused += 1
+                else:
+                    self.reused += 1
+                self._handles[doc_id] = handle_fd
+                self._refs[doc_id] = 1
+        finally:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+        self._evict_if_needed()
+        return doc_id
+
+    def acquire(self, doc_id: str) -> str:
+        """
+        Add a reference to a stored document and return its path.
+        """
+        with self._lock:
+            if self._refs.get(doc_id):
+                self._refs[doc_id] += 1
+                return self.path(doc_id)
+            handle_fd = self._open_shared(doc_id)
+            if handle_fd is None:
+                raise DocumentNotFound(doc_id)
+            self._handles[doc_id] = handle_fd
+            self._refs[doc_id] = 1
+            return self.path(doc_id)
+
+    def release(self, doc_id: str) -> None:
+        with self._lock:
+            count = self._refs.get(doc_id, 0) - 1
+            if count > 0:
+                self._refs[doc_id] = count
+                return
+            self._refs.pop(doc_id, None)
+            handle_fd = self._handles.pop(doc_id, None)
+        if handle_fd is not None:
+            os.close(handle_fd)
+        self._evict_if_needed()
+
+    def refcount(self, doc_id: str) -> int:
+        """
+        References held by this process.
+        """
+        return self._refs.get(doc_id, 0)
+
+    def evict(self) -> int:
+        """
+        Delete least recently used documents no process references until the
+        store fits in 90% of max_bytes. Returns the number deleted.
+        """
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            evicted = 0
+            for path, size, _ in entries:
+                if total <= target:
+                    break
+                doc_id = os.path.basename(path)[:-len(self.SUFFIX)]
+                if doc_id in self._refs or not self._delete_unreferenced(path):
+                    continue
+                total -= size
+                evicted += 1
+            self._total_bytes = total
+            self.evicted += evicted
+            return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._scan()
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "documents": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "referenced": len(self._refs),
+                "references": sum(self._refs.values()),
+                "stored": self.stored,
+                "reused": self.reused,
+                "evicted": self.evicted,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+            self._refs.clear()
+        for handle_fd in handles:
+            os.close(handle_fd)
+
+    def _evict_if_needed(self) -> None:
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def _open_shared(self, doc_id: str) -> Optional[int]:
+        """
+        Descriptor of the stored file with a shared lock held, or None when
+        the document is missing or was evicted while we waited for the lock.
+        """
+        path = self.path(doc_id)
+        try:
+            handle_fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        self._lock_shared(handle_fd)
+        try:
+            current = os.stat(path).st_ino == os.fstat(handle_fd).st_ino
+        except FileNotFoundError:
+            current = False
+        if not current:
+            os.close(handle_fd)
+            return None
+        os.utime(path)
+        return handle_fd
+
+    def _delete_unreferenced(self, path: str) -> bool:
+        try:
+            handle_fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return True
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(handle_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+        finally:
+            os.close(handle_fd)
+
+    @staticmethod
+    def _lock_shared(handle_fd: int) -> None:
+        # Without flock (Windows) references are only tracked per process.
+        if fcntl is not None:
+            fcntl.flock(handle_fd, fcntl.LOCK_SH)
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        entries: List[Tuple[str, int, float]] = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(self.SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+
+# Documents referenced by the current request, released when it finishes.
+_request_documents: ContextVar[Optional[List[str]]] = ContextVar("pdf_request_documents", default=None)
+
+
+def hold_for_request(doc_id: str) -> None:
+    held = _request_documents.get()
+    if held is None:
+        raise RuntimeError("hold_for_request() needs DocumentStoreMiddleware.")
+    held.append(doc_id)
+
+
+class DocumentStoreMiddleware:
+    """
+    ASGI middleware that releases the store references a request took with
+    hold_for_request() once its response and background tasks are done.
+    """
+
+    def __init__(self, app: Any, store: DocumentStore) -> None:
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        held: List[str] = []
+        token = _request_documents.set(held)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_documents.reset(token)
+            for doc_id in held:
+                self.store.release(doc_id)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz
+
+from pdf_cache import stat_digest
+
+
+class FontNotFound(KeyError):
+    pass
+
+
+# Font objects for text metrics, keyed by built-in name or font file digest.
+_metrics: Dict[str, fitz.Font] = {}
+_lock = threading.Lock()
+
+
+def font_metrics(font_name: str = "helv", font_file: Optional[str] = None) -> fitz.Font:
+    """
+    Font used to measure text, loaded once per process for each built-in
+    font name or font file content.
+    """
+    key = stat_digest(font_file) if font_file else font_name
+    with _lock:
+        font = _metrics.get(key)
+    if font is None:
+        font = fitz.Font(fontfile=font_file) if font_file else fitz.Font(font_name)
+        with _lock:
+            _metrics[key] = font
+    return font
+
+
+class FontRegistry:
+    """
+    Fonts written into one open document.
+
+    The first page that uses a font embeds it; every later page, in this or
+    a following operation on the same document, only gets a reference to
+    the existing font object added to its /Resources/Font dictionary. That
+    skips PyMuPDF re-reading and re-resolving a font file for each page.
+    Pages whose resources are inherited from the page tree fall back to a
+    regular embed.
+    """
+
+    def __init__(self) -> None:
+        self._fonts: Dict[Tuple[str, str], int] = {}
+        self.embedded = 0
+        self.reused = 0
+        self.custom = False
+
+    @classmethod
+    def of(cls, doc: fitz.Document) -> "FontRegistry":
+        registry = getattr(doc, "_pdf_font_registry", None)
+        if registry is None:
+            registry = doc._pdf_font_registry = cls()
+        return registry
+
+    def resource(self, page: fitz.Page, font_name: str = "helv", font_file: Optional[str] = None) -> str:
+        """
+        Make the font available on page and return the name to pass as
+        fontname= to insert_text, insert_textbox or a Shape. Font files get
+        a name derived from their digest, so different files never clash.
+        """
+        if font_file:
+            digest = stat_digest(font_file)
+            key, name = (digest, digest), "F" + digest[:12]
+        else:
+            key, name = (font_name, ""), font_name
+
+        xref = self._fonts.get(key)
+        if xref and link_resource(page, "Font", name, xref):
+            self.reused += 1
+            return name
+
+        if font_file:
+            xref = page.insert_font(fontname=name, fontfile=font_file)
+            self.custom = True
+        else:
+            xref = page.insert_font(fontname=name)
+        self._fonts[key] = xref
+        self.embedded += 1
+        return name
+
+    def stats(self) -> Dict[str, int]:
+        return {"font_embeds": self.embedded, "font_embeds_avoided": self.reused}
+
+
+def link_resource(page: fitz.Page, category: str, name: str, xref: int) -> bool:
+    """
+    Add /name -> xref to the page's own /Resources/<category> dictionary
+    (Font, XObject, ...). Returns False when the page has no /Resources
+    entry of its own.
+    """
+    doc = page.parent
+    kind, value = doc.xref_get_key(page.xref, "Resources")
+    if kind == "xref":
+        owner, prefix = int(value.split()[0]), ""
+    elif kind == "dict":
+        owner, prefix = page.xref, "Resources/"
+    else:
+        return False
+
+    reference = f"{xref} 0 R"
+    kind, value = doc.xref_get_key(owner, prefix + category)
+    if kind == "xref":
+        owner, prefix = int(value.split()[0]), ""
+    elif kind == "dict":
+        prefix += category + "/"
+    elif kind == "null":
+        doc.xref_set_key(owner, prefix + category, f"<</{name} {reference}>>")
+        return True
+    else:
+        return False
+
+    # An existing entry of that name is kept, as page.insert_font would do.
+    if doc.xref_get_key(owner, prefix + name)[0] == "null":
+        doc.xref_set_key(owner, prefix + name, reference)
+    return True
+
+
+def _default_directory() -> str:
+    return os.path.join(tempfile.gettempdir(), "pdf_fonts")
+
+
+class FontStore:
+    """
+    Uploaded TrueType/OpenType fonts in one local directory, named by their
+    SHA-256. Identical uploads are stored once, and the id stays valid for
+    later requests and for every process on the host.
+    """
+
+    SUFFIX = ".font"
+    _ID = re.compile(r"^[0-9a-f]{64}$")
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "FontStore":
+        return cls(os.environ.get("PDF_API_FONT_DIR", "").strip() or _default_directory())
+
+    def path(self, font_id: str) -> str:
+        """
+        File of a stored font; raises FontNotFound for unknown ids.
+        """
+        path = os.path.join(self.directory, font_id + self.SUFFIX)
+        if not self._ID.match(font_id) or not os.path.isfile(path):
+            raise FontNotFound(font_id)
+        return path
+
+    def put(self, data: bytes) -> Dict[str, Any]:
+        """
+        Validate and store a font; raises ValueError for anything that is
+        not a font PyMuPDF can write text with.
+        """
+        try:
+            font = fitz.Font(fontbuffer=data)
+        except Exception as exc:
+            raise ValueError(f"Not a TrueType or OpenType font: {exc}") from exc
+        if not font.is_writable:
+            raise ValueError(f"Font {font.name} cannot be used to write text")
+
+        font_id = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.directory, font_id + self.SUFFIX)
+        if not os.path.isfile(path):
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        return self._describe(font_id, font, len(data))
+
+    def fonts(self) -> List[Dict[str, Any]]:
+        fonts: List[Dict[str, Any]] = []
+        for entry in sorted(os.scandir(self.directory), key=lambda entry: entry.name):
+            font_id = entry.name[:-len(self.SUFFIX)]
+            if not entry.name.endswith(self.SUFFIX) or not self._ID.match(font_id):
+                continue
+            try:
+                fonts.append(self._describe(font_id, font_metrics(font_file=entry.path), entry.stat().st_size))
+            except Exception:
+                continue
+        return fonts
+
+    @staticmethod
+    def _describe(font_id: str, font: fitz.Font, size: int) -> Dict[str, Any]:
+        return {"font_id": font_id, "name": font.name, "glyph_count": font.glyph_count, "bytes": size}
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import fitz
+
+from pdf_cache import stat_digest
+
+
+# Natural size in points of images measured in this process, by digest.
+_sizes: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+_lock = threading.Lock()
+_SIZES_MAX = 1024
+
+
+def image_size(image_path: str) -> Tuple[float, float]:
+    """
+    Width and height in points at the image's own resolution, measured once
+    per image content.
+    """
+    digest = stat_digest(image_path)
+    with _lock:
+        size = _sizes.get(digest)
+        if size is not None:
+            _sizes.move_to_end(digest)
+            return size
+    with fitz.open(image_path) as img:
+        rect = img[0].rect
+    size = (rect.width, rect.height)
+    with _lock:
+        _sizes[digest] = size
+        while len(_sizes) > _SIZES_MAX:
+            _sizes.popitem(last=False)
+    return size
+
+
+class ImageRegistry:
+    """
+    Images inserted into one open document, by content digest.
+
+    The first insertion of an image decodes and embeds it; later ones, on
+    any page and in any later operation on the same document, only place a
+    reference to the embedded image object.
+    """
+
+    def __init__(self) -> None:
+        self._images: Dict[str, int] = {}
+        self.embedded = 0
+        self.reused = 0
+
+    @classmethod
+    def of(cls, doc: fitz.Document) -> "ImageRegistry":
+        registry = getattr(doc, "_pdf_image_registry", None)
+        if registry is None:
+            registry = doc._pdf_image_registry = cls()
+        return registry
+
+    def insert(self, page: fitz.Page, rect: fitz.Rect, image_path: str) -> int:
+        """
+        Show the image at rect on page and return the image's xref.
+        """
+        digest = stat_digest(image_path)
+        xref = self._images.get(digest)
+        if xref:
+            page.insert_image(rect, xref=xref)
+            self.reused += 1
+            return xref
+
+        xref = self._images[digest] = page.insert_image(rect, filename=image_path)
+        self.embedded += 1
+        return xref
+
+    def stats(self) -> Dict[str, int]:
+        return {"image_embeds": self.embedded, "image_embeds_avoided": self.reused}
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pdf_metrics import reporting_progress
+from pdf_processor import PDFProcessor
+from pdf_worker_pool import WorkerCrashed, WorkerPool, default_start_method
+
+
+class JobNotFound(KeyError):
+    pass
+
+
+@dataclass(frozen=True)
+class JobOperation:
+    method: str
+    # "pdf" (one output file), "zip" (split parts or rendered images) or "json".
+    result: str
+    min_files: int = 1
+    max_files: Optional[int] = 1
+
+
+JOB_OPERATIONS: Dict[str, JobOperation] = {
+    "merge": JobOperation("merge_pdfs", "pdf", min_files=2, max_files=None),
+    "redact-text": JobOperation("redact_text", "pdf"),
+    "replace-text": JobOperation("replace_text", "pdf"),
+    "replace-text-bulk": JobOperation("replace_text_bulk", "pdf"),
+    "pipeline": JobOperation("apply_operations", "pdf"),
+    "optimize": JobOperation("optimize_pdf", "pdf"),
+    "extract-pages": JobOperation("extract_pages", "pdf"),
+    "split": JobOperation("split_pdf", "zip"),
+    "render": JobOperation("render_pages", "zip"),
+    "get-info": JobOperation("get_info", "json"),
+}
+
+# Filled in by the queue from the job's own directory, never by clients.
+_RESERVED_PARAMS = {"pdf_path", "pdf_paths", "output_path", "output_dir", "cache_dir", "cache_max_bytes"}
+
+RESULT_MEDIA_TYPES = {"pdf": "application/pdf", "zip": "application/zip"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    params TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    pages_done INTEGER NOT NULL DEFAULT 0,
+    pages_total INTEGER,
+    result TEXT,
+    result_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+"""
+
+
+@contextmanager
+def _connect(db_path: str) -> Iterator[sqlite3.Connection]:
+    # Autocommit; worker processes write progress and results concurrently.
+    connection = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def _call_args(
+    operation: JobOperation,
+    inputs: List[str],
+    job_dir: str,
+    params: Dict[str, Any]
+) -> Tuple[List[Any], Dict[str, Any]]:
+    if operation.result == "pdf":
+        source: Any = inputs if operation.max_files is None else inputs[0]
+        return [source, os.path.join(job_dir, "result.pdf")], dict(params)
+    if operation.method == "split_pdf":
+        return [inputs[0]], {**params, "output_dir": os.path.join(job_dir, "parts")}
+    return [inputs[0]], dict(params)
+
+
+class _ProgressWriter:
+    """
+    Progress callback that records pages done/total on the job row, at most
+    every `interval` seconds except for the final page.
+    """
+
+    def __init__(self, db_path: str, job_id: str, interval: float = 0.5) -> None:
+        self.db_path = db_path
+        self.job_id = job_id
+        self.interval = interval
+        self._written_at = 0.0
+
+    def __call__(self, pages_done: int, pages_total: Optional[int]) -> None:
+        now = time.monotonic()
+        if now - self._written_at < self.interval and pages_done != pages_total:
+            return
+        self._written_at = now
+        with _connect(self.db_path) as connection:
+            connection.execute(
+                "UPDATE jobs SET pages_done = ?, pages_total = ? WHERE id = ?",
+                (pages_done, pages_total, self.job_id),
+            )
+
+
+def execute_job(db_path: str, job_id: str) -> str:
+    """
+    Run a claimed job in the current (worker) process and record its
+    outcome; returns the final status. Opens its own connections, never
+    one inherited from the parent.
+    """
+    with _connect(db_path) as connection:
+        row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return "missing"
+
+    operation = JOB_OPERATIONS[row["operation"]]
+    job_dir = os.path.join(os.path.dirname(db_path), job_id)
+    args, kwargs = _call_args(operation, json.loads(row["inputs"]), job_dir, json.loads(row["params"]))
+    if "output_dir" in kwargs:
+        os.makedirs(kwargs["output_dir"], exist_ok=True)
+
+    result_path: Optional[str] = None
+    try:
+        with reporting_progress(_ProgressWriter(db_path, job_id)):
+            result = getattr(PDFProcessor, operation.method)(*args, **kwargs)
+        if result.get("success"):
+            result, result_path = _store_result(operation, result, job_dir)
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+
+    status = "succeeded" if result.get("success") else "failed"
+    with _connect(db_path) as connection:
+        connection.execute(
+            """
+            UPDATE jobs SET status = ?, result = ?, result_path = ?, error = ?, finished_at = ?,
+                pages_total = COALESCE(pages_total, pages_done),
+                pages_done = CASE WHEN ? = 'succeeded' THEN COALESCE(pages_total, pages_done) ELSE pages_done END
+            WHERE id = ?
+            """,
+            (status, json.dumps(result), result_path, result.get("error"), time.time(), status, job_id),
+        )
+    return status
+
+
+def _store_result(
+    operation: JobOperation,
+    result: Dict[str, Any],
+    job_dir: str
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Write file results under job_dir and reduce result to the JSON summary
+    kept on the job row.
+    """
+    if operation.result == "pdf":
+        result.pop("output", None)
+        return result, result.pop("output_path")
+    if operation.result == "json":
+        return result, None
+
+    result_path = os.path.join(job_dir, "result.zip")
+    with zipfile.ZipFile(result_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        if operation.method == "split_pdf":
+            for part in result["parts"]:
+                archive.write(part.pop("output_path"), f"part-{part['index'] + 1}.pdf")
+            shutil.rmtree(os.path.join(job_dir, "parts"), ignore_errors=True)
+        else:
+            for image in result["images"]:
+                archive.writestr(PDFProcessor.image_name(image), image.pop("data"))
+    return result, result_path
+
+
+class JobQueue:
+    """
+    Persistent queue of long-running PDFProcessor calls.
+
+    Each job is a row in a SQLite database plus a directory holding its
+    inputs and result, both under ``directory``, so queued jobs and finished
+    results survive a restart of the API process. Jobs that were running when
+    it stopped are queued again, up to MAX_ATTEMPTS times. A dispatcher thread
+    hands queued jobs to the worker pool oldest first; finished jobs are
+    deleted ``retention`` seconds after they complete (0 keeps them).
+    """
+
+    MAX_ATTEMPTS = 3
+    PURGE_INTERVAL = 60.0
+
+    def __init__(self, directory: str, pool: WorkerPool, retention: float = 86400.0) -> None:
+        self.directory = directory
+        self.pool = pool
+        self.retention = max(0.0, retention)
+        self.db_path = os.path.join(directory, "jobs.sqlite3")
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._next_purge = 0.0
+
+        os.makedirs(directory, exist_ok=True)
+        with _connect(self.db_path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls, mode: str = "process") -> "JobQueue":
+        directory = os.environ.get("PDF_API_JOBS_DIR", "").strip() or os.path.join(
+            tempfile.gettempdir(), "pdf_jobs"
+        )
+        workers = os.environ.get("PDF_API_JOB_WORKERS", "").strip()
+        retention = os.environ.get("PDF_API_JOB_RETENTION", "").strip()
+        # Jobs exist to outlive request timeouts, so the pool has none.
+        pool = WorkerPool(
+            mode=mode,
+            max_workers=int(workers) if workers else max(1, (os.cpu_count() or 1) // 2),
+            max_queue=0,
+            timeout=None,
+            start_method=default_start_method(),
+        )
+        return cls(directory, pool, retention=float(retention) if retention else 86400.0)
+
+    def start(self) -> None:
+        self.recover()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._dispatch_loop, name="pdf-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.pool.shutdown(wait=False)
+
+    def recover(self) -> None:
+        """
+        Requeue jobs left running by a previous process.
+        """
+        with _connect(self.db_path) as connection:
+            connection.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted too many times.', finished_at = ? "
+                "WHERE status = 'running' AND attempts >= ?",
+                (time.time(), self.MAX_ATTEMPTS),
+            )
+            connection.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+
+    def submit(self, operation: str, params: Dict[str, Any], sources: Sequence[BinaryIO]) -> Dict[str, Any]:
+        """
+        Validate a job, copy its input files into the job directory and
+        queue it. Raises ValueError for requests that could never run.
+        """
+        spec = JOB_OPERATIONS.get(operation)
+        if spec is None:
+            raise ValueError(f"Unknown job operation: {operation}")
+        if len(sources) < spec.min_files or (spec.max_files is not None and len(sources) > spec.max_files):
+            expected = spec.min_files if spec.max_files == spec.min_files else f"at least {spec.min_files}"
+            raise ValueError(f"'{operation}' takes {expected} PDF file(s), got {len(sources)}")
+        reserved = sorted(_RESERVED_PARAMS.intersection(params))
+        if reserved:
+            raise ValueError(f"Parameters set by the job queue: {reserved}")
+
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.directory, job_id)
+        inputs = [os.path.join(job_dir, f"input-{index}.pdf") for index in range(len(sources))]
+        args, kwargs = _call_args(spec, inputs, job_dir, params)
+        try:
+            inspect.signature(getattr(PDFProcessor, spec.method)).bind(*args, **kwargs)
+        except TypeError as e:
+            raise ValueError(f"Invalid parameters for '{operation}': {e}") from e
+
+        os.makedirs(job_dir)
+        try:
+            for source, path in zip(sources, inputs):
+                with open(path, "wb") as handle:
+                    shutil.copyfileobj(source, handle)
+            with _connect(self.db_path) as connection:
+                connection.execute(
+                    "INSERT INTO jobs (id, operation, params, inputs, status, created_at) "
+                    "VALUES (?, ?, ?, ?, 'queued', ?)",
+                    (job_id, operation, json.dumps(params), json.dumps(inputs), time.time()),
+                )
+        except BaseException:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        self._wake.set()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        with _connect(self.db_path) as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise JobNotFound(job_id)
+        return self._describe(row)
+
+    def result_file(self, job_id: str) -> Tuple[str, str]:
+        """
+        (path, media type) of a succeeded file-producing job.
+        """
+        with _connect(self.db_path) as connection:
+            row = connection.execute(
+                "SELECT operation, result_path FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            raise JobNotFound(job_id)
+        return row["result_path"], RESULT_MEDIA_TYPES[JOB_OPERATIONS[row["operation"]].result]
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Delete a queued or finished job; running jobs cannot be deleted.
+        """
+        with _connect(self.db_path) as connection:
+            deleted = connection.execute(
+                "DELETE FROM jobs WHERE id = ? AND status != 'running'", (job_id,)
+            ).rowcount
+        if deleted:
+            shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+        return bool(deleted)
+
+    def purge_expired(self) -> int:
+        if not self.retention:
+            return 0
+        with _connect(self.db_path) as connection:
+            expired = [
+                row["id"] for row in connection.execute(
+                    "SELECT id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                    (time.time() - self.retention,),
+                )
+            ]
+            connection.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in expired])
+        for job_id in expired:
+            shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with _connect(self.db_path) as connection:
+            counts = {
+                row["status"]: row["count"]
+                for row in connection.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")
+            }
+        return {
+            "jobs": {status: counts.get(status, 0) for status in ("queued", "running", "succeeded", "failed")},
+            "workers": self.pool.max_workers,
+            "mode": self.pool.mode,
+            "retention": self.retention,
+            "directory": self.directory,
+        }
+
+    def _describe(self, row: sqlite3.Row) -> Dict[str, Any]:
+        pages_done, pages_total = row["pages_done"], row["pages_total"]
+        finished_at = row["finished_at"]
+        return {
+            "job_id": row["id"],
+            "operation": row["operation"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "progress": {
+                "pages_done": pages_done,
+                "pages_total": pages_total,
+                "percent": (
+                    100.0 if row["status"] == "succeeded"
+                    else round(100.0 * pages_done / pages_total, 1) if pages_total else None
+                ),
+            },
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": finished_at,
+            "expires_at": finished_at + self.retention if finished_at and self.retention else None,
+            "error": row["error"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "has_file": row["result_path"] is not None,
+        }
+
+    def _dispatch_loop(self) -> None:
+        while not self._stop.is_set():
+            self._dispatch()
+            if time.monotonic() >= self._next_purge:
+                self.purge_expired()
+                self._next_purge = time.monotonic() + self.PURGE_INTERVAL
+            self._wake.wait(1.0)
+            self._wake.clear()
+
+    def _dispatch(self) -> None:
+        while self.pool.in_flight < self.pool.max_workers and not self._stop.is_set():
+            job_id = self._claim_next()
+            if job_id is None:
+                return
+            try:
+                future = self.pool.submit(execute_job, self.db_path, job_id)
+            except WorkerCrashed:
+                self._requeue(job_id)
+                return
+            future.add_done_callback(functools.partial(self._finished, job_id))
+
+    def _claim_next(self) -> Optional[str]:
+        with _connect(self.db_path) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (time.time(), row["id"]),
+                )
+            connection.execute("COMMIT")
+        return row["id"] if row is not None else None
+
+    def _requeue(self, job_id: str) -> None:
+        with _connect(self.db_path) as connection:
+            connection.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted too many times.', finished_at = ? "
+                "WHERE id = ? AND status = 'running' AND attempts >= ?",
+                (time.time(), job_id, self.MAX_ATTEMPTS),
+            )
+            connection.execute("UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'running'", (job_id,))
+
+    def _finished(self, job_id: str, future: Future) -> None:
+        error = None if future.cancelled() else future.exception()
+        if future.cancelled() or isinstance(error, BrokenProcessPool):
+            # The worker died (or the pool shut down) mid-job: give this job
+            # another attempt. The pool starts fresh workers by itself, and
+            # jobs still running elsewhere are left alone.
+            self._requeue(job_id)
+        elif error is not None:
+            with _connect(self.db_path) as connection:
+                connection.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                    (str(error), time.time(), job_id),
+                )
+        self._wake.set()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+class PhaseRecorder:
+    """
+    Accumulates named phase durations (seconds) and page counts for one
+    request or one worker call.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.pages = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for name, seconds in data.get("phases", {}).items():
+            self.add(name, seconds)
+        self.pages += data.get("pages", 0)
+
+    def export(self) -> Dict[str, Any]:
+        return {"phases": dict(self.phases), "pages": self.pages}
+
+
+_current: ContextVar[Optional[PhaseRecorder]] = ContextVar("pdf_phase_recorder", default=None)
+_NOOP = nullcontext()
+
+
+class _Phase:
+    __slots__ = ("recorder", "name", "started")
+
+    def __init__(self, recorder: PhaseRecorder, name: str) -> None:
+        self.recorder = recorder
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.recorder.add(self.name, time.perf_counter() - self.started)
+
+
+def phase(name: str) -> ContextManager[Any]:
+    """
+    Time the enclosed block as phase `name` of the active recorder. Without
+    one (metrics disabled, or a plain library call) this is a shared no-op.
+    """
+    recorder = _current.get()
+    if recorder is None:
+        return _NOOP
+    return _Phase(recorder, name)
+
+
+def count_pages(pages: int) -> None:
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.pages += pages
+
+
+@contextmanager
+def recording(recorder: Optional[PhaseRecorder] = None) -> Iterator[PhaseRecorder]:
+    recorder = recorder or PhaseRecorder()
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+def current_recorder() -> Optional[PhaseRecorder]:
+    return _current.get()
+
+
+# Called as (pages_done, pages_total) by long-running operations; pages_total
+# is None while still unknown.
+ProgressCallback = Callable[[int, Optional[int]], None]
+_progress: ContextVar[Optional[ProgressCallback]] = ContextVar("pdf_progress", default=None)
+
+
+def report_progress(pages_done: int, pages_total: Optional[int] = None) -> None:
+    callback = _progress.get()
+    if callback is not None:
+        callback(pages_done, pages_total)
+
+
+@contextmanager
+def reporting_progress(callback: ProgressCallback) -> Iterator[None]:
+    token = _progress.set(callback)
+    try:
+        yield
+    finally:
+        _progress.reset(token)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def call_with_metrics(submitted_at: float, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run func under a fresh recorder, typically inside a worker process, and
+    attach the phases it recorded to its result dict under "metrics" so they
+    survive the trip back to the API process. Time spent waiting for a
+    worker is reported as the "queue" phase.
+    """
+    started = time.time()
+    with recording() as recorder:
+        result = func(*args, **kwargs)
+    if isinstance(result, dict):
+        metrics = recorder.export()
+        metrics["phases"] = {"queue": max(0.0, started - submitted_at), **metrics["phases"]}
+        metrics["worker_peak_rss_bytes"] = peak_rss_bytes()
+        result["metrics"] = metrics
+    return result
+
+
+class BatchStats:
+    """
+    Running totals and throughput for a batch of per-document results, as
+    produced by PDFProcessor.iter_batch or the /pdf/batch endpoints.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.documents = 0
+        self.failed = 0
+        self.pages = 0
+        self.bytes = 0
+        self.matches = 0
+        self._durations: List[float] = []
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.documents += 1
+        if not result.get("success"):
+            self.failed += 1
+        self.pages += result.get("page_count") or 0
+        self.bytes += result.get("bytes") or 0
+        self.matches += result.get("match_count") or 0
+        if result.get("duration_ms") is not None:
+            self._durations.append(result["duration_ms"])
+
+    def export(self) -> Dict[str, Any]:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        durations = sorted(self._durations)
+
+        def _percentile(fraction: float) -> Optional[float]:
+            if not durations:
+                return None
+            return durations[min(len(durations) - 1, int(fraction * len(durations)))]
+
+        return {
+            "documents": self.documents,
+            "succeeded": self.documents - self.failed,
+            "failed": self.failed,
+            "pages": self.pages,
+            "bytes": self.bytes,
+            "match_count": self.matches,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "documents_per_second": round(self.documents / elapsed, 3),
+            "pages_per_second": round(self.pages / elapsed, 3),
+            "megabytes_per_second": round(self.bytes / elapsed / (1024 * 1024), 3),
+            "p50_ms": _percentile(0.5),
+            "p95_ms": _percentile(0.95),
+        }
+
+
+# Label values are kept as a sorted tuple of (name, value) pairs.
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe Prometheus registry: counters, high-water gauges
+    and histograms rendered in the text exposition format.
+    """
+
+    DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        self._values: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None) -> None:
+        self._meta[name] = (kind, help_text)
+        if kind == "histogram":
+            self._buckets[name] = buckets or self.DURATION_BUCKETS
+            self._histograms.setdefault(name, {})
+        else:
+            self._values.setdefault(name, {})
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def set_max(self, name: str, value: float, **labels: Any) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = max(series.get(key, value), value)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = self._labels(labels)
+        buckets = self._buckets[name]
+        with self._lock:
+            # Per series: one count per bucket, then +Inf count and sum.
+            state = self._histograms[name].setdefault(key, [0.0] * (len(buckets) + 2))
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def render(self, samples: Optional[Dict[str, Tuple[str, str, float]]] = None) -> str:
+        """
+        Exposition text for every metric, plus unlabelled samples taken by
+        the caller at scrape time, given as {name: (type, help, value)}.
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text) in self._meta.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "histogram":
+                    buckets = self._buckets[name]
+                    for labels, state in self._histograms[name].items():
+                        for index, bound in enumerate(buckets):
+                            bucket_labels = _format_labels(labels + (("le", _format_value(bound)),))
+                            lines.append(f"{name}_bucket{bucket_labels} {_format_value(state[index])}")
+                        bucket_labels = _format_labels(labels + (("le", "+Inf"),))
+                        lines.append(f"{name}_bucket{bucket_labels} {_format_value(state[-2])}")
+                        lines.append(f"{name}_count{_format_labels(labels)} {_format_value(state[-2])}")
+                        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(state[-1])}")
+                else:
+                    for labels, value in self._values[name].items():
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name, (kind, help_text, value) in (samples or {}).items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{key}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def server_timing(phases: Dict[str, float], total: Optional[float] = None) -> str:
+    """
+    Server-Timing header value with durations in milliseconds.
+    """
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that gives every HTTP request a PhaseRecorder, counts
+    request and response bytes, adds a Server-Timing header and records the
+    request in a MetricsRegistry labelled by route template.
+    """
+
+    def __init__(self, app: Any, registry: MetricsRegistry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        recorder = PhaseRecorder()
+        bytes_in = 0
+        bytes_out = 0
+        status = 500
+
+        async def _receive() -> Dict[str, Any]:
+            nonlocal bytes_in
+            message = await receive()
+            if message["type"] == "http.request":
+                bytes_in += len(message.get("body", b""))
+            return message
+
+        async def _send(message: Dict[str, Any]) -> None:
+            nonlocal bytes_out, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    server_timing(recorder.phases, time.perf_counter() - started).encode("latin-1"),
+                ))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                bytes_out += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            with recording(recorder):
+                await self.app(scope, _receive, _send)
+        finally:
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            self._record(endpoint, scope.get("method", ""), status, recorder,
+                         time.perf_counter() - started, bytes_in, bytes_out)
+
+    def _record(
+        self,
+        endpoint: str,
+        method: str,
+        status: int,
+        recorder: PhaseRecorder,
+        duration: float,
+        bytes_in: int,
+        bytes_out: int
+    ) -> None:
+        registry = self.registry
+        registry.inc("pdf_api_requests_total", endpoint=endpoint, method=method, status=status)
+        registry.observe("pdf_api_request_duration_seconds", duration, endpoint=endpoint)
+        registry.inc("pdf_api_request_bytes_total", bytes_in, endpoint=endpoint)
+        registry.inc("pdf_api_response_bytes_total", bytes_out, endpoint=endpoint)
+        if recorder.pages:
+            registry.inc("pdf_api_pages_processed_total", recorder.pages, endpoint=endpoint)
+        for name, seconds in recorder.phases.items():
+            registry.observe("pdf_api_phase_duration_seconds", seconds, endpoint=endpoint, phase=name)
+
+
+def default_registry() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.describe("pdf_api_requests_total", "counter", "HTTP requests by route, method and status.")
+    registry.describe("pdf_api_request_duration_seconds", "histogram", "Time until the response finished.")
+    registry.describe("pdf_api_phase_duration_seconds", "histogram", "Time spent per processing phase.")
+    registry.describe("pdf_api_request_bytes_total", "counter", "Request body bytes received.")
+    registry.describe("pdf_api_response_bytes_total", "counter", "Response body bytes sent.")
+    registry.describe("pdf_api_pages_processed_total", "counter", "Pages in the documents opened for requests.")
+    registry.describe("pdf_api_worker_peak_rss_bytes", "gauge", "Highest peak RSS reported by a worker.")
+    return registry
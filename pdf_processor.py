@@ -1,83 +1,415 @@
 #!/usr/bin/env python3
 
 import fitz
+import inspect
+import io
+import multiprocessing
 import os
-from typing import List, Dict, Any, Optional, Tuple
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pdf_cache import DiskLRUCache, source_digest
+from pdf_fonts import FontRegistry, font_metrics
+from pdf_images import ImageRegistry, image_size
+from pdf_metrics import BatchStats, count_pages, phase, report_progress
+from pdf_redaction import RedactionEngine
+from pdf_stamps import StampPlacer, build_overlay
+from pdf_text_index import TextIndex, get_text_index, set_document_key
+
+
+# A file path, or the raw bytes of a PDF held in memory.
+PDFSource = Union[str, bytes, bytearray, memoryview]
+
+# Set in parallel search workers so running shards can stop early.
+_search_cancel_event: Optional[Any] = None
+
+
+def _init_search_worker(cancel_event: Any) -> None:
+    global _search_cancel_event
+    _search_cancel_event = cancel_event
+
+
+# One DiskLRUCache per (directory, size limit) in each process.
+_render_caches: Dict[Tuple[str, int], DiskLRUCache] = {}
+
+
+def _render_cache(directory: str, max_bytes: int) -> DiskLRUCache:
+    cache = _render_caches.get((directory, max_bytes))
+    if cache is None:
+        cache = _render_caches[(directory, max_bytes)] = DiskLRUCache(directory, max_bytes)
+    return cache
+
+
+def _round_bbox(bbox: Tuple[float, float, float, float]) -> List[float]:
+    return [round(value, 2) for value in bbox]
 
 
 class PDFProcessor:
 
+    SAVE_MODES = ("full", "incremental")
+    # Options for full saves. "fast" writes the document as is; the others
+    # drop unused objects, compress streams and pack objects into object
+    # streams, and "smallest" also downsamples and re-encodes images.
+    SAVE_PROFILES: Dict[str, Dict[str, Any]] = {
+        "fast": {},
+        "balanced": {"garbage": 3, "deflate": True, "use_objstms": 1},
+        "smallest": {
+            "garbage": 4,
+            "clean": True,
+            "deflate": True,
+            "deflate_images": True,
+            "deflate_fonts": True,
+            "use_objstms": 1,
+            "rewrite_images": {"dpi_threshold": 200, "dpi_target": 150, "quality": 75},
+        },
+    }
+    RENDER_FORMATS = ("png", "jpeg", "webp")
+    # "text" is plain text, "words" adds a bbox per word, "layout" is the
+    # block/line/span tree with fonts.
+    TEXT_MODES = ("text", "words", "layout")
+    BATCH_OPERATIONS = ("get_info", "search_text")
+    INFO_FIELDS = ("page_number", "width", "height", "rotation")
+    default_save_mode = os.environ.get("PDF_API_SAVE_MODE", "full").strip().lower() or "full"
+    default_save_profile = os.environ.get("PDF_API_SAVE_PROFILE", "fast").strip().lower() or "fast"
+
+    @staticmethod
+    def _open_document(source: PDFSource) -> fitz.Document:
+        with phase("open"):
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                doc = fitz.open(stream=source, filetype="pdf")
+                set_document_key(doc, lambda: source_digest(source))
+            else:
+                doc = fitz.open(source)
+        count_pages(len(doc))
+        return doc
+
+    @staticmethod
+    def _edit_document(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        edit: Callable[..., Dict[str, Any]],
+        *args: Any,
+        save_mode: Optional[str] = None,
+        save_profile: Optional[str] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Open pdf_path, run edit(doc, ...) and save the result to output_path.
+
+        pdf_path may also be an in-memory buffer, and when output_path is None
+        the saved document is returned as bytes under "output" instead. Full
+        saves use the options of save_profile (see SAVE_PROFILES).
+
+        In "incremental" mode the changes are appended to output_path, which
+        starts as a copy of pdf_path unless both paths are the same file; the
+        result then reports base_size and delta_size so callers holding the
+        original bytes only need the appended tail. Incremental saves need a
+        file on both ends, so buffers fall back to a full save. An appended
+        update cannot rewrite existing objects, so the save profile only
+        applies when that fallback happens.
+        """
+        mode = save_mode or PDFProcessor.default_save_mode
+        if mode not in PDFProcessor.SAVE_MODES:
+            return {"success": False, "error": f"Invalid save mode: {mode}"}
+        profile = save_profile or PDFProcessor.default_save_profile
+        if profile not in PDFProcessor.SAVE_PROFILES:
+            return {"success": False, "error": f"Invalid save profile: {profile}"}
+
+        incremental = mode == "incremental" and isinstance(pdf_path, str) and output_path is not None
+        in_place = incremental and os.path.abspath(pdf_path) == os.path.abspath(output_path)
+        fallback_path: Optional[str] = None
+        try:
+            if incremental and not in_place:
+                shutil.copyfile(pdf_path, output_path)
+            source = output_path if incremental else pdf_path
+            base_size = os.path.getsize(source) if incremental else 0
+            input_bytes = os.path.getsize(source) if isinstance(source, str) else len(source)
+
+            with PDFProcessor._open_document(source) as doc:
+                with phase("edit"):
+                    result = edit(doc, *args, **kwargs)
+                if not result.get("success"):
+                    if incremental and not in_place:
+                        os.remove(output_path)
+                    return result
+
+                if incremental and doc.can_save_incrementally():
+                    with phase("save"):
+                        doc.save(output_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+                    result["save_mode"] = "incremental"
+                    result["base_size"] = base_size
+                    result["delta_size"] = os.path.getsize(output_path) - base_size
+                else:
+                    if incremental:
+                        # An open file can only be overwritten incrementally, so a
+                        # full rewrite goes to a sibling file and replaces it below.
+                        fallback_path = f"{output_path}.full"
+                    result.update(PDFProcessor._save_document(doc, fallback_path or output_path, profile))
+                    result["save_mode"] = "full"
+                    result["input_bytes"] = input_bytes
+
+            if fallback_path:
+                os.replace(fallback_path, output_path)
+
+            if output_path is not None:
+                result["output_path"] = os.path.abspath(output_path)
+            return result
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _save_document(
+        doc: fitz.Document,
+        output_path: Optional[str],
+        save_profile: str,
+        keep_open: bool = False,
+        **overrides: Any
+    ) -> Dict[str, Any]:
+        """
+        Save doc to output_path with the options of save_profile, or return
+        it as bytes under "output" when output_path is None. Reports the
+        profile, output_bytes and the time spent in save_ms.
+
+        Documents that got a font file have their fonts subset. Subsetting
+        and garbage collection rewrite objects in place, which would leave
+        the fonts and images PyMuPDF and MuPDF remember for later insertions
+        pointing at stale objects, so with keep_open (the document is edited
+        further) both run on a scratch copy.
+        """
+        options = {**PDFProcessor.SAVE_PROFILES[save_profile], **overrides}
+        rewrite_images = options.pop("rewrite_images", None)
+        subset_fonts = FontRegistry.of(doc).custom
+        started = time.perf_counter()
+        saved: Dict[str, Any] = {"save_profile": save_profile}
+        if rewrite_images:
+            with phase("images"):
+                doc.rewrite_images(**rewrite_images)
+
+        target = doc
+        if keep_open and (subset_fonts or options.get("garbage")):
+            with phase("copy"):
+                target = fitz.open(stream=doc.write(), filetype="pdf")
+        try:
+            if subset_fonts:
+                with phase("fonts"):
+                    target.subset_fonts()
+            with phase("save"):
+                if output_path is None:
+                    saved["output"] = target.write(**options)
+                    saved["output_bytes"] = len(saved["output"])
+                else:
+                    target.save(output_path, **options)
+                    saved["output_bytes"] = os.path.getsize(output_path)
+        finally:
+            if target is not doc:
+                target.close()
+        saved["save_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return saved
+
+    @staticmethod
+    def apply_to_document(
+        doc: fitz.Document,
+        operation: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply a named edit operation to an already open document without saving it
+        """
+        edit = DOCUMENT_OPERATIONS.get(operation)
+        if edit is None:
+            return {"success": False, "error": f"Unknown operation: {operation}"}
+
+        try:
+            return edit(doc, **(params or {}))
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def export_document(doc: fitz.Document, save_profile: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Serialize an already open document with a save profile; "smallest"
+        downsamples the document's images in place
+        """
+        profile = save_profile or PDFProcessor.default_save_profile
+        if profile not in PDFProcessor.SAVE_PROFILES:
+            return {"success": False, "error": f"Invalid save profile: {profile}"}
+
+        try:
+            return {"success": True, **PDFProcessor._save_document(doc, None, profile, keep_open=True)}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def validate_operations(operations: Any) -> Optional[str]:
+        """
+        Check an operation list up front; returns an error message or None
+        """
+        if not isinstance(operations, list) or not operations:
+            return "operations must be a non-empty list"
+
+        for step, item in enumerate(operations):
+            if not isinstance(item, dict):
+                return f"Step {step}: expected an object with 'operation' and 'params'"
+
+            name = item.get("operation")
+            edit = DOCUMENT_OPERATIONS.get(name)
+            if edit is None:
+                return f"Step {step}: unknown operation: {name}"
+
+            params = item.get("params", {})
+            if not isinstance(params, dict):
+                return f"Step {step}: params must be an object"
+
+            try:
+                inspect.signature(edit).bind(None, **params)
+            except TypeError as e:
+                return f"Step {step} ({name}): {e}"
+
+            image_path = params.get("image_path")
+            if name == "add_image" and not (isinstance(image_path, str) and os.path.exists(image_path)):
+                return f"Step {step} ({name}): image not found: {image_path}"
+
+        return None
+
+    @staticmethod
+    def apply_operations(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        operations: List[Dict[str, Any]],
+        save_mode: Optional[str] = None,
+        save_profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply an ordered list of {"operation", "params"} edits to one open
+        document and save once; nothing is saved if any step fails
+        """
+        error = PDFProcessor.validate_operations(operations)
+        if error:
+            return {"success": False, "error": error}
+
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._apply_operations, operations,
+            save_mode=save_mode, save_profile=save_profile
+        )
+
+    @staticmethod
+    def _apply_operations(doc: fitz.Document, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        steps: List[Dict[str, Any]] = []
+        for step, item in enumerate(operations):
+            name = item["operation"]
+            started = time.perf_counter()
+            result = PDFProcessor.apply_to_document(doc, name, item.get("params"))
+            duration_ms = round((time.perf_counter() - started) * 1000, 3)
+
+            if not result.get("success"):
+                return {
+                    "success": False,
+                    "error": f"Step {step} ({name}): {result.get('error', 'Operation failed')}",
+                    "steps": steps
+                }
+
+            steps.append({
+                "step": step,
+                "operation": name,
+                "message": result.get("message", ""),
+                "duration_ms": duration_ms
+            })
+
+        return {
+            "success": True,
+            "message": f"Applied {len(steps)} operations",
+            "steps": steps,
+            "page_count": len(doc)
+        }
+
     @staticmethod
     def add_text(
-        pdf_path: str,
-        output_path: str,
+        pdf_path: PDFSource,
+        output_path: Optional[str],
         text: str,
         x: float,
         y: float,
         page: int = 0,
         font_size: float = 12,
         color: tuple = (0, 0, 0),
-        font_name: str = "helv"
+        font_name: str = "helv",
+        font_file: Optional[str] = None,
+        save_mode: Optional[str] = None,
+        save_profile: Optional[str] = None
     ) -> Dict[str, Any]:
-        try:
-            with fitz.open(pdf_path) as doc:
-
-                if page < 0 or page >= len(doc):
-                    return {"success": False, "error": f"Invalid page number: {page}"}
+        """
+        Write text at (x, y) with a built-in font, or with the TrueType or
+        OpenType font in font_file when given
+        """
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._add_text,
+            text, x, y, page, font_size, color, font_name, font_file,
+            save_mode=save_mode, save_profile=save_profile
+        )
 
-                page_obj = doc[page]
-                page_obj.insert_text(
-                    (x, y),
-                    text,
-                    fontsize=font_size,
-                    color=color,
-                    fontname=font_name
-                )
+    @staticmethod
+    def _add_text(
+        doc: fitz.Document,
+        text: str,
+        x: float,
+        y: float,
+        page: int = 0,
+        font_size: float = 12,
+        color: tuple = (0, 0, 0),
+        font_name: str = "helv",
+        font_file: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if page < 0 or page >= len(doc):
+            return {"success": False, "error": f"Invalid page number: {page}"}
 
-                doc.save(output_path)
+        page_obj = doc[page]
+        registry = FontRegistry.of(doc)
+        page_obj.insert_text(
+            (x, y),
+            text,
+            fontsize=font_size,
+            color=color,
+            fontname=registry.resource(page_obj, font_name, font_file)
+        )
 
-                return {
-                    "success": True,
-                    "message": f"Text added to page {page}",
-                    "output_path": os.path.abspath(output_path)
-                }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return {"success": True, "message": f"Text added to page {page}", **registry.stats()}
 
     @staticmethod
     def search_text(
-        pdf_path: str,
+        pdf_path: PDFSource,
         query: str,
         case_sensitive: bool = False,
         whole_word: bool = False,
-        max_hits: int = 0
+        max_hits: int = 0,
+        context_words: int = 8
     ) -> Dict[str, Any]:
+        """
+        Find query (case-insensitive unless case_sensitive) on every page and
+        return each match's page, rect and text, plus a snippet of up to
+        context_words surrounding words when context_words > 0.
+
+        Matching runs on the document's cached text index: pages that cannot
+        contain the query are skipped, and text, context and whole-word rects
+        come from the index's word lists. Only pages with a match inside a
+        word are read again, for the glyph boxes of that part of the word.
+        """
         try:
-            normalized_query = query if case_sensitive else query.lower()
-
-            with fitz.open(pdf_path) as doc:
+            with PDFProcessor._open_document(pdf_path) as doc:
+                index = get_text_index(doc)
                 matches: List[Dict[str, Any]] = []
-                for page_index, page in enumerate(doc):
-                    rects = page.search_for(
-                        query,
-                        hit_max=max_hits if max_hits else 0,
-                    )
-                    for rect in rects:
-                        extracted = page.get_textbox(rect).strip()
-                        normalized_extracted = extracted if case_sensitive else extracted.lower()
-
-                        if whole_word:
-                            if normalized_extracted != normalized_query:
-                                continue
-                        else:
-                            if normalized_query not in normalized_extracted:
-                                continue
-
-                        matches.append({
-                            "page": page_index,
-                            "text": extracted,
-                            "rect": [rect.x0, rect.y0, rect.x1, rect.y1]
-                        })
+                with phase("search"):
+                    for page_index in index.candidate_pages(query):
+                        matches.extend(PDFProcessor._page_matches(
+                            index, doc[page_index], page_index, query, case_sensitive, whole_word, context_words
+                        ))
+                        if max_hits and len(matches) >= max_hits:
+                            break
+
+                if max_hits:
+                    matches = matches[:max_hits]
 
                 return {
                     "success": True,
@@ -90,348 +422,1097 @@ class PDFProcessor:
             return {"success": False, "error": str(e)}
 
     @staticmethod
-    def replace_text_instance(
-        pdf_path: str,
-        output_path: str,
-        page: int,
-        rect_coords: List[float],
-        replacement: Optional[str] = None,
-        font_size: float = 12,
-        color: Tuple[float, float, float] = (0, 0, 0),
-        font_name: str = "helv",
-        align: int = 0,
-        fill_color: Tuple[float, float, float] = (1, 1, 1)
+    def _page_matches(
+        index: TextIndex,
+        page: fitz.Page,
+        index_page: int,
+        query: str,
+        case_sensitive: bool,
+        whole_word: bool,
+        context_words: int
+    ) -> List[Dict[str, Any]]:
+        matches: List[Dict[str, Any]] = []
+        for rect, text, first, end in index.search_page(index_page, query, case_sensitive, whole_word, page):
+            match: Dict[str, Any] = {
+                "page": page.number,
+                "text": text,
+                "rect": [rect.x0, rect.y0, rect.x1, rect.y1]
+            }
+            if context_words > 0:
+                match["context"] = index.context(index_page, first, end, context_words)
+            matches.append(match)
+        return matches
+
+    @staticmethod
+    def search_text_parallel(
+        pdf_path: PDFSource,
+        query: str,
+        case_sensitive: bool = False,
+        whole_word: bool = False,
+        max_hits: int = 0,
+        context_words: int = 8,
+        workers: Optional[int] = None,
+        shard_size: Optional[int] = None
     ) -> Dict[str, Any]:
+        """
+        search_text with the page range sharded across worker processes; each
+        worker opens the same file read-only. Matches are merged in page order
+        and, once max_hits is reached by the leading shards, outstanding shards
+        are cancelled.
+        """
+        spill_dir: Optional[str] = None
         try:
-            if len(rect_coords) != 4:
-                return {"success": False, "error": "rect must contain 4 values"}
+            if not isinstance(pdf_path, str):
+                # Workers share a file rather than each receiving a copy of the buffer.
+                spill_dir = tempfile.mkdtemp(prefix="pdf_search_")
+                spill_path = os.path.join(spill_dir, "source.pdf")
+                with open(spill_path, "wb") as handle:
+                    handle.write(pdf_path)
+                pdf_path = spill_path
 
             with fitz.open(pdf_path) as doc:
+                page_count = len(doc)
 
-                if page < 0 or page >= len(doc):
-                    return {"success": False, "error": f"Invalid page number: {page}"}
-
-                page_obj = doc[page]
-                rect = fitz.Rect(*rect_coords)
+            workers = max(1, min(workers or os.cpu_count() or 1, page_count or 1))
+            shards = PDFProcessor.search_shards(page_count, workers, shard_size)
 
-                page_obj.add_redact_annot(rect, fill=fill_color)
-                page_obj.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+            started = time.perf_counter()
+            shard_results: Dict[int, Dict[str, Any]] = {}
 
-                if replacement:
-                    page_obj.insert_textbox(
-                        rect,
-                        replacement,
-                        fontsize=font_size,
-                        fontname=font_name,
-                        color=color,
-                        align=align
+            if workers == 1:
+                for shard_index, (start, stop) in enumerate(shards):
+                    shard_results[shard_index] = PDFProcessor.search_shard(
+                        pdf_path, query, start, stop, case_sensitive, whole_word, max_hits, context_words
                     )
-
-                doc.save(output_path)
-
-                return {
-                    "success": True,
-                    "message": "Replaced text" if replacement else "Removed text",
-                    "output_path": os.path.abspath(output_path)
-                }
+                    if max_hits and sum(r["match_count"] for r in shard_results.values()) >= max_hits:
+                        break
+            else:
+                cancel_event = multiprocessing.Event()
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_search_worker,
+                    initargs=(cancel_event,)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            PDFProcessor.search_shard,
+                            pdf_path, query, start, stop, case_sensitive, whole_word, max_hits, context_words
+                        ): shard_index
+                        for shard_index, (start, stop) in enumerate(shards)
+                    }
+                    next_shard = 0
+                    prefix_hits = 0
+                    for future in as_completed(futures):
+                        shard_results[futures[future]] = future.result()
+                        while next_shard in shard_results:
+                            prefix_hits += shard_results[next_shard]["match_count"]
+                            next_shard += 1
+                        if max_hits and prefix_hits >= max_hits:
+                            cancel_event.set()
+                            for pending in futures:
+                                pending.cancel()
+                            break
+
+            return PDFProcessor.merge_search_shards(
+                query, shards, shard_results, max_hits, page_count, workers, started
+            )
         except Exception as e:
             return {"success": False, "error": str(e)}
+        finally:
+            if spill_dir:
+                shutil.rmtree(spill_dir, ignore_errors=True)
 
     @staticmethod
-    def add_image(
+    def search_shards(page_count: int, workers: int, shard_size: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        The [start, stop) page ranges search_text_parallel hands out: about
+        four per worker, at most 50 pages each, unless shard_size is given
+        """
+        if not shard_size:
+            shard_size = max(1, min(50, -(-page_count // (workers * 4))))
+        return [(start, min(start + shard_size, page_count)) for start in range(0, page_count, shard_size)]
+
+    @staticmethod
+    def merge_search_shards(
+        query: str,
+        shards: List[Tuple[int, int]],
+        shard_results: Dict[int, Dict[str, Any]],
+        max_hits: int,
+        page_count: int,
+        workers: int,
+        started: float
+    ) -> Dict[str, Any]:
+        """
+        The search_text_parallel result for the search_shard results that
+        came back, keyed by shard index; missing shards count as cancelled
+        """
+        matches: List[Dict[str, Any]] = []
+        shard_timings: List[Dict[str, Any]] = []
+        for shard_index, (start, stop) in enumerate(shards):
+            shard = shard_results.get(shard_index)
+            if shard is None:
+                shard_timings.append({"pages": [start, stop], "status": "cancelled"})
+                continue
+            if not max_hits or len(matches) < max_hits:
+                matches.extend(shard["matches"])
+            shard_timings.append({
+                "pages": [start, stop],
+                "status": shard["status"],
+                "match_count": shard["match_count"],
+                "duration_ms": shard["duration_ms"]
+            })
+
+        if max_hits:
+            matches = matches[:max_hits]
+
+        return {
+            "success": True,
+            "query": query,
+            "match_count": len(matches),
+            "matches": matches,
+            "page_count": page_count,
+            "workers": workers,
+            "shards": shard_timings,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    @staticmethod
+    def search_shard(
         pdf_path: str,
-        output_path: str,
+        query: str,
+        start: int,
+        stop: int,
+        case_sensitive: bool = False,
+        whole_word: bool = False,
+        max_hits: int = 0,
+        context_words: int = 8
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        matches: List[Dict[str, Any]] = []
+        status = "done"
+        with fitz.open(pdf_path) as doc:
+            index = TextIndex.build_range(doc, start, stop)
+            for offset in index.candidate_pages(query):
+                if _search_cancel_event is not None and _search_cancel_event.is_set():
+                    status = "cancelled"
+                    break
+                matches.extend(PDFProcessor._page_matches(
+                    index, doc[start + offset], offset, query, case_sensitive, whole_word, context_words
+                ))
+                if max_hits and len(matches) >= max_hits:
+                    break
+
+        return {
+            "matches": matches[:max_hits] if max_hits else matches,
+            "match_count": min(len(matches), max_hits) if max_hits else len(matches),
+            "status": status,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    @staticmethod
+    def replace_text_instance(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        page: int,
+        rect_coords: List[float],
+        replacement: Optional[str] = None,
+        font_size: float = 12,
+        color: Tuple[float, float, float] = (0, 0, 0),
+        font_name: str = "helv",
+        align: int = 0,
+        fill_color: Tuple[float, float, float] = (1, 1, 1),
+        font_file: Optional[str] = None,
+        save_mode: Optional[str] = None,
+        save_profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._replace_text_instance,
+            page, rect_coords, replacement, font_size, color, font_name, align, fill_color, font_file,
+            save_mode=save_mode, save_profile=save_profile
+        )
+
+    @staticmethod
+    def _replace_text_instance(
+        doc: fitz.Document,
+        page: int,
+        rect_coords: List[float],
+        replacement: Optional[str] = None,
+        font_size: float = 12,
+        color: Tuple[float, float, float] = (0, 0, 0),
+        font_name: str = "helv",
+        align: int = 0,
+        fill_color: Tuple[float, float, float] = (1, 1, 1),
+        font_file: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if len(rect_coords) != 4:
+            return {"success": False, "error": "rect must contain 4 values"}
+
+        if page < 0 or page >= len(doc):
+            return {"success": False, "error": f"Invalid page number: {page}"}
+
+        page_obj = doc[page]
+        rect = fitz.Rect(*rect_coords)
+
+        page_obj.add_redact_annot(rect, fill=fill_color)
+        page_obj.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+
+        registry = FontRegistry.of(doc)
+        if replacement:
+            page_obj.insert_textbox(
+                rect,
+                replacement,
+                fontsize=font_size,
+                fontname=registry.resource(page_obj, font_name, font_file),
+                color=color,
+                align=align
+            )
+
+        return {
+            "success": True,
+            "message": "Replaced text" if replacement else "Removed text",
+            **registry.stats()
+        }
+
+    @staticmethod
+    def add_image(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
         image_path: str,
         x: float,
         y: float,
         page: int = 0,
         width: Optional[float] = None,
-        height: Optional[float] = None
+        height: Optional[float] = None,
+        pages: Union[List[int], str, None] = None,
+        save_mode: Optional[str] = None,
+        save_profile: Optional[str] = None
     ) -> Dict[str, Any]:
-        try:
-            if not os.path.exists(image_path):
-                return {"success": False, "error": f"Image not found: {image_path}"}
-
-            with fitz.open(pdf_path) as doc:
-
-                if page < 0 or page >= len(doc):
-                    return {"success": False, "error": f"Invalid page number: {page}"}
+        """
+        Place an image at (x, y), at its natural size unless both width and
+        height are given. pages (a list of page numbers, or "all") stamps
+        the same image onto many pages instead of page; it is embedded once
+        and every other placement references it.
+        """
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._add_image,
+            image_path, x, y, page, width, height, pages,
+            save_mode=save_mode, save_profile=save_profile
+        )
 
-                page_obj = doc[page]
+    @staticmethod
+    def _add_image(
+        doc: fitz.Document,
+        image_path: str,
+        x: float,
+        y: float,
+        page: int = 0,
+        width: Optional[float] = None,
+        height: Optional[float] = None,
+        pages: Union[List[int], str, None] = None
+    ) -> Dict[str, Any]:
+        if not os.path.exists(image_path):
+            return {"success": False, "error": f"Image not found: {image_path}"}
+
+        if pages is None:
+            if page < 0 or page >= len(doc):
+                return {"success": False, "error": f"Invalid page number: {page}"}
+            targets = [page]
+        else:
+            targets, error = PDFProcessor._target_pages(doc, pages)
+            if error:
+                return {"success": False, "error": error}
+
+        if width and height:
+            rect = fitz.Rect(x, y, x + width, y + height)
+        else:
+            natural_width, natural_height = image_size(image_path)
+            rect = fitz.Rect(x, y, x + natural_width, y + natural_height)
+
+        registry = ImageRegistry.of(doc)
+        with phase("insert_image"):
+            for processed, page_index in enumerate(targets, 1):
+                registry.insert(doc[page_index], rect, image_path)
+                report_progress(processed, len(targets))
+
+        return {
+            "success": True,
+            "message": f"Image added to page {targets[0]}" if len(targets) == 1 else f"Image added to {len(targets)} pages",
+            "pages_changed": len(targets),
+            **registry.stats()
+        }
 
-                if width and height:
-                    rect = fitz.Rect(x, y, x + width, y + height)
-                else:
-                    with fitz.open(image_path) as img:
-                        img_rect = img[0].rect
-                        rect = fitz.Rect(x, y, x + img_rect.width, y + img_rect.height)
+    @staticmethod
+    def stamp(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        text: Optional[str] = None,
+        image_path: Optional[str] = None,
+        pages: Union[List[int], str] = "all",
+        rect: Optional[List[float]] = None,
+        font_size: float = 48,
+        font_name: str = "helv",
+        font_file: Optional[str] = None,
+        color: Tuple[float, float, float] = (0.5, 0.5, 0.5),
+        rotate: float = 0,
+        opacity: float = 1.0,
+        overlay: bool = True,
+        save_mode: Optional[str] = None,
+        save_profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Watermark pages with text and/or an image, scaled to fit rect (the
+        whole page by default) and turned by rotate degrees. overlay=False
+        puts the stamp behind the page content. The stamp is built once and
+        shared by every page, so the file grows by a few objects however
+        many pages are stamped.
+        """
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._stamp,
+            text, image_path, pages, rect, font_size, font_name, font_file,
+            color, rotate, opacity, overlay,
+            save_mode=save_mode, save_profile=save_profile
+        )
 
-                page_obj.insert_image(rect, filename=image_path)
+    @staticmethod
+    def _stamp(
+        doc: fitz.Document,
+        text: Optional[str] = None,
+        image_path: Optional[str] = None,
+        pages: Union[List[int], str] = "all",
+        rect: Optional[List[float]] = None,
+        font_size: float = 48,
+        font_name: str = "helv",
+        font_file: Optional[str] = None,
+        color: Tuple[float, float, float] = (0.5, 0.5, 0.5),
+        rotate: float = 0,
+        opacity: float = 1.0,
+        overlay: bool = True
+    ) -> Dict[str, Any]:
+        if image_path and not os.path.exists(image_path):
+            return {"success": False, "error": f"Image not found: {image_path}"}
+        if not 0 < opacity <= 1:
+            return {"success": False, "error": "opacity must be greater than 0 and at most 1"}
+        if rect is not None and (len(rect) != 4 or fitz.Rect(rect).is_empty):
+            return {"success": False, "error": "rect must be four numbers [x0, y0, x1, y1] enclosing an area"}
+
+        targets, error = PDFProcessor._target_pages(doc, pages)
+        if error:
+            return {"success": False, "error": error}
+
+        if text:
+            try:
+                font_metrics(font_name, font_file)
+            except Exception:
+                return {"success": False, "error": f"Unknown font: {font_file or font_name}"}
+        try:
+            stamp = build_overlay(text, image_path, font_size, font_name, font_file, color, opacity)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
 
-                doc.save(output_path)
+        placer = StampPlacer(doc, stamp, foreground=overlay)
+        target_rect = fitz.Rect(rect) if rect is not None else None
+        with phase("stamp"):
+            for processed, page_index in enumerate(targets, 1):
+                page = doc[page_index]
+                placer.place(page, target_rect or page.rect, rotate)
+                report_progress(processed, len(targets))
+        stamp.close()
+
+        return {
+            "success": True,
+            "message": f"Stamped page {targets[0]}" if len(targets) == 1 else f"Stamped {len(targets)} pages",
+            "pages_changed": len(targets),
+            "stamp_forms": placer.objects
+        }
 
-                return {
-                    "success": True,
-                    "message": f"Image added to page {page}",
-                    "output_path": os.path.abspath(output_path)
-                }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+    @staticmethod
+    def _target_pages(doc: fitz.Document, pages: Union[List[int], str]) -> Tuple[List[int], Optional[str]]:
+        """
+        Page numbers for a pages argument: "all" or a non-empty list, with
+        duplicates dropped. Returns an error message instead when invalid.
+        """
+        if pages == "all":
+            return list(range(len(doc))), None
+        if not isinstance(pages, list) or not pages:
+            return [], "pages must be a non-empty list of page numbers or 'all'"
+        targets = list(dict.fromkeys(pages))
+        invalid_pages = [p for p in targets if not isinstance(p, int) or p < 0 or p >= len(doc)]
+        if invalid_pages:
+            return [], f"Invalid page numbers: {invalid_pages}"
+        return targets, None
 
     @staticmethod
     def delete_pages(
-        pdf_path: str,
-        output_path: str,
-        page_numbers: List[int]
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        page_numbers: List[int],
+        save_profile: Optional[str] = None
     ) -> Dict[str, Any]:
-        try:
-            with fitz.open(pdf_path) as doc:
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._delete_pages, page_numbers,
+            save_profile=save_profile
+        )
 
-                invalid_pages = [p for p in page_numbers if p < 0 or p >= len(doc)]
-                if invalid_pages:
-                    return {"success": False, "error": f"Invalid page numbers: {invalid_pages}"}
+    @staticmethod
+    def _delete_pages(doc: fitz.Document, page_numbers: List[int]) -> Dict[str, Any]:
+        invalid_pages = [p for p in page_numbers if p < 0 or p >= len(doc)]
+        if invalid_pages:
+            return {"success": False, "error": f"Invalid page numbers: {invalid_pages}"}
 
-                for page_num in sorted(page_numbers, reverse=True):
-                    doc.delete_page(page_num)
+        for page_num in sorted(page_numbers, reverse=True):
+            doc.delete_page(page_num)
 
-                doc.save(output_path)
-
-                return {
-                    "success": True,
-                    "message": f"Deleted {len(page_numbers)} pages",
-                    "output_path": os.path.abspath(output_path)
-                }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return {"success": True, "message": f"Deleted {len(page_numbers)} pages"}
 
     @staticmethod
     def reorder_pages(
-        pdf_path: str,
-        output_path: str,
-        new_order: List[int]
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        new_order: List[int],
+        save_profile: Optional[str] = None
     ) -> Dict[str, Any]:
-        try:
-            with fitz.open(pdf_path) as doc:
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._reorder_pages, new_order,
+            save_profile=save_profile
+        )
 
-                if len(new_order) != len(doc):
-                    return {
-                        "success": False,
-                        "error": f"Order length ({len(new_order)}) doesn't match page count ({len(doc)})"
-                    }
+    @staticmethod
+    def _reorder_pages(doc: fitz.Document, new_order: List[int]) -> Dict[str, Any]:
+        if len(new_order) != len(doc):
+            return {
+                "success": False,
+                "error": f"Order length ({len(new_order)}) doesn't match page count ({len(doc)})"
+            }
 
-                invalid_pages = [p for p in new_order if p < 0 or p >= len(doc)]
-                if invalid_pages:
-                    return {"success": False, "error": f"Invalid page numbers: {invalid_pages}"}
+        invalid_pages = [p for p in new_order if p < 0 or p >= len(doc)]
+        if invalid_pages:
+            return {"success": False, "error": f"Invalid page numbers: {invalid_pages}"}
 
-                doc.select(new_order)
+        doc.select(new_order)
 
-                doc.save(output_path)
-
-                return {
-                    "success": True,
-                    "message": f"Reordered {len(new_order)} pages",
-                    "output_path": os.path.abspath(output_path)
-                }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return {"success": True, "message": f"Reordered {len(new_order)} pages"}
 
     @staticmethod
     def merge_pdfs(
-        pdf_paths: List[str],
-        output_path: str
+        pdf_paths: List[PDFSource],
+        output_path: Optional[str],
+        memory_limit: Optional[int] = None,
+        deduplicate: bool = False,
+        save_profile: Optional[str] = None
     ) -> Dict[str, Any]:
+        profile = save_profile or PDFProcessor.default_save_profile
+        if profile not in PDFProcessor.SAVE_PROFILES:
+            return {"success": False, "error": f"Invalid save profile: {profile}"}
+
         try:
-            missing_files = [p for p in pdf_paths if not os.path.exists(p)]
+            missing_files = [p for p in pdf_paths if isinstance(p, str) and not os.path.exists(p)]
             if missing_files:
                 return {"success": False, "error": f"Files not found: {missing_files}"}
 
+            if memory_limit or deduplicate:
+                return PDFProcessor._merge_streaming(pdf_paths, output_path, memory_limit, deduplicate, profile)
+
             with fitz.open() as result_doc:
 
-                for pdf_path in pdf_paths:
-                    with fitz.open(pdf_path) as doc:
+                for merged, pdf_path in enumerate(pdf_paths, 1):
+                    with PDFProcessor._open_document(pdf_path) as doc, phase("insert"):
                         result_doc.insert_pdf(doc)
+                    # The total is only known once the last input is open.
+                    report_progress(len(result_doc), len(result_doc) if merged == len(pdf_paths) else None)
 
-                result_doc.save(output_path)
-
-                return {
+                result: Dict[str, Any] = {
                     "success": True,
                     "message": f"Merged {len(pdf_paths)} PDFs",
-                    "output_path": os.path.abspath(output_path)
+                    "input_bytes": sum(
+                        os.path.getsize(p) if isinstance(p, str) else len(p) for p in pdf_paths
+                    )
                 }
+                result.update(PDFProcessor._save_document(result_doc, output_path, profile))
+                if output_path is not None:
+                    result["output_path"] = os.path.abspath(output_path)
+
+                return result
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     @staticmethod
-    def extract_pages(
-        pdf_path: str,
-        output_path: str,
-        page_numbers: List[int]
+    def _merge_streaming(
+        pdf_paths: List[PDFSource],
+        output_path: Optional[str],
+        memory_limit: Optional[int],
+        deduplicate: bool,
+        save_profile: str
     ) -> Dict[str, Any]:
+        """
+        Merge the inputs one at a time into a spill file on disk.
+
+        Once the inputs appended since the last flush would exceed
+        memory_limit bytes, the pending pages are appended to the spill file
+        with an incremental save and the merged document is reopened from
+        disk, releasing the objects held in memory. With deduplicate the
+        spill file is finally rewritten with garbage=4, which drops unused
+        objects and stores fonts, images and other objects shared between
+        inputs once. Any save profile but "fast" also rewrites it; otherwise
+        it becomes the output as is.
+
+        bytes_saved is measured against the spill file, i.e. the merge
+        without the final rewrite.
+        """
+        spill_dir = tempfile.mkdtemp(
+            prefix="pdf_merge_",
+            dir=os.path.dirname(os.path.abspath(output_path)) if output_path else None
+        )
+        spill_path = os.path.join(spill_dir, "merged.pdf")
+        result_doc = fitz.open()
         try:
-            with fitz.open(pdf_path) as doc:
+            input_bytes = 0
+            pending_bytes = 0
+            flushes = 0
+            for merged, pdf_path in enumerate(pdf_paths, 1):
+                size = os.path.getsize(pdf_path) if isinstance(pdf_path, str) else len(pdf_path)
+                if memory_limit and pending_bytes and pending_bytes + size > memory_limit:
+                    result_doc = PDFProcessor._flush_merge(result_doc, spill_path)
+                    flushes += 1
+                    pending_bytes = 0
+
+                with PDFProcessor._open_document(pdf_path) as doc, phase("insert"):
+                    result_doc.insert_pdf(doc)
+                input_bytes += size
+                pending_bytes += size
+                report_progress(len(result_doc), len(result_doc) if merged == len(pdf_paths) else None)
+
+            result_doc = PDFProcessor._flush_merge(result_doc, spill_path)
+            flushes += 1
+            unoptimized_bytes = os.path.getsize(spill_path)
+
+            result: Dict[str, Any] = {
+                "success": True,
+                "message": f"Merged {len(pdf_paths)} PDFs",
+                "input_bytes": input_bytes,
+                "unoptimized_bytes": unoptimized_bytes,
+                "flushes": flushes,
+                "deduplicated": deduplicate,
+            }
+            if deduplicate or PDFProcessor.SAVE_PROFILES[save_profile]:
+                overrides = {"garbage": 4} if deduplicate else {}
+                result.update(PDFProcessor._save_document(result_doc, output_path, save_profile, **overrides))
+                result_doc.close()
+            else:
+                result_doc.close()
+                if output_path is None:
+                    with open(spill_path, "rb") as handle:
+                        result["output"] = handle.read()
+                else:
+                    shutil.move(spill_path, output_path)
+
+            if output_path is None:
+                output_bytes = len(result["output"])
+            else:
+                output_bytes = os.path.getsize(output_path)
+                result["output_path"] = os.path.abspath(output_path)
+            result["output_bytes"] = output_bytes
+            result["bytes_saved"] = unoptimized_bytes - output_bytes
+            return result
+        finally:
+            if not result_doc.is_closed:
+                result_doc.close()
+            shutil.rmtree(spill_dir, ignore_errors=True)
 
-                invalid_pages = [p for p in page_numbers if p < 0 or p >= len(doc)]
-                if invalid_pages:
-                    return {"success": False, "error": f"Invalid page numbers: {invalid_pages}"}
+    @staticmethod
+    def _flush_merge(result_doc: fitz.Document, spill_path: str) -> fitz.Document:
+        with phase("flush"):
+            if os.path.exists(spill_path):
+                result_doc.save(spill_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            else:
+                result_doc.save(spill_path)
+            result_doc.close()
+        return fitz.open(spill_path)
 
-                doc.select(page_numbers)
+    @staticmethod
+    def extract_pages(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        page_numbers: List[int],
+        save_profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        # Appending to the full source would defeat the point of extracting.
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._extract_pages, page_numbers,
+            save_mode="full", save_profile=save_profile
+        )
 
-                doc.save(output_path)
+    @staticmethod
+    def _extract_pages(doc: fitz.Document, page_numbers: List[int]) -> Dict[str, Any]:
+        invalid_pages = [p for p in page_numbers if p < 0 or p >= len(doc)]
+        if invalid_pages:
+            return {"success": False, "error": f"Invalid page numbers: {invalid_pages}"}
 
-                return {
-                    "success": True,
-                    "message": f"Extracted {len(page_numbers)} pages",
-                    "output_path": os.path.abspath(output_path)
-                }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        doc.select(page_numbers)
+
+        return {"success": True, "message": f"Extracted {len(page_numbers)} pages"}
 
     @staticmethod
-    def redact_text(
-        pdf_path: str,
-        output_path: str,
-        targets: List[str],
-        fill_color: tuple = (1, 1, 1)
+    def optimize_pdf(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        save_profile: str = "balanced"
     ) -> Dict[str, Any]:
-        try:
-            removed = 0
-            with fitz.open(pdf_path) as doc:
-
-                for page in doc:
-                    for target in targets:
-                        rects = page.search_for(target)
-                        for rect in rects:
-                            page.add_redact_annot(rect, fill=fill_color)
-                            removed += 1
-                    page.apply_redactions()
-
-                doc.save(output_path)
+        """
+        Rewrite a PDF with the given save profile and report the size change
+        """
+        result = PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._optimize_pdf,
+            save_mode="full", save_profile=save_profile
+        )
+        if result.get("success"):
+            result["bytes_saved"] = result["input_bytes"] - result["output_bytes"]
+            result["message"] = (
+                f"Optimized {result['input_bytes']} to {result['output_bytes']} bytes "
+                f"({result['save_profile']})"
+            )
+        return result
 
-                return {
-                    "success": True,
-                    "message": f"Redacted {removed} instances",
-                    "removed_count": removed,
-                    "output_path": os.path.abspath(output_path)
-                }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+    @staticmethod
+    def _optimize_pdf(doc: fitz.Document) -> Dict[str, Any]:
+        return {"success": True, "page_count": len(doc)}
 
     @staticmethod
-    def search_text(pdf_path: str, search_term: str, case_sensitive: bool = False) -> Dict[str, Any]:
+    def split_pdf(
+        pdf_path: PDFSource,
+        ranges: List[List[int]],
+        output_dir: Optional[str] = None,
+        workers: int = 1,
+        save_profile: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Search for text in PDF and return all matches with location info
+        Write one PDF per entry of ranges (each a list of 0-based pages),
+        parsing the source once instead of once per output.
+
+        Parts are saved as part-<n>.pdf under output_dir, or returned as bytes
+        when output_dir is None. With workers > 1 the ranges are divided
+        between processes that each open the source once.
         """
+        profile = save_profile or PDFProcessor.default_save_profile
+        if profile not in PDFProcessor.SAVE_PROFILES:
+            return {"success": False, "error": f"Invalid save profile: {profile}"}
+
+        spill_dir: Optional[str] = None
         try:
-            with fitz.open(pdf_path) as doc:
-                results = []
-                total_matches = 0
-
-                for page_num, page in enumerate(doc):
-                    # Search for text (PyMuPDF search is case-sensitive by default)
-                    search_flags = 0 if case_sensitive else fitz.TEXT_PRESERVE_WHITESPACE
-                    rects = page.search_for(search_term, flags=search_flags)
-
-                    for rect in rects:
-                        # Get surrounding text for context
-                        text_dict = page.get_text("dict")
-                        context = search_term  # Simple context (can be enhanced)
-
-                        results.append({
-                            "page": page_num,
-                            "text": search_term,
-                            "rect": [rect.x0, rect.y0, rect.x1, rect.y1],
-                            "context": context
-                        })
-                        total_matches += 1
+            if isinstance(pdf_path, str) and not os.path.exists(pdf_path):
+                return {"success": False, "error": f"File not found: {pdf_path}"}
+            if not ranges or any(not pages for pages in ranges):
+                return {"success": False, "error": "Every range needs at least one page"}
+
+            with PDFProcessor._open_document(pdf_path) as doc:
+                page_count = len(doc)
+                invalid_pages = sorted({p for pages in ranges for p in pages if p < 0 or p >= page_count})
+                if invalid_pages:
+                    return {"success": False, "error": f"Invalid page numbers: {invalid_pages}"}
 
-                return {
-                    "success": True,
-                    "total_matches": total_matches,
-                    "search_term": search_term,
-                    "results": results
-                }
+                jobs = list(enumerate(ranges))
+                workers = max(1, min(workers, len(jobs)))
+                if workers == 1:
+                    with phase("split"):
+                        parts = PDFProcessor._split_ranges(doc, jobs, output_dir, profile)
+
+            if workers > 1:
+                if not isinstance(pdf_path, str):
+                    # Workers share a file rather than each receiving a copy of the buffer.
+                    spill_dir = tempfile.mkdtemp(prefix="pdf_split_")
+                    spill_path = os.path.join(spill_dir, "source.pdf")
+                    with open(spill_path, "wb") as handle:
+                        handle.write(pdf_path)
+                    pdf_path = spill_path
+
+                parts = []
+                with phase("split"), ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(
+                            PDFProcessor._split_worker, pdf_path, jobs[offset::workers], output_dir, profile
+                        )
+                        for offset in range(workers)
+                    ]
+                    total_pages = sum(len(pages) for pages in ranges)
+                    for future in futures:
+                        parts.extend(future.result())
+                        report_progress(sum(part["page_count"] for part in parts), total_pages)
+                parts.sort(key=lambda part: part["index"])
+
+            return {
+                "success": True,
+                "message": f"Split into {len(parts)} documents",
+                "parts": parts,
+                "workers": workers,
+                "save_profile": profile
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
+        finally:
+            if spill_dir:
+                shutil.rmtree(spill_dir, ignore_errors=True)
 
     @staticmethod
-    def replace_text(
+    def _split_worker(
         pdf_path: str,
-        output_path: str,
+        jobs: List[Tuple[int, List[int]]],
+        output_dir: Optional[str],
+        save_profile: str
+    ) -> List[Dict[str, Any]]:
+        with fitz.open(pdf_path) as doc:
+            return PDFProcessor._split_ranges(doc, jobs, output_dir, save_profile)
+
+    @staticmethod
+    def _split_ranges(
+        doc: fitz.Document,
+        jobs: List[Tuple[int, List[int]]],
+        output_dir: Optional[str],
+        save_profile: str
+    ) -> List[Dict[str, Any]]:
+        parts: List[Dict[str, Any]] = []
+        pages_done = 0
+        total_pages = sum(len(pages) for _, pages in jobs)
+        for index, pages in jobs:
+            with fitz.open() as part_doc:
+                # Copy consecutive pages in one insert_pdf call per run.
+                run_start = previous = pages[0]
+                for page in pages[1:] + [None]:
+                    if page is not None and page == previous + 1:
+                        previous = page
+                        continue
+                    part_doc.insert_pdf(doc, from_page=run_start, to_page=previous)
+                    if page is not None:
+                        run_start = previous = page
+
+                part_path = os.path.join(output_dir, f"part-{index + 1}.pdf") if output_dir else None
+                saved = PDFProcessor._save_document(part_doc, part_path, save_profile)
+                part: Dict[str, Any] = {"index": index, "page_count": len(pages), "size": saved["output_bytes"]}
+                if part_path is None:
+                    part["output"] = saved["output"]
+                else:
+                    part["output_path"] = os.path.abspath(part_path)
+                parts.append(part)
+            pages_done += len(pages)
+            report_progress(pages_done, total_pages)
+        return parts
+
+    @staticmethod
+    def redact_text(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        targets: List[str],
+        fill_color: tuple = (1, 1, 1),
+        save_mode: Optional[str] = None,
+        patterns: Optional[List[str]] = None,
+        presets: Optional[List[str]] = None,
+        case_sensitive: bool = False,
+        save_profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._redact_text,
+            targets, fill_color, patterns, presets, case_sensitive,
+            save_mode=save_mode, save_profile=save_profile
+        )
+
+    @staticmethod
+    def _redact_text(
+        doc: fitz.Document,
+        targets: List[str],
+        fill_color: tuple = (1, 1, 1),
+        patterns: Optional[List[str]] = None,
+        presets: Optional[List[str]] = None,
+        case_sensitive: bool = False
+    ) -> Dict[str, Any]:
+        try:
+            engine = RedactionEngine.from_options(targets, patterns, presets, case_sensitive)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+
+        index: Optional[TextIndex] = None
+        if engine.has_patterns:
+            pages_to_scan = range(len(doc))
+        else:
+            # Literal-only redactions can skip pages the text index rules out,
+            # and take match positions from the same index.
+            index = get_text_index(doc)
+            pages_to_scan = sorted({
+                page_index
+                for target in engine.targets
+                for page_index in index.candidate_pages(target)
+            })
+
+        removed = 0
+        match_counts: Dict[str, int] = {}
+        for scanned, page_index in enumerate(pages_to_scan, 1):
+            page = doc[page_index]
+            with phase("search"):
+                regions, counts = engine.find(page) if index is None else engine.find_indexed(index, page)
+            if not regions:
+                report_progress(scanned, len(pages_to_scan))
+                continue
+            for rects in regions:
+                for rect in rects:
+                    page.add_redact_annot(rect.quad, fill=fill_color)
+                removed += 1
+            for key, count in counts.items():
+                match_counts[key] = match_counts.get(key, 0) + count
+            with phase("apply_redactions"):
+                page.apply_redactions()
+            report_progress(scanned, len(pages_to_scan))
+
+        return {
+            "success": True,
+            "message": f"Redacted {removed} instances",
+            "removed_count": removed,
+            "match_counts": match_counts
+        }
+
+    @staticmethod
+    def replace_text(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
         search_term: str,
         replacement: str,
         page: Optional[int] = None,
         font_size: Optional[float] = None,
         font_name: str = "helv",
-        color: tuple = (0, 0, 0)
+        color: tuple = (0, 0, 0),
+        font_file: Optional[str] = None,
+        save_mode: Optional[str] = None,
+        save_profile: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Replace text in PDF by redacting old text and adding new text
         """
-        try:
-            replaced_count = 0
-            with fitz.open(pdf_path) as doc:
-                pages_to_process = [doc[page]] if page is not None else doc
-
-                for page_obj in pages_to_process:
-                    # Find all instances of search term
-                    rects = page_obj.search_for(search_term)
-
-                    for rect in rects:
-                        # Redact (cover) the old text with white
-                        page_obj.add_redact_annot(rect, fill=(1, 1, 1))
-
-                        # Calculate font size if not provided
-                        if font_size is None:
-                            estimated_font_size = rect.height * 0.8
-                        else:
-                            estimated_font_size = font_size
-
-                        # Insert new text at the same position
-                        # Note: Position might need adjustment for better alignment
-                        page_obj.insert_text(
-                            (rect.x0, rect.y1 - 2),  # Slight vertical adjustment
-                            replacement,
-                            fontsize=estimated_font_size,
-                            color=color,
-                            fontname=font_name
-                        )
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._replace_text,
+            search_term, replacement, page, font_size, font_name, color, font_file,
+            save_mode=save_mode, save_profile=save_profile
+        )
+
+    @staticmethod
+    def _replace_text(
+        doc: fitz.Document,
+        search_term: str,
+        replacement: str,
+        page: Optional[int] = None,
+        font_size: Optional[float] = None,
+        font_name: str = "helv",
+        color: tuple = (0, 0, 0),
+        font_file: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if page is not None and (page < 0 or page >= len(doc)):
+            return {"success": False, "error": f"Invalid page number: {page}"}
+
+        result = PDFProcessor._replace_text_bulk(
+            doc,
+            [{"search": search_term, "replacement": replacement, "page": page}],
+            font_name=font_name,
+            font_size=font_size,
+            color=color,
+            font_file=font_file
+        )
+        if result.get("success"):
+            result["message"] = f"Replaced {result['replaced_count']} instances"
+        return result
 
-                        replaced_count += 1
+    @staticmethod
+    def validate_replacements(replacements: Any) -> Optional[str]:
+        """
+        Check a bulk replacement list up front; returns an error message or None
+        """
+        if not isinstance(replacements, list) or not replacements:
+            return "replacements must be a non-empty list"
 
-                    # Apply redactions
-                    page_obj.apply_redactions()
+        for item_index, item in enumerate(replacements):
+            if not isinstance(item, dict):
+                return f"Replacement {item_index}: expected an object"
+            if not isinstance(item.get("replacement", ""), str):
+                return f"Replacement {item_index}: replacement must be a string"
 
-                doc.save(output_path)
+            if "rect" in item:
+                rect = item["rect"]
+                if not isinstance(rect, list) or len(rect) != 4:
+                    return f"Replacement {item_index}: rect must contain 4 values"
+                if not isinstance(item.get("page"), int):
+                    return f"Replacement {item_index}: page is required with rect"
+            elif not isinstance(item.get("search"), str) or not item["search"].strip():
+                return f"Replacement {item_index}: either rect or search is required"
 
-                return {
-                    "success": True,
-                    "message": f"Replaced {replaced_count} instances",
-                    "replaced_count": replaced_count,
-                    "output_path": os.path.abspath(output_path)
-                }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+            if item.get("align", 0) not in (0, 1, 2):
+                return f"Replacement {item_index}: align must be 0, 1 or 2"
+
+        return None
 
     @staticmethod
-    def get_info(pdf_path: str) -> Dict[str, Any]:
+    def replace_text_bulk(
+        pdf_path: PDFSource,
+        output_path: Optional[str],
+        replacements: List[Dict[str, Any]],
+        font_name: str = "helv",
+        font_size: Optional[float] = None,
+        color: tuple = (0, 0, 0),
+        fill_color: tuple = (1, 1, 1),
+        font_file: Optional[str] = None,
+        save_mode: Optional[str] = None,
+        save_profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply many replacements with a single save. Each item is either
+        {"page", "rect", "replacement"} for a known location or
+        {"search", "replacement"} (with optional "page", "case_sensitive"
+        and "whole_word") for every occurrence of a term; both accept
+        "font_size", "color" and "align" overrides.
+        """
+        return PDFProcessor._edit_document(
+            pdf_path, output_path, PDFProcessor._replace_text_bulk,
+            replacements, font_name, font_size, color, fill_color, font_file,
+            save_mode=save_mode, save_profile=save_profile
+        )
+
+    @staticmethod
+    def _replace_text_bulk(
+        doc: fitz.Document,
+        replacements: List[Dict[str, Any]],
+        font_name: str = "helv",
+        font_size: Optional[float] = None,
+        color: tuple = (0, 0, 0),
+        fill_color: tuple = (1, 1, 1),
+        font_file: Optional[str] = None
+    ) -> Dict[str, Any]:
+        error = PDFProcessor.validate_replacements(replacements)
+        if error:
+            return {"success": False, "error": error}
+
         try:
-            with fitz.open(pdf_path) as doc:
+            font = font_metrics(font_name, font_file)
+        except Exception:
+            return {"success": False, "error": f"Unknown font: {font_file or font_name}"}
+        registry = FontRegistry.of(doc)
+
+        # Locate everything against the unmodified document first, so a
+        # replacement never matches text inserted by an earlier one.
+        edits: Dict[int, List[Tuple[fitz.Rect, str, Optional[float], tuple, int]]] = {}
+        counts: List[int] = []
+        index: Optional[TextIndex] = None
+        with phase("search"):
+            for item_index, item in enumerate(replacements):
+                page = item.get("page")
+                if page is not None and (page < 0 or page >= len(doc)):
+                    return {"success": False, "error": f"Replacement {item_index}: invalid page number: {page}"}
+                edit = (item.get("replacement", ""), item.get("font_size", font_size),
+                        tuple(item.get("color", color)), item.get("align", 0))
+
+                if "rect" in item:
+                    edits.setdefault(page, []).append((fitz.Rect(*item["rect"]), *edit))
+                    counts.append(1)
+                    continue
+
+                index = index or get_text_index(doc)
+                found = 0
+                for page_index in index.candidate_pages(item["search"]):
+                    if page is not None and page_index != page:
+                        continue
+                    matches = index.search_page(
+                        page_index, item["search"],
+                        bool(item.get("case_sensitive", False)), bool(item.get("whole_word", False)),
+                        doc[page_index]
+                    )
+                    for rect, _text, _first, _end in matches:
+                        edits.setdefault(page_index, []).append((rect, *edit))
+                    found += len(matches)
+                counts.append(found)
+
+        for processed, page_index in enumerate(sorted(edits), 1):
+            page_obj = doc[page_index]
+            page_edits = edits[page_index]
+            # All redactions first, then one content stream with all insertions.
+            with phase("apply_redactions"):
+                for rect, *_ in page_edits:
+                    page_obj.add_redact_annot(rect, fill=fill_color)
+                page_obj.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
 
-                pages_info = []
-                for i, page in enumerate(doc):
-                    pages_info.append({
-                        "page_number": i,
-                        "width": page.rect.width,
-                        "height": page.rect.height,
-                        "rotation": page.rotation
-                    })
+            with phase("insert_text"):
+                shape = page_obj.new_shape()
+                resource = None
+                for rect, text, size, text_color, align in page_edits:
+                    if not text:
+                        continue
+                    resource = resource or registry.resource(page_obj, font_name, font_file)
+                    size = size or rect.height * 0.8
+                    width = font.text_length(text, fontsize=size)
+                    x = rect.x0 + (rect.width - width) * (0, 0.5, 1)[align]
+                    # Baseline where the font's descender touches the bottom of the rect.
+                    y = rect.y1 + font.descender * size
+                    shape.insert_text((x, y), text, fontsize=size, fontname=resource, color=text_color)
+                if shape.text_cont:
+                    shape.commit()
+            report_progress(processed, len(edits))
+
+        replaced_count = sum(counts)
+        return {
+            "success": True,
+            "message": f"Replaced {replaced_count} instances on {len(edits)} pages",
+            "replaced_count": replaced_count,
+            "replaced_counts": counts,
+            "pages_changed": len(edits),
+            **registry.stats()
+        }
+
+    @staticmethod
+    def get_info(
+        pdf_path: PDFSource,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        columnar: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Document metadata plus the size and rotation of pages
+        [offset, offset + limit).
+
+        Page geometry is read from the page tree instead of loading each page.
+        fields selects the per-page keys (default: all of INFO_FIELDS), and
+        columnar returns them as parallel lists instead of a list of dicts.
+        """
+        try:
+            selected = list(fields) if fields else list(PDFProcessor.INFO_FIELDS)
+            unknown = [name for name in selected if name not in PDFProcessor.INFO_FIELDS]
+            if unknown:
+                return {"success": False, "error": f"Unknown fields: {unknown}"}
+            if offset < 0 or (limit is not None and limit < 0):
+                return {"success": False, "error": "offset and limit must not be negative"}
+
+            with PDFProcessor._open_document(pdf_path) as doc:
+                page_count = len(doc)
+                start = min(offset, page_count)
+                stop = page_count if limit is None else min(page_count, start + limit)
+
+                rows = []
+                rotations: Dict[int, int] = {}
+                needs_geometry = any(name != "page_number" for name in selected)
+                with phase("read"):
+                    for i in range(start, stop):
+                        row: Dict[str, Any] = {"page_number": i}
+                        if needs_geometry:
+                            row["width"], row["height"], row["rotation"] = PDFProcessor._page_geometry(
+                                doc, i, rotations
+                            )
+                        rows.append(row)
+
+                pages: Any
+                if columnar:
+                    pages = {name: [row[name] for row in rows] for name in selected}
+                else:
+                    pages = [{name: row[name] for name in selected} for row in rows]
 
                 metadata = doc.metadata
 
                 info = {
                     "success": True,
-                    "page_count": len(doc),
-                    "pages": pages_info,
+                    "page_count": page_count,
+                    "offset": start,
+                    "next_offset": stop if stop < page_count else None,
+                    "pages": pages,
                     "metadata": {
                         "title": metadata.get("title", ""),
                         "author": metadata.get("author", ""),
@@ -443,3 +1524,379 @@ class PDFProcessor:
                 return info
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def extract_text(
+        pdf_path: PDFSource,
+        pages: Optional[List[int]] = None,
+        mode: str = "text",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Text of the selected pages (default: all) in one of TEXT_MODES, one
+        entry per page. offset and limit window the selection so a caller
+        can stream a large document in bounded batches; next_offset is None
+        after the last one.
+        """
+        if mode not in PDFProcessor.TEXT_MODES:
+            return {"success": False, "error": f"Invalid text mode: {mode}"}
+        if offset < 0 or (limit is not None and limit < 0):
+            return {"success": False, "error": "offset and limit must not be negative"}
+
+        try:
+            with PDFProcessor._open_document(pdf_path) as doc:
+                page_count = len(doc)
+                selected = list(range(page_count)) if pages is None else pages
+                invalid = [number for number in selected if number < 0 or number >= page_count]
+                if invalid:
+                    return {"success": False, "error": f"Invalid page numbers: {invalid[:10]}"}
+
+                start = min(offset, len(selected))
+                stop = len(selected) if limit is None else min(len(selected), start + limit)
+                with phase("extract"):
+                    rows = [PDFProcessor._page_text(doc[number], mode, sort) for number in selected[start:stop]]
+                report_progress(stop, len(selected))
+
+                return {
+                    "success": True,
+                    "mode": mode,
+                    "page_count": page_count,
+                    "selected_count": len(selected),
+                    "offset": start,
+                    "next_offset": stop if stop < len(selected) else None,
+                    "pages": rows
+                }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _page_text(page: fitz.Page, mode: str, sort: bool) -> Dict[str, Any]:
+        row: Dict[str, Any] = {
+            "page": page.number,
+            "width": round(page.rect.width, 2),
+            "height": round(page.rect.height, 2)
+        }
+        if mode == "text":
+            row["text"] = page.get_text("text", sort=sort)
+        elif mode == "words":
+            row["words"] = [
+                [round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2), word, block, line, number]
+                for x0, y0, x1, y1, word, block, line, number in page.get_text("words", sort=sort)
+            ]
+        else:
+            layout = page.get_text("dict", flags=fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES, sort=sort)
+            row["blocks"] = [
+                {
+                    "bbox": _round_bbox(block["bbox"]),
+                    "lines": [
+                        {
+                            "bbox": _round_bbox(line["bbox"]),
+                            "dir": [round(value, 4) for value in line["dir"]],
+                            "spans": [
+                                {
+                                    "bbox": _round_bbox(span["bbox"]),
+                                    "text": span["text"],
+                                    "font": span["font"],
+                                    "size": round(span["size"], 2),
+                                    "flags": span["flags"],
+                                    "color": span["color"]
+                                }
+                                for span in line["spans"]
+                            ]
+                        }
+                        for line in block["lines"]
+                    ]
+                }
+                for block in layout["blocks"]
+                if block["type"] == 0
+            ]
+        return row
+
+    @staticmethod
+    def get_info_batch(
+        pdf_paths: Iterable[PDFSource],
+        workers: Optional[int] = None,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        get_info for many documents across worker processes, with aggregate
+        throughput under "summary"
+        """
+        return PDFProcessor._collect_batch(pdf_paths, "get_info", options, workers)
+
+    @staticmethod
+    def search_text_batch(
+        pdf_paths: Iterable[PDFSource],
+        query: str,
+        workers: Optional[int] = None,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        search_text for many documents across worker processes, with
+        aggregate throughput and match counts under "summary"
+        """
+        return PDFProcessor._collect_batch(pdf_paths, "search_text", {"query": query, **options}, workers)
+
+    @staticmethod
+    def iter_batch(
+        pdf_paths: Iterable[PDFSource],
+        operation: str,
+        params: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run a BATCH_OPERATIONS method on every document and yield each result
+        as soon as it finishes, tagged with the document's index in
+        pdf_paths. Only a few documents per worker are submitted ahead, so
+        pdf_paths may be a lazy listing of any size.
+        """
+        if operation not in PDFProcessor.BATCH_OPERATIONS:
+            raise ValueError(f"Invalid batch operation: {operation}")
+        params = params or {}
+        workers = max(1, workers or os.cpu_count() or 1)
+
+        if workers == 1:
+            for index, pdf_path in enumerate(pdf_paths):
+                yield PDFProcessor.batch_item(operation, index, pdf_path, params)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for index, pdf_path in enumerate(pdf_paths):
+                pending.add(executor.submit(PDFProcessor.batch_item, operation, index, pdf_path, params))
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+
+    @staticmethod
+    def batch_item(operation: str, index: int, pdf_path: PDFSource, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        One document of a batch: a BATCH_OPERATIONS result tagged with index,
+        document path, size in bytes and duration_ms
+        """
+        if operation not in PDFProcessor.BATCH_OPERATIONS:
+            return {"success": False, "error": f"Invalid batch operation: {operation}", "index": index}
+        started = time.perf_counter()
+        result = getattr(PDFProcessor, operation)(pdf_path, **params)
+        result["index"] = index
+        if isinstance(pdf_path, str):
+            result["document"] = pdf_path
+            try:
+                result["bytes"] = os.path.getsize(pdf_path)
+            except OSError:
+                result["bytes"] = None
+        else:
+            result["bytes"] = len(pdf_path)
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    @staticmethod
+    def _collect_batch(
+        pdf_paths: Iterable[PDFSource],
+        operation: str,
+        params: Dict[str, Any],
+        workers: Optional[int]
+    ) -> Dict[str, Any]:
+        try:
+            stats = BatchStats()
+            documents = []
+            for result in PDFProcessor.iter_batch(pdf_paths, operation, params, workers):
+                stats.add(result)
+                documents.append(result)
+            documents.sort(key=lambda result: result["index"])
+            return {"success": True, "documents": documents, "summary": stats.export()}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _page_geometry(
+        doc: fitz.Document,
+        page_number: int,
+        rotations: Dict[int, int]
+    ) -> Tuple[float, float, int]:
+        """
+        Width, height and rotation of a page as page.rect and page.rotation
+        report them, read from the page dictionary (and the /Pages nodes it
+        inherits from) without loading the page. rotations caches the
+        inherited rotation of each /Pages node.
+        """
+        try:
+            if not doc.is_pdf:
+                raise ValueError("not a PDF")
+            cropbox = doc.page_cropbox(page_number)
+            rotation = PDFProcessor._page_rotation(doc, doc.page_xref(page_number), rotations)
+        except (ValueError, RuntimeError, RecursionError):
+            # Malformed trees (and non-PDF documents) take the slow path.
+            page = doc[page_number]
+            return page.rect.width, page.rect.height, page.rotation
+
+        if rotation in (90, 270):
+            return cropbox.height, cropbox.width, rotation
+        return cropbox.width, cropbox.height, rotation
+
+    @staticmethod
+    def _page_rotation(doc: fitz.Document, xref: int, rotations: Dict[int, int]) -> int:
+        kind, value = doc.xref_get_key(xref, "Rotate")
+        if kind == "null":
+            kind, parent = doc.xref_get_key(xref, "Parent")
+            if kind != "xref":
+                return 0
+            parent_xref = int(parent.split()[0])
+            if parent_xref not in rotations:
+                rotations[parent_xref] = PDFProcessor._page_rotation(doc, parent_xref, rotations)
+            return rotations[parent_xref]
+
+        # Same normalization as MuPDF: multiples of 90 in [0, 360), else 0.
+        rotation = int(float(value)) % 360
+        return rotation if rotation % 90 == 0 else 0
+
+    @staticmethod
+    def image_name(image: Dict[str, Any]) -> str:
+        """
+        Archive name of one render_pages image, by its 0-based page number
+        like the pages argument
+        """
+        return f"page-{image['page']}.{image['format']}"
+
+    @staticmethod
+    def render_pages(
+        pdf_path: Optional[PDFSource],
+        pages: List[int],
+        zoom: float = 1.0,
+        width: Optional[int] = None,
+        image_format: str = "png",
+        tile_size: Optional[int] = None,
+        tile: Tuple[int, int] = (0, 0),
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 0,
+        document_hash: Optional[str] = None,
+        max_zoom: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Rasterize pages, or one tile_size x tile_size tile of each page, at
+        zoom (or scaled to width pixels). With max_zoom set, a width that
+        would need a larger zoom on any page is rejected before rendering.
+
+        With cache_dir set, images are cached on disk under (document hash,
+        page, scale, tile, format) and cached pages are served without opening
+        the PDF at all. pdf_path may be None when document_hash is given, in
+        which case every requested image must already be cached.
+        """
+        try:
+            if image_format not in PDFProcessor.RENDER_FORMATS:
+                return {"success": False, "error": f"Unsupported image format: {image_format}"}
+            if pdf_path is None and not document_hash:
+                return {"success": False, "error": "A PDF or a document hash is required."}
+            if isinstance(pdf_path, str) and not os.path.exists(pdf_path):
+                return {"success": False, "error": f"File not found: {pdf_path}"}
+
+            if not document_hash:
+                document_hash = source_digest(pdf_path)
+            cache = _render_cache(cache_dir, cache_max_bytes) if cache_dir else None
+
+            scale = f"w{width}" if width else f"z{zoom:g}"
+            tile_key = f"t{tile_size}:{tile[0]}:{tile[1]}" if tile_size else "full"
+            images: List[Dict[str, Any]] = []
+            missing: List[Tuple[int, str]] = []
+            for page_number in pages:
+                key = f"{document_hash}:{page_number}:{scale}:{tile_key}:{image_format}"
+                with phase("cache"):
+                    data = cache.get(key) if cache is not None else None
+                images.append({"page": page_number, "format": image_format, "data": data, "cached": data is not None})
+                if data is None:
+                    missing.append((len(images) - 1, key))
+
+            if missing and pdf_path is None:
+                return {"success": False, "error": "Pages not cached for this document hash.", "not_cached": True}
+
+            if missing:
+                with PDFProcessor._open_document(pdf_path) as doc:
+                    invalid_pages = [images[i]["page"] for i, _ in missing
+                                     if not 0 <= images[i]["page"] < len(doc)]
+                    if invalid_pages:
+                        return {"success": False, "error": f"Invalid page numbers: {invalid_pages}"}
+
+                    # width overrides zoom, so the limit applies to the zoom it implies.
+                    zooms = [width / doc[images[i]["page"]].rect.width if width else zoom for i, _ in missing]
+                    too_large = [images[i]["page"] for (i, _), z in zip(missing, zooms) if max_zoom and z > max_zoom]
+                    if too_large:
+                        return {
+                            "success": False,
+                            "error": f"Pages {too_large} would render above zoom {max_zoom:g}; lower width or zoom."
+                        }
+
+                    for rendered, ((image_index, key), page_zoom) in enumerate(zip(missing, zooms), 1):
+                        page = doc[images[image_index]["page"]]
+                        data = PDFProcessor._render_page(page, page_zoom, image_format, tile_size, tile)
+                        if data is None:
+                            return {"success": False, "error": f"Tile {tile} is outside page {page.number}"}
+                        images[image_index]["data"] = data
+                        if cache is not None:
+                            cache.put(key, data)
+                        report_progress(rendered, len(missing))
+
+            return {
+                "success": True,
+                "document_hash": document_hash,
+                "images": images,
+                "cached_count": len(images) - len(missing),
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _render_page(
+        page: fitz.Page,
+        zoom: float,
+        image_format: str,
+        tile_size: Optional[int],
+        tile: Tuple[int, int]
+    ) -> Optional[bytes]:
+        matrix = fitz.Matrix(zoom, zoom)
+        clip = None
+        if tile_size:
+            # Tiles are addressed in output pixels; clip is in page.rect space.
+            x0, y0 = tile[0] * tile_size, tile[1] * tile_size
+            rendered = page.rect * matrix
+            if x0 >= rendered.width or y0 >= rendered.height or x0 < 0 or y0 < 0:
+                return None
+            clip = (fitz.Rect(x0, y0, x0 + tile_size, y0 + tile_size) / zoom) & page.rect
+
+        with phase("render"):
+            pix = page.get_pixmap(matrix=matrix, clip=clip, alpha=False)
+        with phase("encode"):
+            return PDFProcessor._encode_pixmap(pix, image_format)
+
+    @staticmethod
+    def _encode_pixmap(pix: fitz.Pixmap, image_format: str) -> bytes:
+        if image_format == "png":
+            return pix.tobytes("png")
+        if image_format == "jpeg":
+            return pix.tobytes("jpeg", jpg_quality=85)
+
+        try:
+            from PIL import Image
+        except ImportError as exc:
+            raise RuntimeError("WebP output requires Pillow (pip install pillow)") from exc
+        buffer = io.BytesIO()
+        Image.frombytes("RGB", (pix.width, pix.height), pix.samples).save(buffer, format="WEBP")
+        return buffer.getvalue()
+
+
+DOCUMENT_OPERATIONS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "add_text": PDFProcessor._add_text,
+    "add_image": PDFProcessor._add_image,
+    "stamp": PDFProcessor._stamp,
+    "replace_text_instance": PDFProcessor._replace_text_instance,
+    "delete_pages": PDFProcessor._delete_pages,
+    "reorder_pages": PDFProcessor._reorder_pages,
+    "extract_pages": PDFProcessor._extract_pages,
+    "redact_text": PDFProcessor._redact_text,
+    "replace_text": PDFProcessor._replace_text,
+    "replace_text_bulk": PDFProcessor._replace_text_bulk,
+}
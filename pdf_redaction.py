@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import fitz
+
+from pdf_text_index import TextIndex, fold_case
+
+PATTERN_PRESETS: Dict[str, str] = {
+    "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
+    "email": r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b",
+    "phone": r"(?<!\w)(?:\+?1[ .-]?)?\(?\d{3}\)?[ .-]?\d{3}[ .-]?\d{4}\b",
+    "credit_card": r"\b(?:\d[ -]?){13,16}\b",
+}
+
+Span = Tuple[int, int]
+
+
+class AhoCorasick:
+    """
+    Multi-literal matcher: reports every (possibly overlapping) occurrence of
+    every keyword in a single left-to-right scan of the text.
+    """
+
+    def __init__(self, keywords: Sequence[str]) -> None:
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for keyword_index, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(keyword_index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield (start, end, keyword_index) for each occurrence in text.
+        """
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword_index in self._output[state]:
+                yield position + 1 - len(self.keywords[keyword_index]), position + 1, keyword_index
+
+
+class PageText:
+    """
+    A page's text as one string with a bounding box (and line id) per
+    character, so character spans found by any matcher map back to glyphs.
+    Lines within a block are joined by a space and blocks by a newline; those
+    separators have no box.
+    """
+
+    def __init__(self, page: fitz.Page) -> None:
+        chars: List[str] = []
+        self.boxes: List[Optional[Tuple[float, float, float, float]]] = []
+        self.lines: List[int] = []
+
+        raw = page.get_text("rawdict", flags=fitz.TEXTFLAGS_SEARCH)
+        line_id = 0
+        for block in raw.get("blocks", []):
+            if block.get("type") != 0:
+                continue
+            if chars:
+                self._append_separator(chars, "\n")
+            for line_number, line in enumerate(block.get("lines", [])):
+                if line_number:
+                    self._append_separator(chars, " ")
+                line_id += 1
+                for span in line.get("spans", []):
+                    for char in span.get("chars", []):
+                        chars.append(char["c"])
+                        self.boxes.append(tuple(char["bbox"]))
+                        self.lines.append(line_id)
+
+        self.text = "".join(chars)
+
+    def _append_separator(self, chars: List[str], separator: str) -> None:
+        chars.append(separator)
+        self.boxes.append(None)
+        self.lines.append(0)
+
+    def rects_for(self, start: int, end: int) -> List[fitz.Rect]:
+        rects: Dict[int, fitz.Rect] = {}
+        for index in range(start, end):
+            box = self.boxes[index]
+            if box is None:
+                continue
+            line_id = self.lines[index]
+            if line_id in rects:
+                rects[line_id] |= box
+            else:
+                rects[line_id] = fitz.Rect(box)
+        return [rect for rect in rects.values() if not rect.is_empty]
+
+
+def _merge_spans(spans: Iterable[Span]) -> List[Span]:
+    merged: List[Span] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class RedactionEngine:
+    """
+    Matches every literal target and regular expression against a page in a
+    single text extraction: literals through one Aho-Corasick automaton and
+    each compiled pattern through one finditer over the same string.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[str] = (),
+        patterns: Sequence[str] = (),
+        case_sensitive: bool = False,
+        pattern_labels: Optional[Sequence[str]] = None
+    ) -> None:
+        self.case_sensitive = case_sensitive
+        self.targets = [target for target in targets if target]
+        folded = self.targets if case_sensitive else [fold_case(target) for target in self.targets]
+        self._literals = AhoCorasick(folded) if folded else None
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+        labels = list(pattern_labels) if pattern_labels is not None else list(patterns)
+        kept = [(pattern, label) for pattern, label in zip(patterns, labels) if pattern]
+        self.patterns = [pattern for pattern, _ in kept]
+        self.pattern_labels = [label for _, label in kept]
+        self._regexes = [re.compile(pattern, flags) for pattern in self.patterns]
+
+    @classmethod
+    def from_options(
+        cls,
+        targets: Optional[Sequence[str]] = None,
+        patterns: Optional[Sequence[str]] = None,
+        presets: Optional[Sequence[str]] = None,
+        case_sensitive: bool = False
+    ) -> "RedactionEngine":
+        unknown = [name for name in presets or () if name not in PATTERN_PRESETS]
+        if unknown:
+            raise ValueError(f"Unknown redaction presets: {unknown}")
+        all_patterns = list(patterns or ()) + [PATTERN_PRESETS[name] for name in presets or ()]
+        labels = list(patterns or ()) + [f"preset:{name}" for name in presets or ()]
+        try:
+            return cls(targets or (), all_patterns, case_sensitive, labels)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}") from e
+
+    @property
+    def has_patterns(self) -> bool:
+        return bool(self._regexes)
+
+    def match_spans(self, text: str) -> Tuple[List[Span], Dict[str, int]]:
+        spans: List[Span] = []
+        counts: Dict[str, int] = {}
+
+        if self._literals is not None:
+            haystack = text if self.case_sensitive else fold_case(text)
+            for start, end, keyword_index in self._literals.iter_matches(haystack):
+                spans.append((start, end))
+                target = self.targets[keyword_index]
+                counts[target] = counts.get(target, 0) + 1
+
+        for label, regex in zip(self.pattern_labels, self._regexes):
+            for match in regex.finditer(text):
+                if match.end() > match.start():
+                    spans.append((match.start(), match.end()))
+                    counts[label] = counts.get(label, 0) + 1
+
+        return _merge_spans(spans), counts
+
+    def find(self, page: fitz.Page) -> Tuple[List[List[fitz.Rect]], Dict[str, int]]:
+        """
+        Return the rects of every merged match on page (one list per match,
+        one rect per text line it covers) and per-target match counts.
+        """
+        page_text = PageText(page)
+        spans, counts = self.match_spans(page_text.text)
+        regions = [page_text.rects_for(start, end) for start, end in spans]
+        return [rects for rects in regions if rects], counts
+
+    def find_indexed(self, index: TextIndex, page: fitz.Page) -> Tuple[List[List[fitz.Rect]], Dict[str, int]]:
+        """
+        Same as find(), but matching against the words already extracted
+        into a text index instead of extracting the page again. Word boxes
+        are only exact for matches made of whole words; a page with any
+        match inside a word is extracted glyph by glyph as find() does.
+        """
+        spans, counts = self.match_spans(index.page_text(page.number))
+        regions = [index.word_rects(page.number, start, end) for start, end in spans]
+        if None in regions:
+            return self.find(page)
+        return [rects for rects in regions if rects], counts
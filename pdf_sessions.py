@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import fitz
+
+from pdf_cache import source_digest
+from pdf_text_index import set_document_key
+
+
+class SessionNotFound(KeyError):
+    pass
+
+
+@dataclass
+class DocumentSession:
+    session_id: str
+    doc: fitz.Document
+    filename: str
+    size: int
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    operations_applied: int = 0
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "filename": self.filename,
+            "page_count": len(self.doc),
+            "size": self.size,
+            "operations_applied": self.operations_applied,
+            "created_at": self.created_at,
+            "last_used": self.last_used,
+        }
+
+
+class DocumentSessionCache:
+    """
+    LRU cache of open fitz documents addressed by session id.
+
+    Sessions are evicted least-recently-used first once either ``max_documents``
+    or ``max_bytes`` (estimated from the size of each source PDF) is exceeded.
+    The cache only does bookkeeping; callers must serialize PyMuPDF calls on
+    the cached documents themselves.
+    """
+
+    def __init__(self, max_documents: int = 16, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.max_documents = max(1, max_documents)
+        self.max_bytes = max(1, max_bytes)
+        self._sessions: "OrderedDict[str, DocumentSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "DocumentSessionCache":
+        max_documents = os.environ.get("PDF_API_SESSION_MAX_DOCS", "").strip()
+        max_mb = os.environ.get("PDF_API_SESSION_MAX_MB", "").strip()
+        return cls(
+            max_documents=int(max_documents) if max_documents else 16,
+            max_bytes=int(max_mb) * 1024 * 1024 if max_mb else 512 * 1024 * 1024,
+        )
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(session.size for session in self._sessions.values())
+
+    def open(self, data: bytes, filename: str = "document.pdf") -> DocumentSession:
+        doc = fitz.open(stream=data, filetype="pdf")
+        set_document_key(doc, lambda: source_digest(data))
+        session = DocumentSession(
+            session_id=uuid.uuid4().hex,
+            doc=doc,
+            filename=filename,
+            size=len(data),
+        )
+        with self._lock:
+            self._sessions[session.session_id] = session
+            evicted = self._evict_locked(keep=session.session_id)
+        self._close_all(evicted)
+        return session
+
+    def get(self, session_id: str) -> DocumentSession:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise SessionNotFound(session_id)
+            self._sessions.move_to_end(session_id)
+            session.last_used = time.time()
+            return session
+
+    def resize(self, session_id: str, size: int) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.size = size
+            evicted = self._evict_locked(keep=session_id)
+        self._close_all(evicted)
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self._close_all([session])
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        self._close_all(sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "total_bytes": self.total_bytes,
+                "max_documents": self.max_documents,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+            }
+
+    def _evict_locked(self, keep: Optional[str] = None) -> List[DocumentSession]:
+        evicted: List[DocumentSession] = []
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_documents or self.total_bytes > self.max_bytes
+        ):
+            oldest_id = next(iter(self._sessions))
+            if oldest_id == keep:
+                self._sessions.move_to_end(oldest_id)
+                oldest_id = next(iter(self._sessions))
+            evicted.append(self._sessions.pop(oldest_id))
+            self._evictions += 1
+        return evicted
+
+    @staticmethod
+    def _close_all(sessions: List[DocumentSession]) -> None:
+        for session in sessions:
+            try:
+                session.doc.close()
+            except Exception:
+                pass
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import fitz
+
+from pdf_fonts import FontRegistry, font_metrics, link_resource
+from pdf_images import image_size
+
+
+def build_overlay(
+    text: Optional[str] = None,
+    image_path: Optional[str] = None,
+    font_size: float = 48,
+    font_name: str = "helv",
+    font_file: Optional[str] = None,
+    color: Sequence[float] = (0.5, 0.5, 0.5),
+    opacity: float = 1.0
+) -> fitz.Document:
+    """
+    One-page document holding the stamp: the image, if any, centred above
+    the text lines, the page cropped to their extent. Raises ValueError when
+    there is nothing to draw.
+    """
+    lines = text.splitlines() if text else []
+    font = font_metrics(font_name, font_file) if lines else None
+    line_height = (font.ascender - font.descender) * font_size if font else 0
+    text_width = max((font.text_length(line, fontsize=font_size) for line in lines), default=0) if font else 0
+    image_width, image_height = image_size(image_path) if image_path else (0, 0)
+
+    width, height = max(text_width, image_width), image_height + line_height * len(lines)
+    if width <= 0 or height <= 0:
+        raise ValueError("Stamp needs non-empty text or an image")
+
+    overlay = fitz.open()
+    page = overlay.new_page(width=width, height=height)
+    if image_path:
+        page.insert_image(
+            fitz.Rect((width - image_width) / 2, 0, (width + image_width) / 2, image_height),
+            filename=image_path
+        )
+    if lines:
+        fontname = FontRegistry.of(overlay).resource(page, font_name, font_file)
+        for index, line in enumerate(lines):
+            baseline = image_height + index * line_height + font.ascender * font_size
+            left = (width - font.text_length(line, fontsize=font_size)) / 2
+            page.insert_text((left, baseline), line, fontname=fontname, fontsize=font_size, color=tuple(color))
+        if font_file:
+            overlay.subset_fonts()
+
+    page.clean_contents()
+    if opacity < 1:
+        overlay.xref_set_key(page.xref, "Resources/ExtGState", f"<</fzStamp <</ca {opacity:g} /CA {opacity:g}>>>>")
+        contents = page.get_contents()[0]
+        overlay.update_stream(contents, b"q /fzStamp gs\n" + overlay.xref_stream(contents) + b"\nQ")
+    return overlay
+
+
+class StampPlacer:
+    """
+    Puts one overlay onto many pages of a document.
+
+    PyMuPDF's show_pdf_page copies the overlay in once per document but
+    still writes a wrapper form XObject and a content stream for every page
+    it is called on. Here it is called once per page geometry (target rect
+    and page transformation); every other page with that geometry gets the
+    same wrapper linked into its /Resources/XObject and a shared
+    "q /Name Do Q" stream appended to its /Contents array, so stamping a
+    thousand pages adds a handful of objects instead of two per page.
+    """
+
+    def __init__(self, doc: fitz.Document, overlay: fitz.Document, foreground: bool = True) -> None:
+        self.doc = doc
+        self.overlay = overlay
+        self.foreground = foreground
+        # Page geometry -> (wrapper form xref, content stream drawing it).
+        self.forms: Dict[Tuple, Tuple[int, int]] = {}
+        self.fallbacks = 0
+        self._brackets: Optional[Tuple[int, int]] = None
+
+    def place(self, page: fitz.Page, rect: fitz.Rect, rotate: float = 0) -> None:
+        key = (tuple(rect), tuple(page.transformation_matrix), rotate)
+        form = self.forms.get(key)
+        if form is None:
+            wrapper = self._show(page, rect, rotate)
+            self.forms[key] = (wrapper, self._new_stream(f"q /fzStamp{wrapper} Do Q".encode()))
+            return
+
+        wrapper, stream = form
+        if not link_resource(page, "XObject", f"fzStamp{wrapper}", wrapper):
+            self._show(page, rect, rotate)
+            self.fallbacks += 1
+            return
+
+        contents = page.get_contents()
+        if not contents:
+            contents = [stream]
+        elif self.foreground:
+            # Bracket the existing content so an unbalanced graphics state
+            # left by it cannot move or recolour the stamp.
+            save, restore = self._save_restore()
+            contents = [save, *contents, restore, stream]
+        else:
+            contents = [stream, *contents]
+        self.doc.xref_set_key(page.xref, "Contents", "[" + " ".join(f"{xref} 0 R" for xref in contents) + "]")
+
+    @property
+    def objects(self) -> int:
+        return len(self.forms) + self.fallbacks
+
+    def _show(self, page: fitz.Page, rect: fitz.Rect, rotate: float) -> int:
+        """
+        Stamp page through show_pdf_page and return the xref of the wrapper
+        form it created.
+        """
+        before = {xobject[0] for xobject in page.get_xobjects()}
+        page.show_pdf_page(rect, self.overlay, 0, overlay=self.foreground, rotate=rotate)
+        return next(xobject[0] for xobject in page.get_xobjects() if xobject[0] not in before and xobject[2] == 0)
+
+    def _save_restore(self) -> Tuple[int, int]:
+        if self._brackets is None:
+            self._brackets = (self._new_stream(b"q"), self._new_stream(b"Q"))
+        return self._brackets
+
+    def _new_stream(self, data: bytes) -> int:
+        xref = self.doc.get_new_xref()
+        self.doc.update_object(xref, "<<>>")
+        self.doc.update_stream(xref, data)
+        return xref
+
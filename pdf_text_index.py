@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import bisect
+import os
+import string
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+import fitz
+
+from pdf_cache import stat_digest
+from pdf_metrics import phase
+
+
+# (x0, y0, x1, y1, word, block_no, line_no, word_no) as returned by page.get_text("words")
+Word = Tuple[float, float, float, float, str, int, int, int]
+Posting = Tuple[int, int]
+# (rect, matched text, first word index, end word index) on one page.
+Match = Tuple[fitz.Rect, str, int, int]
+# Glyph boxes of each word on a page, keyed by (block_no, line_no, word_no).
+Glyphs = Dict[Tuple[int, int, int], List[Tuple[float, float, float, float]]]
+
+_PUNCTUATION = string.punctuation + "“”‘’"
+
+
+def _strip_word(word: str) -> str:
+    return word.strip(_PUNCTUATION)
+
+
+def _affix_span(word: str, token: str) -> Optional[Tuple[int, int]]:
+    """
+    Start and end of token in word when everything around it is
+    punctuation, else None.
+    """
+    start = word.find(token)
+    while start >= 0:
+        stop = start + len(token)
+        if not _strip_word(word[:start]) and not _strip_word(word[stop:]):
+            return start, stop
+        start = word.find(token, start + 1)
+    return None
+
+
+def _span_rect(word: Word, start: int, stop: int) -> fitz.Rect:
+    """
+    Part of a word's box covering characters start..stop-1, assuming every
+    character takes an equal share of its width.
+    """
+    x0, y0, x1, y1, text = word[:5]
+    width = (x1 - x0) / max(1, len(text))
+    return fitz.Rect(x0 + width * start, y0, x0 + width * max(start, stop), y1)
+
+
+def _page_glyphs(page: fitz.Page) -> Glyphs:
+    """
+    Glyph boxes of every word on page, split on whitespace the way
+    get_text("words") splits them, so they line up with the index's words.
+    """
+    glyphs: Glyphs = {}
+    raw = page.get_text("rawdict", flags=fitz.TEXTFLAGS_SEARCH)
+    for block in raw.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        for line_no, line in enumerate(block.get("lines", [])):
+            word_no, boxes = 0, None
+            for span in line.get("spans", []):
+                for char in span.get("chars", []):
+                    if char["c"].isspace():
+                        if boxes is not None:
+                            word_no, boxes = word_no + 1, None
+                        continue
+                    if boxes is None:
+                        boxes = glyphs[(block["number"], line_no, word_no)] = []
+                    boxes.append(tuple(char["bbox"]))
+    return glyphs
+
+
+def fold_case(text: str) -> str:
+    # Lower-case without changing the length, so offsets stay aligned with
+    # words and glyphs.
+    return "".join(lowered if len(lowered) == 1 else char for char, lowered in ((c, c.lower()) for c in text))
+
+
+class TextIndex:
+    """
+    Words with bounding boxes for every page of a document, plus an inverted
+    map from lower-cased term to (page, word index) postings.
+
+    Words are extracted with the same flags page.search_for uses, so
+    candidate_pages() never misses a page search_for would match on, and
+    search_page() answers queries from the word lists alone, without
+    touching the document again.
+    """
+
+    def __init__(self, pages: List[List[Word]]) -> None:
+        self.pages = pages
+        self.terms: Dict[str, List[Posting]] = {}
+        for page_index, words in enumerate(pages):
+            for word_index, word in enumerate(words):
+                self.terms.setdefault(word[4].lower(), []).append((page_index, word_index))
+
+        self._token_pages: Dict[str, Set[int]] = {}
+        self._page_texts: Dict[int, Tuple[str, str, List[int]]] = {}
+        self._glyphs: Dict[int, Glyphs] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, doc: fitz.Document) -> "TextIndex":
+        return cls.build_range(doc, 0, len(doc))
+
+    @classmethod
+    def build_range(cls, doc: fitz.Document, start: int, stop: int) -> "TextIndex":
+        """
+        Index of pages start..stop-1 only; its page indexes are relative to start.
+        """
+        return cls([doc[index].get_text("words", flags=fitz.TEXTFLAGS_SEARCH) for index in range(start, stop)])
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def word_rect(self, posting: Posting) -> fitz.Rect:
+        word = self.pages[posting[0]][posting[1]]
+        return fitz.Rect(word[:4])
+
+    def candidate_pages(self, query: str) -> List[int]:
+        """
+        Pages that may contain query as a substring (case-insensitive).
+        """
+        tokens = query.lower().split()
+        if not tokens:
+            return list(range(self.page_count))
+
+        pages: Optional[Set[int]] = None
+        for token in tokens:
+            token_pages = self._pages_containing(token)
+            pages = set(token_pages) if pages is None else pages & token_pages
+            if not pages:
+                return []
+        return sorted(pages or ())
+
+    def search_page(
+        self,
+        page_index: int,
+        query: str,
+        case_sensitive: bool = False,
+        whole_word: bool = False,
+        page: Optional[fitz.Page] = None
+    ) -> List[Match]:
+        """
+        Matches of query on one page in reading order. Substring matches may
+        start or end inside a word; whole-word (or whole-phrase) matches
+        ignore surrounding punctuation. page is the document page the index
+        page was built from: where a match covers only part of a word, its
+        rect is taken from that page's glyph boxes, extracted once per page.
+        Without it the rect is estimated from the word box.
+        """
+        if whole_word:
+            return self._whole_word_matches(page_index, query, case_sensitive, page)
+
+        needle = " ".join(query.split())
+        if not needle:
+            return []
+        text, folded, starts = self._page_text(page_index)
+        haystack = text if case_sensitive else folded
+        if not case_sensitive:
+            needle = fold_case(needle)
+
+        words = self.pages[page_index]
+        matches: List[Match] = []
+        position = haystack.find(needle)
+        while position >= 0:
+            end = position + len(needle)
+            first = bisect.bisect_right(starts, position) - 1
+            last = bisect.bisect_left(starts, end)
+            rect = fitz.Rect()
+            for word_index in range(first, last):
+                offset = starts[word_index]
+                rect |= self._chars_rect(page_index, word_index, position - offset, end - offset, page)
+            matches.append((rect, text[position:end], first, last))
+            position = haystack.find(needle, end)
+        return matches
+
+    def page_text(self, page_index: int) -> str:
+        """
+        The page's words joined by single spaces, the text word_rects() and
+        search_page() offsets refer to.
+        """
+        return self._page_text(page_index)[0]
+
+    def word_rects(self, page_index: int, start: int, end: int) -> Optional[List[fitz.Rect]]:
+        """
+        Boxes of the words making up characters start..end-1 of page_text(),
+        merged per text line, or None when the span starts or ends inside a
+        word and exact glyph boxes would be needed.
+        """
+        _text, _folded, starts = self._page_text(page_index)
+        words = self.pages[page_index]
+        first, last = bisect.bisect_right(starts, start) - 1, bisect.bisect_left(starts, end)
+        if first < 0 or starts[first] != start or starts[last - 1] + len(words[last - 1][4]) != end:
+            return None
+        rects: Dict[Tuple[int, int], fitz.Rect] = {}
+        for word in words[first:last]:
+            line = (word[5], word[6])
+            rects[line] = rects[line] | fitz.Rect(word[:4]) if line in rects else fitz.Rect(word[:4])
+        return [rect for rect in rects.values() if not rect.is_empty]
+
+    def context(self, page_index: int, first: int, end: int, words: int) -> str:
+        """
+        Words first..end-1 of a page with up to `words` neighbours on each side.
+        """
+        page_words = self.pages[page_index]
+        return " ".join(word[4] for word in page_words[max(0, first - words):end + words])
+
+    def _whole_word_matches(
+        self,
+        page_index: int,
+        query: str,
+        case_sensitive: bool,
+        page: Optional[fitz.Page]
+    ) -> List[Match]:
+        tokens = [token for token in query.split() if _strip_word(token)]
+        if not tokens:
+            return []
+        if not case_sensitive:
+            tokens = [fold_case(token) for token in tokens]
+        # Equal stripped forms are necessary for a match and cheap to compare.
+        stripped_tokens = [_strip_word(token) for token in tokens]
+
+        words = self.pages[page_index]
+        text, folded, starts = self._page_text(page_index)
+        source = text if case_sensitive else folded
+        compare = [source[start:start + len(word[4])] for start, word in zip(starts, words)]
+        stripped = [_strip_word(word) for word in compare]
+        matches: List[Match] = []
+        for first in range(len(words) - len(tokens) + 1):
+            if stripped[first] != stripped_tokens[0] or stripped[first:first + len(tokens)] != stripped_tokens:
+                continue
+            end = first + len(tokens)
+            # Only punctuation the query leaves out may surround each token,
+            # so "secret." matches "secret." and "(secret.)" but not "secret".
+            spans = [_affix_span(compare[first + offset], token) for offset, token in enumerate(tokens)]
+            if None in spans:
+                continue
+            rect = fitz.Rect()
+            for word_index, (start, stop) in zip(range(first, end), spans):
+                # Leave that punctuation outside the rect, so redacting
+                # "secret" in "secret." keeps the full stop.
+                if word_index != first:
+                    start = 0
+                if word_index != end - 1:
+                    stop = len(words[word_index][4])
+                rect |= self._chars_rect(page_index, word_index, start, stop, page)
+            text = " ".join(words[first + offset][4][start:stop] for offset, (start, stop) in enumerate(spans))
+            matches.append((rect, text, first, end))
+        return matches
+
+    def _chars_rect(
+        self,
+        page_index: int,
+        word_index: int,
+        start: int,
+        stop: int,
+        page: Optional[fitz.Page]
+    ) -> fitz.Rect:
+        """
+        Box of characters start..stop-1 (clamped to the word) of one word.
+        """
+        word = self.pages[page_index][word_index]
+        start, stop = max(0, start), min(len(word[4]), stop)
+        if start == 0 and stop == len(word[4]):
+            return fitz.Rect(word[:4])
+        if page is not None:
+            with self._lock:
+                glyphs = self._glyphs.get(page_index)
+            if glyphs is None:
+                glyphs = _page_glyphs(page)
+                with self._lock:
+                    self._glyphs[page_index] = glyphs
+            boxes = glyphs.get((word[5], word[6], word[7]))
+            if boxes is not None and len(boxes) == len(word[4]):
+                rect = fitz.Rect()
+                for box in boxes[start:stop]:
+                    rect |= box
+                return rect
+        return _span_rect(word, start, stop)
+
+    def _page_text(self, page_index: int) -> Tuple[str, str, List[int]]:
+        """
+        The page's words joined by single spaces, its case-folded copy and
+        the offset at which each word starts.
+        """
+        with self._lock:
+            cached = self._page_texts.get(page_index)
+            if cached is None:
+                words = [word[4] for word in self.pages[page_index]]
+                starts: List[int] = []
+                offset = 0
+                for word in words:
+                    starts.append(offset)
+                    offset += len(word) + 1
+                text = " ".join(words)
+                cached = self._page_texts[page_index] = (text, fold_case(text), starts)
+            return cached
+
+    def _pages_containing(self, token: str) -> Set[int]:
+        with self._lock:
+            cached = self._token_pages.get(token)
+            if cached is None:
+                cached = set()
+                for term, postings in self.terms.items():
+                    if token in term:
+                        cached.update(page_index for page_index, _ in postings)
+                self._token_pages[token] = cached
+            return cached
+
+
+class TextIndexCache:
+    """
+    Process-wide LRU of TextIndex objects keyed by the SHA-256 of the file.
+    """
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, TextIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[TextIndex]:
+        with self._lock:
+            index = self._entries.get(key)
+            if index is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return index
+
+    def put(self, key: str, index: TextIndex) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_cache = TextIndexCache(int(os.environ.get("PDF_API_TEXT_INDEX_CACHE", "8") or 0))
+
+
+def set_document_key(doc: fitz.Document, key: Union[str, Callable[[], str]]) -> None:
+    """
+    Record the content hash get_text_index caches doc's index under, for
+    documents opened from memory. A callable is only called, once, when the
+    index is first asked for.
+    """
+    doc._text_index_key = key
+
+
+def _document_key(doc: fitz.Document) -> Optional[str]:
+    key = getattr(doc, "_text_index_key", None)
+    if callable(key):
+        key = doc._text_index_key = key()
+    if key is None and doc.name and os.path.isfile(doc.name):
+        key = stat_digest(doc.name)
+    return key
+
+
+def get_text_index(doc: fitz.Document, key: Optional[str] = None) -> TextIndex:
+    """
+    Return the index for doc, reusing a cached one when doc is unmodified
+    and its content hash (key, the one recorded by set_document_key, or that
+    of the file it was opened from) has been indexed before.
+    """
+    with phase("index"):
+        if doc.is_dirty:
+            return TextIndex.build(doc)
+        key = key or _document_key(doc)
+        if key is None:
+            return TextIndex.build(doc)
+
+        index = _cache.get(key)
+        if index is None:
+            index = TextIndex.build(doc)
+            _cache.put(key, index)
+        return index
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+
+class WorkerPoolFull(Exception):
+    pass
+
+
+class WorkerTimeout(Exception):
+    pass
+
+
+class WorkerCrashed(Exception):
+    pass
+
+
+def default_start_method() -> str:
+    """
+    "forkserver" where the platform has it, else "spawn". Pools are started
+    lazily from whichever thread submits first, and fork() would copy that
+    process's other threads' state (locks, SQLite connections) half-way.
+    """
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class WorkerPool:
+    """
+    Bounded execution layer for blocking PyMuPDF work.
+
+    ``max_workers`` jobs run concurrently and up to ``max_queue`` more may wait
+    for a free worker; anything beyond that is rejected with WorkerPoolFull so
+    the caller can shed load instead of piling requests onto the event loop.
+    PyMuPDF is not thread-safe, so "process" is the default mode; "thread" is
+    only meant for debugging and single-worker setups. ``start_method``
+    selects how worker processes are started ("fork", "forkserver",
+    "spawn"); the platform default is used when it is None. In process mode
+    a job that outlives ``timeout`` has its worker process terminated; a
+    thread cannot be stopped and keeps its slot until the job returns.
+    """
+
+    MODES = ("process", "thread")
+
+    def __init__(
+        self,
+        mode: str = "process",
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout: Optional[float] = None,
+        start_method: Optional[str] = None,
+    ) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown worker mode: {mode}")
+
+        self.mode = mode
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.max_queue = max(0, self.max_workers * 2 if max_queue is None else max_queue)
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.start_method = start_method
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Unfinished futures per executor, and those whose caller timed out.
+        self._pending: Dict[Executor, Set[Future]] = {}
+        self._abandoned: Set[Future] = set()
+
+    @classmethod
+    def from_env(cls) -> "WorkerPool":
+        def _number(name: str, cast: Callable[[str], Any]) -> Any:
+            raw = os.environ.get(name, "").strip()
+            return cast(raw) if raw else None
+
+        return cls(
+            mode=os.environ.get("PDF_API_WORKER_MODE", "process").strip().lower() or "process",
+            max_workers=_number("PDF_API_MAX_WORKERS", int),
+            max_queue=_number("PDF_API_MAX_QUEUE", int),
+            timeout=_number("PDF_API_JOB_TIMEOUT", float) or 120.0,
+            start_method=os.environ.get("PDF_API_WORKER_START_METHOD", "").strip().lower() or default_start_method(),
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    context = multiprocessing.get_context(self.start_method) if self.start_method else None
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="pdf-worker",
+                    )
+            return self._executor
+
+    def _release(self, executor: Executor, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._abandoned.discard(future)
+            pending = self._pending.get(executor)
+            if pending is not None:
+                pending.discard(future)
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._replace(executor)
+        else:
+            self._reap(executor)
+
+    def _replace(self, executor: Executor) -> None:
+        """
+        Drop an executor whose worker process died. A broken
+        ProcessPoolExecutor fails every later submission, so the next one
+        starts a fresh pool instead.
+        """
+        with self._lock:
+            self._pending.pop(executor, None)
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False)
+
+    def _abandon(self, executor: Executor, future: Future) -> None:
+        """
+        Give up on a job that outlived its timeout. A queued job is simply
+        cancelled. A running one cannot be interrupted, so in process mode its
+        executor is retired: new jobs go to a fresh one, and the old workers
+        are terminated once every job still on them has been abandoned too.
+        """
+        if future.cancel() or self.mode != "process":
+            return
+        with self._lock:
+            self._abandoned.add(future)
+            if self._executor is executor:
+                self._executor = None
+        self._reap(executor)
+
+    def _reap(self, executor: Executor) -> None:
+        with self._lock:
+            pending = self._pending.get(executor)
+            if executor is self._executor or pending is None or not pending <= self._abandoned:
+                return
+            del self._pending[executor]
+        # Terminated workers fail their futures with BrokenProcessPool, which
+        # releases their slots.
+        terminate = getattr(executor, "terminate_workers", None)
+        if terminate is not None:
+            terminate()
+            return
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Executor, Future]:
+        executor = self._get_executor()
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise WorkerPoolFull(
+                    f"Worker pool is at capacity ({self._in_flight}/{self.capacity} jobs)."
+                )
+            self._in_flight += 1
+        try:
+            future = executor.submit(func, *args, **kwargs)
+        except BaseException as exc:
+            with self._lock:
+                self._in_flight -= 1
+            if isinstance(exc, BrokenProcessPool):
+                self._replace(executor)
+                raise WorkerCrashed("A worker process died; retry the request.") from exc
+            raise
+        with self._lock:
+            self._pending.setdefault(executor, set()).add(future)
+        # Jobs that outlive their timeout keep counting against capacity until
+        # the worker actually finishes them, so backpressure stays honest.
+        future.add_done_callback(functools.partial(self._release, executor))
+        return executor, future
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        return self._submit(func, *args, **kwargs)[1]
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        executor, future = self._submit(func, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError as exc:
+            self._abandon(executor, future)
+            raise WorkerTimeout(f"Operation exceeded {self.timeout:g}s timeout.") from exc
+        except BrokenProcessPool as exc:
+            raise WorkerCrashed("A worker process died; retry the request.") from exc
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "timeout": self.timeout,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDFProcessor methods and scripts/pdf_api.py endpoints.
+
+Synthetic PDFs are generated once, then every case runs in its own Python
+subprocess so peak RSS is attributable to that case alone. Results are
+written as JSON; pass an earlier file to --compare to flag regressions.
+
+    python scripts/benchmark.py --pages 200 --output bench.json
+    python scripts/benchmark.py --suite api --filter search --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import fitz  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+VOCABULARY = (
+    "invoice statement account balance payment customer period total amount due "
+    "reference service charge credit debit summary transfer deposit interest fee"
+).split()
+SEARCH_TERM = "needle"
+BASE14_FONTS = ("helv", "tiro", "cour", "hebo", "tibo", "cobo")
+
+
+# --------------------------------------------------------------------------
+# Fixtures
+# --------------------------------------------------------------------------
+
+def make_image(path: Path, size: int = 256, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, size, size), False)
+    block = max(1, size // 8)
+    for y in range(0, size, block):
+        for x in range(0, size, block):
+            pix.set_rect(fitz.IRect(x, y, x + block, y + block), tuple(rng.randrange(256) for _ in range(3)))
+    pix.save(str(path))
+
+
+def make_font(path: Path) -> None:
+    # A built-in font's program stands in for an uploaded font file.
+    path.write_bytes(fitz.Font("tiro").buffer)
+
+
+def make_pdf(
+    path: Path,
+    pages: int,
+    words: int,
+    images: int,
+    fonts: int,
+    image_path: Path,
+    seed: int = 0
+) -> None:
+    """
+    Write a PDF of `pages` pages, each with about `words` words of text in
+    `fonts` base-14 fonts and `images` copies of image_path. Every tenth word
+    line contains SEARCH_TERM so search and redaction have hits.
+    """
+    rng = random.Random(seed)
+    font_names = BASE14_FONTS[:max(1, min(fonts, len(BASE14_FONTS)))]
+    with fitz.open() as doc:
+        for page_number in range(pages):
+            page = doc.new_page()
+            y = 72.0
+            line: List[str] = [f"Page {page_number}"]
+            line_count = 0
+            for word_index in range(words):
+                line.append(rng.choice(VOCABULARY))
+                if len(line) == 12 or word_index == words - 1:
+                    if line_count % 10 == 0:
+                        line.append(SEARCH_TERM)
+                    page.insert_text(
+                        (72, y), " ".join(line), fontsize=9,
+                        fontname=font_names[line_count % len(font_names)]
+                    )
+                    line, line_count = [], line_count + 1
+                    y += 11
+                    if y > page.rect.height - 72:
+                        break
+            for image_index in range(images):
+                x = 72 + (image_index % 3) * 150
+                page.insert_image(fitz.Rect(x, 600, x + 120, 720), filename=str(image_path))
+        doc.save(str(path), garbage=3, deflate=True)
+
+
+def build_fixtures(directory: Path, config: Dict[str, int]) -> Dict[str, str]:
+    directory.mkdir(parents=True, exist_ok=True)
+    image = directory / "image.png"
+    make_image(image)
+    main = directory / "main.pdf"
+    make_pdf(main, config["pages"], config["words"], config["images"], config["fonts"], image)
+    second = directory / "second.pdf"
+    make_pdf(second, max(1, config["pages"] // 2), config["words"], config["images"], config["fonts"], image, seed=1)
+    font = directory / "font.cff"
+    make_font(font)
+    return {"main": str(main), "second": str(second), "image": str(image), "font": str(font)}
+
+
+def load_fixtures(directory: Path) -> Dict[str, str]:
+    return {name: str(directory / filename) for name, filename in (
+        ("main", "main.pdf"), ("second", "second.pdf"), ("image", "image.png"), ("font", "font.cff")
+    )}
+
+
+# --------------------------------------------------------------------------
+# Cases
+# --------------------------------------------------------------------------
+
+def _checked(result: Dict[str, Any]) -> Dict[str, Any]:
+    if not result.get("success"):
+        raise RuntimeError(result.get("error", "operation failed"))
+    return result
+
+
+def _output_size(result: Dict[str, Any]) -> int:
+    if result.get("output") is not None:
+        return len(result["output"])
+    if result.get("output_path"):
+        return os.path.getsize(result["output_path"])
+    return len(json.dumps(result, default=str))
+
+
+def processor_cases(fixtures: Dict[str, str], workdir: Path) -> Dict[str, Callable[[], int]]:
+    from pdf_processor import PDFProcessor as P
+
+    main, second, image, font = fixtures["main"], fixtures["second"], fixtures["image"], fixtures["font"]
+    out = str(workdir / "out.pdf")
+    page_count = fitz.open(main).page_count
+    half = list(range(0, page_count, 2))
+    reversed_order = list(range(page_count - 1, -1, -1))
+    first_hit = fitz.open(main)[0].search_for(SEARCH_TERM)[0]
+
+    def run(func: Callable[..., Dict[str, Any]], *args: Any, **kwargs: Any) -> Callable[[], int]:
+        return lambda: _output_size(_checked(func(*args, **kwargs)))
+
+    return {
+        "processor.get_info": run(P.get_info, main),
+        "processor.get_info.columnar": run(P.get_info, main, limit=100, columnar=True),
+        "processor.extract_text": run(P.extract_text, main, mode="words"),
+        "processor.extract_text.layout": run(P.extract_text, main, mode="layout"),
+        "processor.search_text": run(P.search_text, main, SEARCH_TERM),
+        "processor.search_text_parallel": run(P.search_text_parallel, main, SEARCH_TERM),
+        "processor.get_info_batch": run(P.get_info_batch, [main, second] * 8, limit=0),
+        "processor.search_text_batch": run(P.search_text_batch, [main, second] * 8, SEARCH_TERM),
+        "processor.add_text": run(P.add_text, main, out, "Benchmark", 72, 72, 0),
+        "processor.add_text.incremental": run(P.add_text, main, out, "Benchmark", 72, 72, 0, save_mode="incremental"),
+        "processor.add_image": run(P.add_image, main, out, image, 72, 72, 0, 100, 100),
+        "processor.add_image.all_pages": run(P.add_image, main, out, image, 72, 72, pages="all"),
+        "processor.stamp": run(P.stamp, main, out, "CONFIDENTIAL", rotate=45, opacity=0.3),
+        "processor.replace_text_instance": run(
+            P.replace_text_instance, main, out, 0, list(first_hit), "replaced"
+        ),
+        "processor.replace_text": run(P.replace_text, main, out, SEARCH_TERM, "haystack"),
+        "processor.replace_text_bulk": run(P.replace_text_bulk, main, out, [
+            {"search": SEARCH_TERM, "replacement": "haystack"},
+            {"page": 0, "rect": list(first_hit), "replacement": "replaced"},
+        ]),
+        "processor.replace_text_bulk.font_file": run(
+            P.replace_text_bulk, main, out, [{"search": SEARCH_TERM, "replacement": "haystack"}], font_file=font
+        ),
+        "processor.redact_text": run(P.redact_text, main, out, [SEARCH_TERM]),
+        "processor.redact_text.presets": run(P.redact_text, main, out, [], presets=["email", "phone"]),
+        "processor.delete_pages": run(P.delete_pages, main, out, half),
+        "processor.reorder_pages": run(P.reorder_pages, main, out, reversed_order),
+        "processor.extract_pages": run(P.extract_pages, main, out, half),
+        "processor.merge_pdfs": run(P.merge_pdfs, [main, second], out),
+        "processor.merge_pdfs.dedup": run(P.merge_pdfs, [main, second], out, deduplicate=True),
+        "processor.optimize_pdf": run(P.optimize_pdf, main, out),
+        "processor.optimize_pdf.smallest": run(P.optimize_pdf, main, out, "smallest"),
+        "processor.redact_text.balanced": run(P.redact_text, main, out, [SEARCH_TERM], save_profile="balanced"),
+        "processor.split_pdf": run(
+            P.split_pdf, main, [list(range(i, min(i + 10, page_count))) for i in range(0, page_count, 10)], None
+        ),
+        "processor.render_pages": run(P.render_pages, main, [0], zoom=1.0),
+        "processor.apply_operations": run(P.apply_operations, main, out, [
+            {"operation": "add_text", "params": {"text": "Benchmark", "x": 72, "y": 72}},
+            {"operation": "redact_text", "params": {"targets": [SEARCH_TERM]}},
+            {"operation": "delete_pages", "params": {"page_numbers": [0]}},
+        ]),
+    }
+
+
+ApiCase = Callable[[Any], Awaitable[int]]
+
+
+def api_cases(fixtures: Dict[str, str]) -> Dict[str, ApiCase]:
+    main_bytes = Path(fixtures["main"]).read_bytes()
+    second_bytes = Path(fixtures["second"]).read_bytes()
+    image_bytes = Path(fixtures["image"]).read_bytes()
+    font_bytes = Path(fixtures["font"]).read_bytes()
+    page_count = fitz.open(stream=main_bytes, filetype="pdf").page_count
+    half = ",".join(str(i) for i in range(0, page_count, 2))
+    first_hit = fitz.open(stream=main_bytes, filetype="pdf")[0].search_for(SEARCH_TERM)[0]
+
+    def pdf() -> Dict[str, Any]:
+        return {"pdf_file": ("main.pdf", main_bytes, "application/pdf")}
+
+    def post(path: str, files: Callable[[], Any], data: Optional[Dict[str, str]] = None) -> ApiCase:
+        async def _case(client: Any) -> int:
+            response = await client.post(path, files=files(), data=data or {})
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} -> {response.status_code}: {response.text[:200]}")
+            return len(response.content)
+        return _case
+
+    async def session_roundtrip(client: Any) -> int:
+        response = await client.post("/sessions", files=pdf())
+        session_id = response.json()["session_id"]
+        await client.post(
+            f"/sessions/{session_id}/operations",
+            data={"operation": "add_text", "params": json.dumps({"text": "Benchmark", "x": 72, "y": 72})},
+        )
+        exported = await client.get(f"/sessions/{session_id}/export")
+        await client.delete(f"/sessions/{session_id}")
+        if exported.status_code != 200:
+            raise RuntimeError(f"session export -> {exported.status_code}")
+        return len(exported.content)
+
+    async def font_replace(client: Any) -> int:
+        response = await client.post("/fonts", files={"font_file": ("font.cff", font_bytes, "font/otf")})
+        if response.status_code != 200:
+            raise RuntimeError(f"/fonts -> {response.status_code}: {response.text[:200]}")
+        return await post("/pdf/replace-text-bulk", pdf, {
+            "replacements": json.dumps([{"search": SEARCH_TERM, "replacement": "x"}]),
+            "font_id": response.json()["font_id"],
+        })(client)
+
+    async def job_roundtrip(client: Any) -> int:
+        response = await client.post(
+            "/jobs",
+            data={"operation": "redact-text", "params": json.dumps({"targets": [SEARCH_TERM]})},
+            files=[("files", ("main.pdf", main_bytes, "application/pdf"))],
+        )
+        job_id = response.json()["job_id"]
+        while True:
+            status = (await client.get(f"/jobs/{job_id}")).json()["status"]
+            if status in ("succeeded", "failed"):
+                break
+            await asyncio.sleep(0.05)
+        result = await client.get(f"/jobs/{job_id}/result")
+        await client.delete(f"/jobs/{job_id}")
+        if result.status_code != 200:
+            raise RuntimeError(f"job result -> {result.status_code}: {result.text[:200]}")
+        return len(result.content)
+
+    return {
+        "api.get-info": post("/pdf/get-info", pdf),
+        "api.extract-text": post("/pdf/extract-text", pdf, {"mode": "words"}),
+        "api.search-text": post("/pdf/search-text", pdf, {"query": SEARCH_TERM}),
+        "api.search-text.parallel": post("/pdf/search-text", pdf, {"query": SEARCH_TERM, "parallel": "true"}),
+        "api.add-text": post("/pdf/add-text", pdf, {"text": "Benchmark", "x": "72", "y": "72"}),
+        "api.add-image": post(
+            "/pdf/add-image",
+            lambda: {**pdf(), "image_file": ("image.png", image_bytes, "image/png")},
+            {"x": "72", "y": "72", "width": "100", "height": "100"},
+        ),
+        "api.add-image.all-pages": post(
+            "/pdf/add-image",
+            lambda: {**pdf(), "image_file": ("image.png", image_bytes, "image/png")},
+            {"x": "72", "y": "72", "pages": "all"},
+        ),
+        "api.stamp": post(
+            "/pdf/stamp",
+            lambda: {**pdf(), "image_file": ("image.png", image_bytes, "image/png")},
+            {"text": "CONFIDENTIAL", "rotate": "45", "opacity": "0.3"},
+        ),
+        "api.replace-text": post(
+            "/pdf/replace-text", pdf, {"page": "0", "rect": ",".join(str(v) for v in first_hit), "replacement": "x"}
+        ),
+        "api.replace-text-bulk": post(
+            "/pdf/replace-text-bulk", pdf, {"replacements": json.dumps([{"search": SEARCH_TERM, "replacement": "x"}])}
+        ),
+        "api.replace-text-bulk.font": font_replace,
+        "api.redact-text": post("/pdf/redact-text", pdf, {"targets": SEARCH_TERM}),
+        "api.delete-pages": post("/pdf/delete-pages", pdf, {"page_numbers": half}),
+        "api.reorder-pages": post(
+            "/pdf/reorder-pages", pdf, {"new_order": ",".join(str(i) for i in range(page_count - 1, -1, -1))}
+        ),
+        "api.extract-pages": post("/pdf/extract-pages", pdf, {"page_numbers": half}),
+        "api.get-info-batch": post("/pdf/get-info-batch", lambda: [
+            ("files", (f"doc-{index}.pdf", data, "application/pdf"))
+            for index, data in enumerate([main_bytes, second_bytes] * 8)
+        ], {"limit": "0"}),
+        "api.search-text-batch": post("/pdf/search-text-batch", lambda: [
+            ("files", (f"doc-{index}.pdf", data, "application/pdf"))
+            for index, data in enumerate([main_bytes, second_bytes] * 8)
+        ], {"query": SEARCH_TERM}),
+        "api.merge": post("/pdf/merge", lambda: [
+            ("files", ("main.pdf", main_bytes, "application/pdf")),
+            ("files", ("second.pdf", second_bytes, "application/pdf")),
+        ]),
+        "api.optimize": post("/pdf/optimize", pdf),
+        "api.split": post("/pdf/split", pdf, {"ranges": f"0-{page_count // 2 - 1 if page_count > 1 else 0};{page_count - 1}"}),
+        "api.render": post("/pdf/render", pdf, {"pages": "0", "width": "200"}),
+        "api.pipeline": post("/pdf/pipeline", pdf, {"operations": json.dumps([
+            {"operation": "add_text", "params": {"text": "Benchmark", "x": 72, "y": 72}},
+            {"operation": "delete_pages", "params": {"page_numbers": [0]}},
+        ])}),
+        "api.sessions.roundtrip": session_roundtrip,
+        "api.jobs.roundtrip": job_roundtrip,
+    }
+
+
+def case_names(fixtures: Dict[str, str]) -> List[str]:
+    with tempfile.TemporaryDirectory(prefix="pdf_bench_") as workdir:
+        return list(processor_cases(fixtures, Path(workdir))) + list(api_cases(fixtures))
+
+
+def uncovered_targets(names: List[str]) -> List[str]:
+    """
+    Public PDFProcessor methods and /pdf routes that no case exercises.
+    """
+    from pdf_processor import PDFProcessor
+    from scripts.pdf_api import app
+
+    covered = {name.split(".")[1] for name in names}
+    missing = [
+        f"PDFProcessor.{name}" for name in dir(PDFProcessor)
+        if not name.startswith("_") and callable(getattr(PDFProcessor, name))
+        and name not in covered
+        and name not in ("apply_to_document", "export_document", "validate_operations", "validate_replacements",
+                         "iter_batch", "batch_item")
+    ]
+    for route in app.routes:
+        path = getattr(route, "path", "")
+        if path.startswith("/pdf/") and path[len("/pdf/"):] not in covered:
+            missing.append(path)
+    return missing
+
+
+# --------------------------------------------------------------------------
+# Measurement
+# --------------------------------------------------------------------------
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    # Worker processes count too; ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def summarize(latencies: List[float], output_size: int) -> Dict[str, Any]:
+    total = sum(latencies)
+    return {
+        "iterations": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "mean_ms": round(total / len(latencies) * 1000, 3),
+        "min_ms": round(min(latencies) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+        "throughput_per_s": round(len(latencies) / total, 3) if total else None,
+        "output_bytes": output_size,
+    }
+
+
+def run_case(name: str, fixtures: Dict[str, str], iterations: int, warmup: int) -> Dict[str, Any]:
+    workdir = Path(tempfile.mkdtemp(prefix="pdf_bench_"))
+    try:
+        latencies: List[float] = []
+        output_size = 0
+        if name.startswith("processor."):
+            case = processor_cases(fixtures, workdir)[name]
+            for iteration in range(warmup + iterations):
+                started = time.perf_counter()
+                output_size = case()
+                if iteration >= warmup:
+                    latencies.append(time.perf_counter() - started)
+        else:
+            latencies, output_size = asyncio.run(_run_api_case(name, fixtures, iterations, warmup))
+
+        result = summarize(latencies, output_size)
+        result["peak_rss_bytes"] = peak_rss_bytes()
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+async def _run_api_case(
+    name: str,
+    fixtures: Dict[str, str],
+    iterations: int,
+    warmup: int
+) -> Tuple[List[float], int]:
+    import httpx
+    from scripts.pdf_api import app, job_queue, worker_pool
+
+    case = api_cases(fixtures)[name]
+    latencies: List[float] = []
+    output_size = 0
+    transport = httpx.ASGITransport(app=app)
+    # ASGITransport does not run the lifespan, which starts the job dispatcher.
+    job_queue.start()
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for iteration in range(warmup + iterations):
+                started = time.perf_counter()
+                output_size = await case(client)
+                if iteration >= warmup:
+                    latencies.append(time.perf_counter() - started)
+    finally:
+        job_queue.stop()
+        # Reap pool processes so their peak RSS shows up in RUSAGE_CHILDREN.
+        worker_pool.shutdown(wait=True)
+    return latencies, output_size
+
+
+def _isolated_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # Measure the work itself, not cache hits from the previous iteration.
+    env.setdefault("PDF_API_RESULT_CACHE", "off")
+    env.setdefault("PDF_API_RENDER_CACHE_MB", "0")
+    env.setdefault("PDF_API_TEXT_INDEX_CACHE", "0")
+    return env
+
+
+def run_case_subprocess(name: str, fixture_dir: Path, iterations: int, warmup: int) -> Dict[str, Any]:
+    command = [
+        sys.executable, str(Path(__file__).resolve()),
+        "--run-case", name,
+        "--fixture-dir", str(fixture_dir),
+        "--iterations", str(iterations),
+        "--warmup", str(warmup),
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, env=_isolated_env(), cwd=str(ROOT))
+    lines = [line for line in completed.stdout.splitlines() if line.strip()]
+    if completed.returncode != 0 or not lines:
+        detail = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+        return {"error": detail}
+    return json.loads(lines[-1])
+
+
+# --------------------------------------------------------------------------
+# Reporting
+# --------------------------------------------------------------------------
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=str(ROOT), check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'case':40} {'p50 ms':>10} {'p95 ms':>10} {'ops/s':>9} {'peak MB':>9} {'output':>10}")
+    for name, stats in results.items():
+        if "error" in stats:
+            print(f"{name:40} ERROR {stats['error']}")
+            continue
+        rss = stats.get("peak_rss_bytes")
+        print(
+            f"{name:40} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+            f"{stats['throughput_per_s'] or 0:>9.1f} {rss / 2 ** 20 if rss else 0:>9.1f} {stats['output_bytes']:>10}"
+        )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print per-case changes against a baseline run and return the cases whose
+    p50 latency or peak RSS grew by more than threshold.
+    """
+    regressions: List[str] = []
+    print(f"\n{'case':40} {'p50 base':>10} {'p50 now':>10} {'change':>8} {'rss change':>11}")
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "error" in base or "error" in stats:
+            continue
+        change = stats["p50_ms"] / base["p50_ms"] - 1 if base["p50_ms"] else 0.0
+        rss_change = 0.0
+        if stats.get("peak_rss_bytes") and base.get("peak_rss_bytes"):
+            rss_change = stats["peak_rss_bytes"] / base["peak_rss_bytes"] - 1
+        flag = " !" if change > threshold or rss_change > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(
+            f"{name:40} {base['p50_ms']:>10.2f} {stats['p50_ms']:>10.2f} "
+            f"{change:>+8.1%} {rss_change:>+11.1%}{flag}"
+        )
+    if current.get("config") != baseline.get("config"):
+        print("\nwarning: fixture configuration differs from the baseline run")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", choices=("processor", "api", "all"), default="all")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this string.")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--words", type=int, default=300, help="Words of text per page.")
+    parser.add_argument("--images", type=int, default=1, help="Images per page.")
+    parser.add_argument("--fonts", type=int, default=2, help=f"Distinct fonts (1-{len(BASE14_FONTS)}).")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run cases in this process (faster; peak RSS is then cumulative).")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative p50/RSS growth reported as a regression (default 0.10).")
+    parser.add_argument("--list", action="store_true", help="List cases and uncovered methods/routes.")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--fixture-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        result = run_case(args.run_case, load_fixtures(Path(args.fixture_dir)), args.iterations, args.warmup)
+        print(json.dumps(result))
+        return 0
+
+    config = {"pages": args.pages, "words": args.words, "images": args.images, "fonts": args.fonts}
+    fixture_dir = Path(tempfile.mkdtemp(prefix="pdf_bench_fixtures_"))
+    try:
+        fixtures = build_fixtures(fixture_dir, config)
+        all_names = case_names(fixtures)
+        names = [
+            name for name in all_names
+            if (args.suite == "all" or name.startswith(args.suite + ".")) and args.filter in name
+        ]
+        if args.list:
+            print("\n".join(names))
+            missing = uncovered_targets(all_names)
+            if missing:
+                print("\nnot benchmarked: " + ", ".join(missing))
+            return 0
+
+        results: Dict[str, Dict[str, Any]] = {}
+        if args.in_process:
+            os.environ.update({key: value for key, value in _isolated_env().items() if key not in os.environ})
+        for name in names:
+            print(f"running {name} ...", file=sys.stderr)
+            if args.in_process:
+                try:
+                    results[name] = run_case(name, fixtures, args.iterations, args.warmup)
+                except Exception as exc:
+                    results[name] = {"error": str(exc)}
+            else:
+                results[name] = run_case_subprocess(name, fixture_dir, args.iterations, args.warmup)
+
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "pymupdf": fitz.VersionBind,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "isolated": not args.in_process,
+            },
+            "config": {**config, "iterations": args.iterations, "warmup": args.warmup},
+            "fixtures": {name: os.path.getsize(path) for name, path in fixtures.items()},
+            "results": results,
+        }
+    finally:
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+
+    print_table(results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 1 if any("error" in stats for stats in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
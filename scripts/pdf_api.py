@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import hashlib
+import io
+import json
+import mmap
 import os
 import shutil
 import tempfile
+import time
+import uuid
+import zipfile
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import quote
 
 from fastapi import (
     BackgroundTasks,
@@ -14,20 +25,129 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Query,
     UploadFile,
 )
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 
+from pdf_cache import ResultCache
+from pdf_document_store import DocumentStore, DocumentStoreMiddleware, hold_for_request
+from pdf_fonts import FontNotFound, FontStore
+from pdf_jobs import JobNotFound, JobQueue
+from pdf_metrics import BatchStats, MetricsMiddleware, call_with_metrics, current_recorder, default_registry, phase
 from pdf_processor import PDFProcessor
+from pdf_sessions import DocumentSessionCache, SessionNotFound
+from pdf_worker_pool import WorkerCrashed, WorkerPool, WorkerPoolFull, WorkerTimeout
+
+
+processor = PDFProcessor()
+worker_pool = WorkerPool.from_env()
+session_cache = DocumentSessionCache.from_env()
+result_cache = ResultCache.from_env()
+job_queue = JobQueue.from_env(worker_pool.mode)
+metrics_registry = default_registry()
+METRICS_ENABLED = os.environ.get("PDF_API_METRICS", "1").strip().lower() not in ("0", "false", "off", "no")
+
+# "disk" copies each upload to a temp file and serves results from disk;
+# "memory" hands the upload buffer straight to PyMuPDF and streams the saved
+# bytes back, skipping the temp-file round trips; "shared" places uploads once
+# in a DocumentStore that every API worker and pool process opens by path.
+IO_MODES = ("disk", "memory", "shared")
+IO_MODE = os.environ.get("PDF_API_IO_MODE", "disk").strip().lower() or "disk"
+if IO_MODE not in IO_MODES:
+    raise RuntimeError(f"PDF_API_IO_MODE must be one of {IO_MODES}, got '{IO_MODE}'.")
+document_store = DocumentStore.from_env() if IO_MODE == "shared" else None
+font_store = FontStore.from_env()
+STREAM_CHUNK_SIZE = 1024 * 1024
+MAX_SEARCH_WORKERS = int(os.environ.get("PDF_API_SEARCH_WORKERS", "") or os.cpu_count() or 1)
+MERGE_MEMORY_MB = int(os.environ.get("PDF_API_MERGE_MEMORY_MB", "") or 0)
+RENDER_CACHE_DIR = os.environ.get("PDF_API_RENDER_CACHE_DIR", "").strip() or os.path.join(
+    tempfile.gettempdir(), "pdf_render_cache"
+)
+RENDER_CACHE_BYTES = int(os.environ.get("PDF_API_RENDER_CACHE_MB", "") or 256) * 1024 * 1024
+RENDER_MEDIA_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+MAX_RENDER_ZOOM = 8.0
+# Server-side documents the batch endpoints may read; unset disables them.
+BATCH_ROOT = os.environ.get("PDF_API_BATCH_ROOT", "").strip()
+# Pages per worker call when streaming /pdf/extract-text.
+EXTRACT_BATCH_PAGES = max(1, int(os.environ.get("PDF_API_EXTRACT_BATCH_PAGES", "") or 32))
+MAX_RENDER_PIXELS = 8192
+
+# Session documents live in this process, and PyMuPDF is not thread-safe, so
+# every call touching them is serialized onto one dedicated thread. Its queue
+# and run time are bounded like the worker pool's (429 and 504).
+session_pool = WorkerPool(
+    mode="thread",
+    max_workers=1,
+    max_queue=int(os.environ.get("PDF_API_SESSION_MAX_QUEUE", "") or 16),
+    timeout=worker_pool.timeout,
+)
+
+
+# Worker slots shared by every batch request's documents, made on the
+# server's event loop.
+_batch_slots: asyncio.Semaphore | None = None
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    global _batch_slots
+    _batch_slots = asyncio.Semaphore(worker_pool.max_workers)
+    job_queue.start()
+    yield
+    job_queue.stop()
+    await _run_on_document_thread(session_cache.clear)
+    session_pool.shutdown(wait=False)
+    worker_pool.shutdown(wait=False)
+    if document_store is not None:
+        document_store.close()
 
 
 app = FastAPI(
     title="PDF Processor API",
     description="REST API wrapper around PDFProcessor utilities.",
     version="1.0.0",
+    lifespan=_lifespan,
 )
+if document_store is not None:
+    app.add_middleware(DocumentStoreMiddleware, store=document_store)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics_registry)
 
-processor = PDFProcessor()
+
+@contextmanager
+def _pool_errors() -> Iterator[None]:
+    try:
+        yield
+    except WorkerPoolFull as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "1"}) from exc
+    except WorkerTimeout as exc:
+        raise HTTPException(status_code=504, detail=str(exc)) from exc
+    except WorkerCrashed as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"}) from exc
+
+
+async def _run(func: Callable[..., Dict[str, Any]], *args: Any, **kwargs: Any) -> Dict[str, Any]:
+    with _pool_errors():
+        recorder = current_recorder()
+        if recorder is None:
+            return await worker_pool.run(func, *args, **kwargs)
+
+        # Phases recorded inside the worker come back with the result.
+        result = await worker_pool.run(call_with_metrics, time.time(), func, *args, **kwargs)
+        metrics = result.pop("metrics", None) if isinstance(result, dict) else None
+        if metrics:
+            recorder.merge(metrics)
+            if metrics.get("worker_peak_rss_bytes"):
+                metrics_registry.set_max("pdf_api_worker_peak_rss_bytes", metrics["worker_peak_rss_bytes"])
+        return result
+
+
+async def _run_on_document_thread(func: Callable[..., Any], *args: Any) -> Any:
+    # Carry the request's context over so phases recorded there are kept.
+    context = contextvars.copy_context()
+    with _pool_errors():
+        return await session_pool.run(context.run, func, *args)
 
 
 def _mk_workdir() -> Path:
@@ -38,12 +158,100 @@ def _save_upload(upload: UploadFile, directory: Path, *, default_suffix: str = "
     filename = upload.filename or ""
     suffix = Path(filename).suffix or default_suffix
     fd, temp_path = tempfile.mkstemp(dir=str(directory), suffix=suffix)
-    with os.fdopen(fd, "wb") as buffer:
+    with phase("upload"), os.fdopen(fd, "wb") as buffer:
         upload.file.seek(0)
         shutil.copyfileobj(upload.file, buffer)
     return Path(temp_path)
 
 
+def _upload_view(upload: UploadFile) -> memoryview:
+    """
+    Read-only view of an upload. Large uploads are spooled to disk by the
+    server and get mapped rather than read; small in-memory ones are copied
+    once, since exporting the spool buffer would keep it from being closed.
+    """
+    spooled = upload.file
+    raw = getattr(spooled, "_file", spooled)
+    if isinstance(raw, io.BytesIO):
+        return memoryview(raw.getvalue())
+    try:
+        fileno = raw.fileno()
+        size = os.fstat(fileno).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        spooled.seek(0)
+        return memoryview(spooled.read())
+    if not size:
+        return memoryview(b"")
+    return memoryview(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+
+
+def _shared_input(upload: UploadFile) -> str:
+    """
+    Path of the upload in the document store, referenced until the request ends.
+    """
+    with phase("upload"):
+        upload.file.seek(0)
+        doc_id = document_store.put(upload.file)
+    hold_for_request(doc_id)
+    return document_store.path(doc_id)
+
+
+def _pdf_input(upload: UploadFile, workdir: Path) -> Any:
+    if IO_MODE == "shared":
+        return _shared_input(upload)
+    if IO_MODE == "memory":
+        with phase("upload"):
+            view = _upload_view(upload)
+        # Buffers cannot be shared with worker processes; they get one copy.
+        return view if worker_pool.mode == "thread" else bytes(view)
+    return str(_save_upload(upload, workdir, default_suffix=".pdf"))
+
+
+def _pdf_source(upload: UploadFile, workdir: Path, save_mode: str = "full") -> Tuple[Any, str | None]:
+    """
+    Source and output arguments for a PDFProcessor edit in the configured I/O
+    mode. Incremental saves always need a file on disk.
+    """
+    if IO_MODE == "memory" and save_mode != "incremental":
+        return _pdf_input(upload, workdir), None
+    if IO_MODE == "shared" and save_mode != "incremental":
+        pdf_path = _shared_input(upload)
+        return pdf_path, str(_edit_output_path(workdir, Path(pdf_path), save_mode))
+    pdf_path = _save_upload(upload, workdir, default_suffix=".pdf")
+    return str(pdf_path), str(_edit_output_path(workdir, pdf_path, save_mode))
+
+
+def _search_workers(workers: int | None) -> int:
+    return min(workers or MAX_SEARCH_WORKERS, MAX_SEARCH_WORKERS)
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _stream_bytes(
+    data: bytes,
+    *,
+    media_type: str,
+    download_name: str | None = None,
+    headers: Dict[str, str] | None = None,
+) -> StreamingResponse:
+    view = memoryview(data)
+
+    def _chunks() -> Iterator[memoryview]:
+        for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+            yield view[offset:offset + STREAM_CHUNK_SIZE]
+
+    response_headers = dict(headers or {})
+    response_headers["Content-Length"] = str(len(view))
+    if download_name:
+        response_headers["Content-Disposition"] = _content_disposition(download_name)
+    return StreamingResponse(_chunks(), media_type=media_type, headers=response_headers)
+
+
 def _parse_int_list(raw: str, field_name: str) -> List[int]:
     try:
         return [int(item.strip()) for item in raw.split(",") if item.strip()]
@@ -51,26 +259,160 @@ def _parse_int_list(raw: str, field_name: str) -> List[int]:
         raise HTTPException(status_code=400, detail=f"Invalid integer list for '{field_name}'.") from exc
 
 
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only, unseekable sink that hands written bytes back on drain(), so
+    a ZipFile can be streamed entry by entry.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_chunks(entries: Iterator[Tuple[str, bytes]]) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    # PDFs are already compressed; storing them keeps the archive cheap to stream.
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _multipart_chunks(entries: Iterator[Tuple[str, bytes]], boundary: str) -> Iterator[bytes]:
+    for name, data in entries:
+        yield (
+            f"--{boundary}\r\n"
+            "Content-Type: application/pdf\r\n"
+            f"Content-Disposition: {_content_disposition(name)}\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n"
+        ).encode("utf-8")
+        yield data
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode("utf-8")
+
+
+def _parse_page_ranges(raw: str, field_name: str) -> List[int]:
+    """
+    Parse "0-4,9" style 0-based page ranges (inclusive) into page indices.
+    """
+    pages: List[int] = []
+    try:
+        for item in raw.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            start, _, end = item.partition("-")
+            first = int(start)
+            last = int(end) if end else first
+            if first < 0 or last < first:
+                raise ValueError(item)
+            pages.extend(range(first, last + 1))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid page range for '{field_name}'.") from exc
+    return pages
+
+
 def _parse_string_list(raw: str) -> List[str]:
     return [item.strip() for item in raw.split(",") if item.strip()]
 
 
+def _parse_json_object(raw: str, field_name: str) -> Dict[str, Any]:
+    try:
+        value = json.loads(raw) if raw.strip() else {}
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON for '{field_name}'.") from exc
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=400, detail=f"'{field_name}' must be a JSON object.")
+    return value
+
+
+def _parse_json_list(raw: str, field_name: str) -> List[Any]:
+    try:
+        value = json.loads(raw)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON for '{field_name}'.") from exc
+    if not isinstance(value, list):
+        raise HTTPException(status_code=400, detail=f"'{field_name}' must be a JSON array.")
+    return value
+
+
+def _reject_client_paths(params: Dict[str, Any]) -> None:
+    # Server-side paths are only ever filled in from uploaded files.
+    if "image_path" in params:
+        raise HTTPException(status_code=400, detail="'image_path' cannot be set by clients; upload the image instead.")
+    if "font_file" in params:
+        raise HTTPException(status_code=400, detail="'font_file' cannot be set by clients; upload to /fonts and pass font_id.")
+    if "font_id" in params:
+        params["font_file"] = _font_file(params.pop("font_id"))
+
+
+def _font_file(font_id: str | None) -> str | None:
+    if not font_id:
+        return None
+    try:
+        return font_store.path(str(font_id))
+    except FontNotFound as exc:
+        raise HTTPException(status_code=404, detail=f"Font not found: {font_id}. Upload it to /fonts first.") from exc
+
+
 def _ensure_success(result: Dict[str, Any]) -> Dict[str, Any]:
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error", "Operation failed."))
     return result
 
 
+def _resolve_save_mode(save_mode: str | None) -> str:
+    mode = (save_mode or processor.default_save_mode).strip().lower()
+    if mode not in PDFProcessor.SAVE_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid save_mode '{mode}'. Expected one of: {', '.join(PDFProcessor.SAVE_MODES)}.",
+        )
+    return mode
+
+
+def _resolve_save_profile(save_profile: str | None) -> str:
+    profile = (save_profile or processor.default_save_profile).strip().lower()
+    if profile not in PDFProcessor.SAVE_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid save_profile '{profile}'. Expected one of: {', '.join(PDFProcessor.SAVE_PROFILES)}.",
+        )
+    return profile
+
+
+def _edit_output_path(workdir: Path, pdf_path: Path, save_mode: str) -> Path:
+    # Incremental saves append to the uploaded copy instead of writing a new file.
+    return pdf_path if save_mode == "incremental" else workdir / "output.pdf"
+
+
 def _file_result_response(
     *,
     result: Dict[str, Any],
     background_tasks: BackgroundTasks,
     workdir: Path,
     download_name: str,
-) -> FileResponse:
+    return_delta: bool = False,
+    cache_key: str | None = None,
+) -> Response:
     data = _ensure_success(result)
+    output = data.pop("output", None)
     output_path = Path(data.get("output_path", ""))
-    if not output_path.is_file():
+    if output is None and not output_path.is_file():
         background_tasks.add_task(shutil.rmtree, workdir, ignore_errors=True)
         raise HTTPException(status_code=500, detail="Expected output file was not produced.")
 
@@ -79,6 +421,53 @@ def _file_result_response(
         headers["X-Operation-Message"] = data["message"]
     if "removed_count" in data:
         headers["X-Removed-Count"] = str(data["removed_count"])
+    if "replaced_count" in data:
+        headers["X-Replaced-Count"] = str(data["replaced_count"])
+    if "font_embeds" in data:
+        headers["X-Font-Embeds"] = str(data["font_embeds"])
+        headers["X-Font-Embeds-Avoided"] = str(data["font_embeds_avoided"])
+    if "image_embeds" in data:
+        headers["X-Image-Embeds"] = str(data["image_embeds"])
+        headers["X-Image-Embeds-Avoided"] = str(data["image_embeds_avoided"])
+    if "pages_changed" in data:
+        headers["X-Pages-Changed"] = str(data["pages_changed"])
+    if "stamp_forms" in data:
+        headers["X-Stamp-Forms"] = str(data["stamp_forms"])
+    if "steps" in data:
+        headers["X-Pipeline-Steps"] = json.dumps(data["steps"], separators=(",", ":"))
+    if data.get("save_mode"):
+        headers["X-Save-Mode"] = data["save_mode"]
+    if data.get("save_mode") == "incremental":
+        headers["X-Base-Size"] = str(data["base_size"])
+        headers["X-Delta-Size"] = str(data["delta_size"])
+    if data.get("save_profile"):
+        headers["X-Save-Profile"] = data["save_profile"]
+        headers["X-Save-Ms"] = str(data["save_ms"])
+    if "input_bytes" in data:
+        headers["X-Input-Bytes"] = str(data["input_bytes"])
+        headers["X-Output-Bytes"] = str(data["output_bytes"])
+    if "bytes_saved" in data:
+        headers["X-Bytes-Saved"] = str(data["bytes_saved"])
+    if cache_key is not None:
+        _store_file_result(cache_key, headers, output, output_path)
+        headers["X-Result-Cache"] = "miss"
+
+    if return_delta and data.get("save_mode") == "incremental":
+        # The client already holds the uploaded bytes; send only the appended update.
+        with open(output_path, "rb") as handle:
+            handle.seek(data["base_size"])
+            delta = handle.read()
+        shutil.rmtree(workdir, ignore_errors=True)
+        return Response(content=delta, media_type="application/octet-stream", headers=headers)
+
+    if output is not None:
+        shutil.rmtree(workdir, ignore_errors=True)
+        return _stream_bytes(
+            output,
+            media_type="application/pdf",
+            download_name=download_name,
+            headers=headers,
+        )
 
     background_tasks.add_task(shutil.rmtree, workdir, ignore_errors=True)
 
@@ -90,6 +479,59 @@ def _file_result_response(
     )
 
 
+def _upload_digest(upload: UploadFile) -> str:
+    digest = hashlib.sha256()
+    with phase("digest"):
+        upload.file.seek(0)
+        for chunk in iter(lambda: upload.file.read(STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        upload.file.seek(0)
+    return digest.hexdigest()
+
+
+async def _result_cache_key(operation: str, uploads: List[UploadFile], params: Dict[str, Any]) -> str | None:
+    if not result_cache.enabled:
+        return None
+    # Hashing reads every upload in full, so it stays off the event loop.
+    digests = await asyncio.to_thread(lambda: [_upload_digest(upload) for upload in uploads])
+    return result_cache.make_key(operation, digests, params)
+
+
+def _cached_json_response(cache_key: str | None) -> Response | None:
+    cached = result_cache.get(cache_key) if cache_key else None
+    if cached is None:
+        return None
+    return Response(content=cached[1], media_type="application/json", headers={"X-Result-Cache": "hit"})
+
+
+def _json_result_response(result: Dict[str, Any], cache_key: str | None) -> Response:
+    _ensure_success(result)
+    if cache_key is None:
+        return JSONResponse(content=result)
+    payload = json.dumps(result, separators=(",", ":")).encode("utf-8")
+    result_cache.put(cache_key, {}, payload)
+    return Response(content=payload, media_type="application/json", headers={"X-Result-Cache": "miss"})
+
+
+def _cached_file_response(cache_key: str | None, download_name: str) -> Response | None:
+    cached = result_cache.get(cache_key) if cache_key else None
+    if cached is None:
+        return None
+    meta, payload = cached
+    headers = dict(meta.get("headers", {}))
+    headers["X-Result-Cache"] = "hit"
+    return _stream_bytes(payload, media_type="application/pdf", download_name=download_name, headers=headers)
+
+
+def _store_file_result(cache_key: str, headers: Dict[str, str], output: bytes | None, output_path: Path) -> None:
+    if output is None:
+        # Disk-mode results are only read back if they could fit in the cache.
+        if output_path.stat().st_size > result_cache.backend.max_bytes:
+            return
+        output = output_path.read_bytes()
+    result_cache.put(cache_key, {"headers": headers}, output)
+
+
 def _cleanup_and_raise(workdir: Path, status_code: int, detail: str) -> None:
     shutil.rmtree(workdir, ignore_errors=True)
     raise HTTPException(status_code=status_code, detail=detail)
@@ -105,19 +547,26 @@ async def add_text(
     page: int = Form(0),
     font_size: float = Form(12.0),
     font_name: str = Form("helv"),
+    font_id: str | None = Form(None, description="Font uploaded to /fonts; overrides font_name."),
     color_r: float = Form(0.0),
     color_g: float = Form(0.0),
     color_b: float = Form(0.0),
-) -> FileResponse:
+    save_mode: str | None = Form(None, description="'full' rewrite or 'incremental' update."),
+    return_delta: bool = Form(False, description="Return only the appended bytes for incremental saves."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
+) -> Response:
     workdir = _mk_workdir()
     try:
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
-        output_path = workdir / "output.pdf"
+        mode = _resolve_save_mode(save_mode)
+        profile = _resolve_save_profile(save_profile)
+        font_file = _font_file(font_id)
+        source, output_path = _pdf_source(pdf_file, workdir, mode)
         color: Tuple[float, float, float] = (color_r, color_g, color_b)
 
-        result = processor.add_text(
-            str(pdf_path),
-            str(output_path),
+        result = await _run(
+            processor.add_text,
+            source,
+            output_path,
             text,
             x,
             y,
@@ -125,6 +574,9 @@ async def add_text(
             font_size,
             color,
             font_name,
+            font_file,
+            save_mode=mode,
+            save_profile=profile,
         )
 
         download_name = f"add-text-{pdf_file.filename or 'document'}.pdf"
@@ -133,6 +585,7 @@ async def add_text(
             background_tasks=background_tasks,
             workdir=workdir,
             download_name=download_name,
+            return_delta=return_delta,
         )
     except HTTPException:
         shutil.rmtree(workdir, ignore_errors=True)
@@ -151,22 +604,34 @@ async def add_image(
     page: int = Form(0),
     width: float | None = Form(None),
     height: float | None = Form(None),
-) -> FileResponse:
+    pages: str | None = Form(None, description='"all" or 0-based page ranges such as "0-4,9"; overrides page.'),
+    save_mode: str | None = Form(None, description="'full' rewrite or 'incremental' update."),
+    return_delta: bool = Form(False, description="Return only the appended bytes for incremental saves."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
+) -> Response:
     workdir = _mk_workdir()
     try:
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
+        mode = _resolve_save_mode(save_mode)
+        profile = _resolve_save_profile(save_profile)
+        target_pages = None
+        if pages is not None and pages.strip():
+            target_pages = "all" if pages.strip().lower() == "all" else _parse_page_ranges(pages, "pages")
+        source, output_path = _pdf_source(pdf_file, workdir, mode)
         image_path = _save_upload(image_file, workdir)
-        output_path = workdir / "output.pdf"
 
-        result = processor.add_image(
-            str(pdf_path),
-            str(output_path),
+        result = await _run(
+            processor.add_image,
+            source,
+            output_path,
             str(image_path),
             x,
             y,
             page,
             width,
             height,
+            target_pages,
+            save_mode=mode,
+            save_profile=profile,
         )
 
         download_name = f"add-image-{pdf_file.filename or 'document'}.pdf"
@@ -175,6 +640,78 @@ async def add_image(
             background_tasks=background_tasks,
             workdir=workdir,
             download_name=download_name,
+            return_delta=return_delta,
+        )
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        _cleanup_and_raise(workdir, 500, str(exc))
+
+
+@app.post("/pdf/stamp")
+async def stamp(
+    background_tasks: BackgroundTasks,
+    pdf_file: UploadFile = File(...),
+    text: str | None = Form(None, description="Stamp text; newlines start new lines."),
+    image_file: UploadFile | None = File(None, description="Image drawn above the text."),
+    pages: str = Form("all", description='"all" or 0-based page ranges such as "0-4,9".'),
+    rect: str | None = Form(None, description="Comma-separated x0,y0,x1,y1 the stamp is fitted into; whole page by default."),
+    font_size: float = Form(48.0),
+    font_name: str = Form("helv"),
+    font_id: str | None = Form(None, description="Font uploaded to /fonts; overrides font_name."),
+    color_r: float = Form(0.5),
+    color_g: float = Form(0.5),
+    color_b: float = Form(0.5),
+    rotate: float = Form(0.0, description="Counter-clockwise rotation in degrees."),
+    opacity: float = Form(1.0),
+    overlay: bool = Form(True, description="False puts the stamp behind the page content."),
+    save_mode: str | None = Form(None, description="'full' rewrite or 'incremental' update."),
+    return_delta: bool = Form(False, description="Return only the appended bytes for incremental saves."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
+) -> Response:
+    workdir = _mk_workdir()
+    try:
+        mode = _resolve_save_mode(save_mode)
+        profile = _resolve_save_profile(save_profile)
+        font_file = _font_file(font_id)
+        target_pages = "all" if pages.strip().lower() == "all" else _parse_page_ranges(pages, "pages")
+        rect_values = None
+        if rect is not None and rect.strip():
+            try:
+                rect_values = [float(value.strip()) for value in rect.split(",")]
+            except Exception as exc:
+                _cleanup_and_raise(workdir, 400, f"Invalid rect: {exc}")
+        source, output_path = _pdf_source(pdf_file, workdir, mode)
+        image_path = _save_upload(image_file, workdir) if image_file is not None else None
+        color: Tuple[float, float, float] = (color_r, color_g, color_b)
+
+        result = await _run(
+            processor.stamp,
+            source,
+            output_path,
+            text,
+            str(image_path) if image_path else None,
+            target_pages,
+            rect_values,
+            font_size,
+            font_name,
+            font_file,
+            color,
+            rotate,
+            opacity,
+            overlay,
+            save_mode=mode,
+            save_profile=profile,
+        )
+
+        download_name = f"stamp-{pdf_file.filename or 'document'}.pdf"
+        return _file_result_response(
+            result=result,
+            background_tasks=background_tasks,
+            workdir=workdir,
+            download_name=download_name,
+            return_delta=return_delta,
         )
     except HTTPException:
         shutil.rmtree(workdir, ignore_errors=True)
@@ -188,17 +725,20 @@ async def delete_pages(
     background_tasks: BackgroundTasks,
     pdf_file: UploadFile = File(...),
     page_numbers: str = Form(..., description="Comma-separated page indices (0-based)."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
 ) -> FileResponse:
     workdir = _mk_workdir()
     try:
         indices = _parse_int_list(page_numbers, "page_numbers")
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
-        output_path = workdir / "output.pdf"
+        profile = _resolve_save_profile(save_profile)
+        source, output_path = _pdf_source(pdf_file, workdir)
 
-        result = processor.delete_pages(
-            str(pdf_path),
-            str(output_path),
+        result = await _run(
+            processor.delete_pages,
+            source,
+            output_path,
             indices,
+            save_profile=profile,
         )
 
         download_name = f"delete-pages-{pdf_file.filename or 'document'}.pdf"
@@ -220,17 +760,20 @@ async def reorder_pages(
     background_tasks: BackgroundTasks,
     pdf_file: UploadFile = File(...),
     new_order: str = Form(..., description="Comma-separated target order, 0-based."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
 ) -> FileResponse:
     workdir = _mk_workdir()
     try:
         order = _parse_int_list(new_order, "new_order")
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
-        output_path = workdir / "output.pdf"
+        profile = _resolve_save_profile(save_profile)
+        source, output_path = _pdf_source(pdf_file, workdir)
 
-        result = processor.reorder_pages(
-            str(pdf_path),
-            str(output_path),
+        result = await _run(
+            processor.reorder_pages,
+            source,
+            output_path,
             order,
+            save_profile=profile,
         )
 
         download_name = f"reorder-pages-{pdf_file.filename or 'document'}.pdf"
@@ -251,26 +794,47 @@ async def reorder_pages(
 async def merge_pdfs(
     background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(..., description="Upload at least two PDF files."),
+    memory_limit_mb: int | None = Form(
+        None, description="Flush the merged pages to disk whenever this many MB of inputs are pending."
+    ),
+    deduplicate: bool = Form(False, description="Store fonts, images and other objects shared by inputs once."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
 ) -> FileResponse:
     if len(files) < 2:
         raise HTTPException(status_code=400, detail="At least two PDF files are required.")
+    if memory_limit_mb is not None and memory_limit_mb <= 0:
+        raise HTTPException(status_code=400, detail="memory_limit_mb must be positive.")
+    memory_limit_mb = memory_limit_mb or MERGE_MEMORY_MB or None
+    profile = _resolve_save_profile(save_profile)
+
+    download_name = "merged.pdf"
+    cache_key = await _result_cache_key(
+        "merge", files, {"streaming": bool(memory_limit_mb), "deduplicate": deduplicate, "save_profile": profile}
+    )
+    cached = _cached_file_response(cache_key, download_name)
+    if cached is not None:
+        return cached
 
     workdir = _mk_workdir()
     try:
-        pdf_paths = [str(_save_upload(upload, workdir, default_suffix=".pdf")) for upload in files]
-        output_path = workdir / "merged.pdf"
-
-        result = processor.merge_pdfs(
-            pdf_paths,
-            str(output_path),
+        sources = [_pdf_input(upload, workdir) for upload in files]
+        output_path = None if IO_MODE == "memory" else str(workdir / "merged.pdf")
+
+        result = await _run(
+            processor.merge_pdfs,
+            sources,
+            output_path,
+            memory_limit=memory_limit_mb * 1024 * 1024 if memory_limit_mb else None,
+            deduplicate=deduplicate,
+            save_profile=profile,
         )
 
-        download_name = "merged.pdf"
         return _file_result_response(
             result=result,
             background_tasks=background_tasks,
             workdir=workdir,
             download_name=download_name,
+            cache_key=cache_key,
         )
     except HTTPException:
         shutil.rmtree(workdir, ignore_errors=True)
@@ -284,25 +848,80 @@ async def extract_pages(
     background_tasks: BackgroundTasks,
     pdf_file: UploadFile = File(...),
     page_numbers: str = Form(..., description="Comma-separated page indices (0-based)."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
 ) -> FileResponse:
+    indices = _parse_int_list(page_numbers, "page_numbers")
+    profile = _resolve_save_profile(save_profile)
+    download_name = f"extract-pages-{pdf_file.filename or 'document'}.pdf"
+    cache_key = await _result_cache_key(
+        "extract-pages", [pdf_file], {"page_numbers": indices, "save_profile": profile}
+    )
+    cached = _cached_file_response(cache_key, download_name)
+    if cached is not None:
+        return cached
+
     workdir = _mk_workdir()
     try:
-        indices = _parse_int_list(page_numbers, "page_numbers")
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
-        output_path = workdir / "output.pdf"
+        source, output_path = _pdf_source(pdf_file, workdir)
 
-        result = processor.extract_pages(
-            str(pdf_path),
-            str(output_path),
+        result = await _run(
+            processor.extract_pages,
+            source,
+            output_path,
             indices,
+            save_profile=profile,
+        )
+
+        return _file_result_response(
+            result=result,
+            background_tasks=background_tasks,
+            workdir=workdir,
+            download_name=download_name,
+            cache_key=cache_key,
+        )
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        _cleanup_and_raise(workdir, 500, str(exc))
+
+
+@app.post("/pdf/optimize")
+async def optimize_pdf(
+    background_tasks: BackgroundTasks,
+    pdf_file: UploadFile = File(...),
+    save_profile: str = Form(
+        "balanced",
+        description=(
+            "'fast' (no rewrite), 'balanced' (drop unused objects, compress streams, object streams) "
+            "or 'smallest' (also cleans content streams and downsamples images above 200 dpi)."
+        ),
+    ),
+) -> FileResponse:
+    profile = _resolve_save_profile(save_profile)
+    download_name = f"optimized-{pdf_file.filename or 'document'}.pdf"
+    cache_key = await _result_cache_key("optimize", [pdf_file], {"save_profile": profile})
+    cached = _cached_file_response(cache_key, download_name)
+    if cached is not None:
+        return cached
+
+    workdir = _mk_workdir()
+    try:
+        source, output_path = _pdf_source(pdf_file, workdir)
+
+        result = await _run(
+            processor.optimize_pdf,
+            source,
+            output_path,
+            profile,
         )
 
-        download_name = f"extract-pages-{pdf_file.filename or 'document'}.pdf"
         return _file_result_response(
             result=result,
             background_tasks=background_tasks,
             workdir=workdir,
             download_name=download_name,
+            cache_key=cache_key,
         )
     except HTTPException:
         shutil.rmtree(workdir, ignore_errors=True)
@@ -311,30 +930,104 @@ async def extract_pages(
         _cleanup_and_raise(workdir, 500, str(exc))
 
 
+@app.post("/pdf/split")
+async def split_pdf(
+    background_tasks: BackgroundTasks,
+    pdf_file: UploadFile = File(...),
+    ranges: str = Form(..., description='Semicolon-separated outputs, each a page list like "0-4,9".'),
+    parallel: bool = Form(False, description="Divide the outputs between worker processes."),
+    workers: int | None = Form(None, description="Processes for parallel split (default: CPU count)."),
+    response_format: str = Form("zip", description="'zip' archive or 'multipart' (multipart/mixed)."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
+) -> StreamingResponse:
+    if response_format not in ("zip", "multipart"):
+        raise HTTPException(status_code=400, detail="response_format must be 'zip' or 'multipart'.")
+    profile = _resolve_save_profile(save_profile)
+    range_list = [_parse_page_ranges(group, "ranges") for group in ranges.split(";") if group.strip()]
+    if not range_list or not all(range_list):
+        raise HTTPException(status_code=400, detail="Every range needs at least one page.")
+
+    workdir = _mk_workdir()
+    try:
+        source = _pdf_input(pdf_file, workdir)
+        output_dir = None if IO_MODE == "memory" else str(workdir)
+
+        result = await _run(
+            processor.split_pdf,
+            source,
+            range_list,
+            output_dir,
+            workers=_search_workers(workers) if parallel else 1,
+            save_profile=profile,
+        )
+        _ensure_success(result)
+
+        stem = Path(pdf_file.filename or "document.pdf").stem
+
+        def _entries() -> Iterator[Tuple[str, bytes]]:
+            for part in result["parts"]:
+                data = part.get("output")
+                if data is None:
+                    data = Path(part["output_path"]).read_bytes()
+                yield f"{stem}-part-{part['index'] + 1}.pdf", data
+
+        headers = {"X-Operation-Message": result["message"], "X-Save-Profile": result["save_profile"]}
+        background_tasks.add_task(shutil.rmtree, workdir, ignore_errors=True)
+        if response_format == "multipart":
+            boundary = uuid.uuid4().hex
+            return StreamingResponse(
+                _multipart_chunks(_entries(), boundary),
+                media_type=f"multipart/mixed; boundary={boundary}",
+                headers=headers,
+            )
+        headers["Content-Disposition"] = _content_disposition(f"{stem}-split.zip")
+        return StreamingResponse(_zip_chunks(_entries()), media_type="application/zip", headers=headers)
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        _cleanup_and_raise(workdir, 500, str(exc))
+
+
 @app.post("/pdf/redact-text")
 async def redact_text(
     background_tasks: BackgroundTasks,
     pdf_file: UploadFile = File(...),
-    targets: str = Form(..., description="Comma-separated strings to redact."),
+    targets: str = Form("", description="Comma-separated strings to redact."),
+    patterns: str | None = Form(None, description="Newline-separated regular expressions to redact."),
+    presets: str | None = Form(None, description="Comma-separated pattern presets (ssn, email, phone, credit_card)."),
+    case_sensitive: bool = Form(False),
     fill_r: float = Form(1.0),
     fill_g: float = Form(1.0),
     fill_b: float = Form(1.0),
-) -> FileResponse:
+    save_mode: str | None = Form(None, description="'full' rewrite or 'incremental' update."),
+    return_delta: bool = Form(False, description="Return only the appended bytes for incremental saves."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
+) -> Response:
     workdir = _mk_workdir()
     try:
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
-        output_path = workdir / "output.pdf"
+        mode = _resolve_save_mode(save_mode)
+        profile = _resolve_save_profile(save_profile)
+        source, output_path = _pdf_source(pdf_file, workdir, mode)
 
         fill_color: Tuple[float, float, float] = (fill_r, fill_g, fill_b)
         target_list = _parse_string_list(targets)
-        if not target_list:
-            _cleanup_and_raise(workdir, 400, "At least one target string is required.")
-
-        result = processor.redact_text(
-            str(pdf_path),
-            str(output_path),
+        pattern_list = [line for line in (patterns or "").splitlines() if line.strip()]
+        preset_list = _parse_string_list(presets or "")
+        if not (target_list or pattern_list or preset_list):
+            _cleanup_and_raise(workdir, 400, "At least one target, pattern or preset is required.")
+
+        result = await _run(
+            processor.redact_text,
+            source,
+            output_path,
             target_list,
             fill_color,
+            save_mode=mode,
+            save_profile=profile,
+            patterns=pattern_list,
+            presets=preset_list,
+            case_sensitive=case_sensitive,
         )
 
         download_name = f"redact-text-{pdf_file.filename or 'document'}.pdf"
@@ -343,6 +1036,70 @@ async def redact_text(
             background_tasks=background_tasks,
             workdir=workdir,
             download_name=download_name,
+            return_delta=return_delta,
+        )
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        _cleanup_and_raise(workdir, 500, str(exc))
+
+
+@app.post("/pdf/pipeline")
+async def run_pipeline(
+    background_tasks: BackgroundTasks,
+    pdf_file: UploadFile = File(...),
+    operations: str = Form(
+        ...,
+        description=(
+            'JSON array of {"operation": name, "params": {...}} steps. '
+            "add_image steps reference an uploaded image with params.image_index."
+        ),
+    ),
+    images: List[UploadFile] = File([], description="Images referenced by add_image steps."),
+    save_mode: str | None = Form(None, description="'full' rewrite or 'incremental' update."),
+    return_delta: bool = Form(False, description="Return only the appended bytes for incremental saves."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
+) -> Response:
+    steps = _parse_json_list(operations, "operations")
+    workdir = _mk_workdir()
+    try:
+        mode = _resolve_save_mode(save_mode)
+        profile = _resolve_save_profile(save_profile)
+        image_paths = [str(_save_upload(image, workdir)) for image in images]
+
+        for index, step in enumerate(steps):
+            params = step.get("params") if isinstance(step, dict) else None
+            if not isinstance(params, dict):
+                continue
+            _reject_client_paths(params)
+            if "image_index" in params:
+                image_index = params.pop("image_index")
+                if not isinstance(image_index, int) or not 0 <= image_index < len(image_paths):
+                    _cleanup_and_raise(workdir, 400, f"Step {index}: invalid image_index {image_index}.")
+                params["image_path"] = image_paths[image_index]
+
+        error = processor.validate_operations(steps)
+        if error:
+            _cleanup_and_raise(workdir, 400, error)
+
+        source, output_path = _pdf_source(pdf_file, workdir, mode)
+        result = await _run(
+            processor.apply_operations,
+            source,
+            output_path,
+            steps,
+            save_mode=mode,
+            save_profile=profile,
+        )
+
+        download_name = f"pipeline-{pdf_file.filename or 'document'}.pdf"
+        return _file_result_response(
+            result=result,
+            background_tasks=background_tasks,
+            workdir=workdir,
+            download_name=download_name,
+            return_delta=return_delta,
         )
     except HTTPException:
         shutil.rmtree(workdir, ignore_errors=True)
@@ -352,13 +1109,42 @@ async def redact_text(
 
 
 @app.post("/pdf/get-info")
-async def get_info(pdf_file: UploadFile = File(...)) -> JSONResponse:
+async def get_info(
+    pdf_file: UploadFile = File(...),
+    offset: int = Form(0, description="First page to describe (0-based)."),
+    limit: int | None = Form(None, description="Maximum number of pages to describe."),
+    fields: str | None = Form(
+        None, description="Comma-separated page fields: page_number, width, height, rotation."
+    ),
+    columnar: bool = Form(False, description="Return pages as parallel arrays, one per field."),
+) -> Response:
+    field_list = _parse_string_list(fields or "")
+    unknown = [name for name in field_list if name not in PDFProcessor.INFO_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}.")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise HTTPException(status_code=400, detail="offset and limit must not be negative.")
+
+    cache_key = await _result_cache_key(
+        "get-info",
+        [pdf_file],
+        {"offset": offset, "limit": limit, "fields": field_list, "columnar": columnar},
+    )
+    cached = _cached_json_response(cache_key)
+    if cached is not None:
+        return cached
+
     workdir = _mk_workdir()
     try:
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
-        result = processor.get_info(str(pdf_path))
-        _ensure_success(result)
-        return JSONResponse(content=result)
+        result = await _run(
+            processor.get_info,
+            _pdf_input(pdf_file, workdir),
+            offset=offset,
+            limit=limit,
+            fields=field_list or None,
+            columnar=columnar,
+        )
+        return _json_result_response(result, cache_key)
     except HTTPException:
         shutil.rmtree(workdir, ignore_errors=True)
         raise
@@ -368,6 +1154,62 @@ async def get_info(pdf_file: UploadFile = File(...)) -> JSONResponse:
         shutil.rmtree(workdir, ignore_errors=True)
 
 
+async def _search_parallel(
+    source: str,
+    query: str,
+    *,
+    case_sensitive: bool,
+    whole_word: bool,
+    max_hits: int,
+    context_words: int,
+    workers: int,
+) -> Dict[str, Any]:
+    """
+    PDFProcessor.search_text_parallel with the shards run as tasks on the
+    worker pool, at most `workers` at a time, rather than in a process pool
+    started inside one worker. Once the leading shards reach max_hits the
+    rest are cancelled.
+    """
+    started = time.perf_counter()
+    info = await _run(processor.get_info, source, limit=0)
+    _ensure_success(info)
+    page_count = info["page_count"]
+    workers = max(1, min(workers, page_count or 1))
+    shards = processor.search_shards(page_count, workers)
+
+    queue = iter(enumerate(shards))
+    pending: Dict[asyncio.Future, int] = {}
+    shard_results: Dict[int, Dict[str, Any]] = {}
+    next_shard = 0
+    prefix_hits = 0
+
+    def _fill() -> None:
+        for shard_index, (start, stop) in queue:
+            task = asyncio.ensure_future(_run(
+                processor.search_shard, source, query, start, stop, case_sensitive, whole_word, max_hits, context_words
+            ))
+            pending[task] = shard_index
+            if len(pending) >= workers:
+                return
+
+    try:
+        _fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                shard_results[pending.pop(task)] = task.result()
+            while next_shard in shard_results:
+                prefix_hits += shard_results[next_shard]["match_count"]
+                next_shard += 1
+            if max_hits and prefix_hits >= max_hits:
+                break
+            _fill()
+    finally:
+        for task in pending:
+            task.cancel()
+    return processor.merge_search_shards(query, shards, shard_results, max_hits, page_count, workers, started)
+
+
 @app.post("/pdf/search-text")
 async def search_text(
     pdf_file: UploadFile = File(...),
@@ -375,19 +1217,55 @@ async def search_text(
     case_sensitive: bool = Form(False),
     whole_word: bool = Form(False),
     max_hits: int | None = Form(None),
-) -> JSONResponse:
+    context_words: int = Form(8, description="Words of surrounding text returned with each match (0 for none)."),
+    parallel: bool = Form(False, description="Shard pages across worker processes."),
+    workers: int | None = Form(None, description="Processes for parallel search (default: CPU count)."),
+) -> Response:
+    if context_words < 0:
+        raise HTTPException(status_code=400, detail="context_words must not be negative.")
+    cache_key = await _result_cache_key(
+        "search-text",
+        [pdf_file],
+        {
+            "query": query,
+            "case_sensitive": case_sensitive,
+            "whole_word": whole_word,
+            "max_hits": max_hits or 0,
+            "context_words": context_words,
+        },
+    )
+    cached = _cached_json_response(cache_key)
+    if cached is not None:
+        return cached
+
     workdir = _mk_workdir()
     try:
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
-        result = processor.search_text(
-            str(pdf_path),
-            query,
-            case_sensitive=case_sensitive,
-            whole_word=whole_word,
-            max_hits=max_hits or 0,
-        )
-        _ensure_success(result)
-        return JSONResponse(content=result)
+        if parallel:
+            # Every shard reopens the document, so it needs a path.
+            source = (
+                str(_save_upload(pdf_file, workdir, default_suffix=".pdf")) if IO_MODE == "memory"
+                else _pdf_input(pdf_file, workdir)
+            )
+            result = await _search_parallel(
+                source,
+                query,
+                case_sensitive=case_sensitive,
+                whole_word=whole_word,
+                max_hits=max_hits or 0,
+                context_words=context_words,
+                workers=min(_search_workers(workers), worker_pool.max_workers),
+            )
+        else:
+            result = await _run(
+                processor.search_text,
+                _pdf_input(pdf_file, workdir),
+                query,
+                case_sensitive=case_sensitive,
+                whole_word=whole_word,
+                max_hits=max_hits or 0,
+                context_words=context_words,
+            )
+        return _json_result_response(result, cache_key)
     except HTTPException:
         shutil.rmtree(workdir, ignore_errors=True)
         raise
@@ -397,6 +1275,255 @@ async def search_text(
         shutil.rmtree(workdir, ignore_errors=True)
 
 
+def _batch_path(root: str, relative: str) -> str:
+    path = os.path.realpath(os.path.join(root, relative))
+    if path != root and not path.startswith(root + os.sep):
+        raise HTTPException(status_code=400, detail=f"Path escapes PDF_API_BATCH_ROOT: {relative}")
+    return path
+
+
+def _batch_sources(
+    files: List[UploadFile],
+    directory: str | None,
+    manifest: str | None,
+    workdir: Path,
+) -> List[Tuple[str, Any]]:
+    """
+    (name, source) for every uploaded file, then for every PDF under
+    directory and every path listed in manifest, both relative to
+    PDF_API_BATCH_ROOT.
+    """
+    sources = [(upload.filename or f"upload-{index}.pdf", _pdf_input(upload, workdir)) for index, upload in enumerate(files)]
+    if directory or manifest:
+        if not BATCH_ROOT:
+            raise HTTPException(status_code=403, detail="Server-side documents need PDF_API_BATCH_ROOT to be set.")
+        root = os.path.realpath(BATCH_ROOT)
+        paths: List[str] = []
+        if directory:
+            base = _batch_path(root, directory)
+            if not os.path.isdir(base):
+                raise HTTPException(status_code=400, detail=f"Not a directory: {directory}")
+            for dirpath, dirnames, filenames in os.walk(base):
+                dirnames.sort()
+                paths.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.lower().endswith(".pdf"))
+        if manifest:
+            paths.extend(_batch_path(root, line.strip()) for line in manifest.splitlines() if line.strip())
+        sources.extend((os.path.relpath(path, root), path) for path in paths)
+    if not sources:
+        raise HTTPException(status_code=400, detail="Upload files or give a directory or manifest.")
+    return sources
+
+
+async def _batch_lines(
+    operation: str,
+    sources: List[Tuple[str, Any]],
+    params: Dict[str, Any],
+    concurrency: int,
+) -> AsyncIterator[bytes]:
+    """
+    Run PDFProcessor.batch_item for every source through the worker pool, at
+    most `concurrency` at a time, and yield one NDJSON line per document in
+    completion order, then a {"summary": ...} line with BatchStats totals.
+    All batches together take at most the pool's worker count, leaving its
+    queue to other requests; a document that still meets a full pool gets
+    the 429 as its error line.
+    """
+    stats = BatchStats()
+    queue = iter(enumerate(sources))
+    pending: set = set()
+
+    async def _one(index: int, name: str, source: Any) -> Dict[str, Any]:
+        async with _batch_slots:
+            try:
+                result = await _run(processor.batch_item, operation, index, source, params)
+            except HTTPException as exc:
+                result = {"success": False, "error": exc.detail, "index": index}
+            except Exception as exc:
+                result = {"success": False, "error": str(exc), "index": index}
+        result["document"] = name
+        return result
+
+    def _fill() -> None:
+        for index, (name, source) in queue:
+            pending.add(asyncio.ensure_future(_one(index, name, source)))
+            if len(pending) >= concurrency:
+                return
+
+    try:
+        _fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            lines = []
+            for task in done:
+                pending.discard(task)
+                result = task.result()
+                stats.add(result)
+                lines.append(json.dumps(result, separators=(",", ":")) + "\n")
+            _fill()
+            yield "".join(lines).encode("utf-8")
+        yield (json.dumps({"summary": stats.export()}) + "\n").encode("utf-8")
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _batch_response(
+    background_tasks: BackgroundTasks,
+    workdir: Path,
+    operation: str,
+    sources: List[Tuple[str, Any]],
+    params: Dict[str, Any],
+    workers: int | None,
+) -> StreamingResponse:
+    concurrency = min(workers or worker_pool.max_workers, worker_pool.max_workers)
+    background_tasks.add_task(shutil.rmtree, workdir, ignore_errors=True)
+    return StreamingResponse(
+        _batch_lines(operation, sources, params, max(1, concurrency)),
+        media_type="application/x-ndjson",
+        headers={"X-Document-Count": str(len(sources))},
+    )
+
+
+@app.post("/pdf/get-info-batch")
+async def get_info_batch(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File([], description="PDFs to inspect."),
+    directory: str | None = Form(None, description="Directory under PDF_API_BATCH_ROOT, searched recursively for PDFs."),
+    manifest: str | None = Form(None, description="Newline-separated PDF paths relative to PDF_API_BATCH_ROOT."),
+    offset: int = Form(0),
+    limit: int | None = Form(None, description="Pages described per document (default: all)."),
+    fields: str | None = Form(None, description=f"Comma-separated page fields: {', '.join(PDFProcessor.INFO_FIELDS)}."),
+    workers: int | None = Form(None, description="Documents processed at once (default and maximum: worker pool size)."),
+) -> StreamingResponse:
+    field_list = _parse_string_list(fields or "")
+    unknown = [name for name in field_list if name not in PDFProcessor.INFO_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}.")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise HTTPException(status_code=400, detail="offset and limit must not be negative.")
+
+    workdir = _mk_workdir()
+    try:
+        sources = await asyncio.to_thread(_batch_sources, files, directory, manifest, workdir)
+        params = {"offset": offset, "limit": limit, "fields": field_list or None}
+        return _batch_response(background_tasks, workdir, "get_info", sources, params, workers)
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        _cleanup_and_raise(workdir, 500, str(exc))
+
+
+@app.post("/pdf/search-text-batch")
+async def search_text_batch(
+    background_tasks: BackgroundTasks,
+    query: str = Form(..., description="Text to search for"),
+    files: List[UploadFile] = File([], description="PDFs to search."),
+    directory: str | None = Form(None, description="Directory under PDF_API_BATCH_ROOT, searched recursively for PDFs."),
+    manifest: str | None = Form(None, description="Newline-separated PDF paths relative to PDF_API_BATCH_ROOT."),
+    case_sensitive: bool = Form(False),
+    whole_word: bool = Form(False),
+    max_hits: int | None = Form(None, description="Matches returned per document."),
+    context_words: int = Form(8, description="Words of surrounding text returned with each match (0 for none)."),
+    workers: int | None = Form(None, description="Documents processed at once (default and maximum: worker pool size)."),
+) -> StreamingResponse:
+    if context_words < 0:
+        raise HTTPException(status_code=400, detail="context_words must not be negative.")
+
+    workdir = _mk_workdir()
+    try:
+        sources = await asyncio.to_thread(_batch_sources, files, directory, manifest, workdir)
+        params = {
+            "query": query,
+            "case_sensitive": case_sensitive,
+            "whole_word": whole_word,
+            "max_hits": max_hits or 0,
+            "context_words": context_words,
+        }
+        return _batch_response(background_tasks, workdir, "search_text", sources, params, workers)
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        _cleanup_and_raise(workdir, 500, str(exc))
+
+
+@app.post("/pdf/extract-text")
+async def extract_text(
+    background_tasks: BackgroundTasks,
+    pdf_file: UploadFile = File(...),
+    mode: str = Form("text", description="'text', 'words' (with bboxes) or 'layout' (blocks, lines and spans)."),
+    pages: str | None = Form(None, description='0-based pages like "0-4,9" (default: all).'),
+    sort: bool = Form(False, description="Reorder text top-left to bottom-right instead of content order."),
+) -> StreamingResponse:
+    if mode not in PDFProcessor.TEXT_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(PDFProcessor.TEXT_MODES)}.")
+    page_list = _parse_page_ranges(pages, "pages") if pages else None
+
+    workdir = _mk_workdir()
+    try:
+        # Every batch reopens the document, so process workers get a path
+        # instead of a pickled copy of the upload per batch.
+        if IO_MODE == "memory" and worker_pool.mode == "process":
+            source = str(_save_upload(pdf_file, workdir, default_suffix=".pdf"))
+        else:
+            source = _pdf_input(pdf_file, workdir)
+
+        def _batch(offset: int) -> Any:
+            return _run(
+                processor.extract_text,
+                source,
+                pages=page_list,
+                mode=mode,
+                offset=offset,
+                limit=EXTRACT_BATCH_PAGES,
+                sort=sort,
+            )
+
+        # The first batch runs before the response starts, so bad pages or
+        # an unreadable PDF still get a proper error status.
+        first = _ensure_success(await _batch(0))
+
+        async def _lines() -> AsyncIterator[bytes]:
+            result = first
+            pending: asyncio.Task | None = None
+            try:
+                while True:
+                    # Extract the next batch while this one is being sent.
+                    if result["next_offset"] is not None:
+                        pending = asyncio.ensure_future(_batch(result["next_offset"]))
+                    yield "".join(
+                        json.dumps(row, separators=(",", ":")) + "\n" for row in result["pages"]
+                    ).encode("utf-8")
+                    if pending is None:
+                        return
+                    try:
+                        result = await pending
+                    except HTTPException as exc:
+                        result = {"success": False, "error": exc.detail}
+                    pending = None
+                    if not result.get("success"):
+                        # Too late for a status code; end the stream with an error line.
+                        yield (json.dumps({"error": result.get("error", "Extraction failed.")}) + "\n").encode("utf-8")
+                        return
+            finally:
+                if pending is not None:
+                    pending.cancel()
+
+        headers = {
+            "X-Page-Count": str(first["page_count"]),
+            "X-Selected-Pages": str(first["selected_count"]),
+            "X-Text-Mode": mode,
+        }
+        background_tasks.add_task(shutil.rmtree, workdir, ignore_errors=True)
+        return StreamingResponse(_lines(), media_type="application/x-ndjson", headers=headers)
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        _cleanup_and_raise(workdir, 500, str(exc))
+
+
 @app.post("/pdf/replace-text")
 async def replace_text(
     background_tasks: BackgroundTasks,
@@ -406,6 +1533,7 @@ async def replace_text(
     replacement: str | None = Form(None, description="Replacement text (leave empty to delete)"),
     font_size: float = Form(12.0, description="Font size for replacement text"),
     font_name: str = Form("helv"),
+    font_id: str | None = Form(None, description="Font uploaded to /fonts; overrides font_name."),
     color_r: float = Form(0.0),
     color_g: float = Form(0.0),
     color_b: float = Form(0.0),
@@ -413,11 +1541,16 @@ async def replace_text(
     fill_r: float = Form(1.0),
     fill_g: float = Form(1.0),
     fill_b: float = Form(1.0),
-) -> FileResponse:
+    save_mode: str | None = Form(None, description="'full' rewrite or 'incremental' update."),
+    return_delta: bool = Form(False, description="Return only the appended bytes for incremental saves."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
+) -> Response:
     workdir = _mk_workdir()
     try:
-        pdf_path = _save_upload(pdf_file, workdir, default_suffix=".pdf")
-        output_path = workdir / "output.pdf"
+        mode = _resolve_save_mode(save_mode)
+        profile = _resolve_save_profile(save_profile)
+        font_file = _font_file(font_id)
+        source, output_path = _pdf_source(pdf_file, workdir, mode)
 
         try:
             rect_values = [float(value.strip()) for value in rect.split(",")]
@@ -427,9 +1560,10 @@ async def replace_text(
         color: Tuple[float, float, float] = (color_r, color_g, color_b)
         fill_color: Tuple[float, float, float] = (fill_r, fill_g, fill_b)
 
-        result = processor.replace_text_instance(
-            str(pdf_path),
-            str(output_path),
+        result = await _run(
+            processor.replace_text_instance,
+            source,
+            output_path,
             page=page,
             rect_coords=rect_values,
             replacement=replacement,
@@ -438,6 +1572,9 @@ async def replace_text(
             font_name=font_name,
             align=align,
             fill_color=fill_color,
+            font_file=font_file,
+            save_mode=mode,
+            save_profile=profile,
         )
 
         download_name = f"replace-text-{pdf_file.filename or 'document'}.pdf"
@@ -446,6 +1583,7 @@ async def replace_text(
             background_tasks=background_tasks,
             workdir=workdir,
             download_name=download_name,
+            return_delta=return_delta,
         )
     except HTTPException:
         shutil.rmtree(workdir, ignore_errors=True)
@@ -454,11 +1592,426 @@ async def replace_text(
         _cleanup_and_raise(workdir, 500, str(exc))
 
 
+@app.post("/pdf/replace-text-bulk")
+async def replace_text_bulk(
+    background_tasks: BackgroundTasks,
+    pdf_file: UploadFile = File(...),
+    replacements: str = Form(
+        ...,
+        description=(
+            'JSON array of {"page", "rect": [x0, y0, x1, y1], "replacement"} or '
+            '{"search", "replacement", "page"?, "case_sensitive"?, "whole_word"?} items; '
+            'each may override "font_size", "color" and "align".'
+        ),
+    ),
+    font_size: float | None = Form(None, description="Font size (default: 80% of each match's height)."),
+    font_name: str = Form("helv"),
+    font_id: str | None = Form(None, description="Font uploaded to /fonts; overrides font_name."),
+    color_r: float = Form(0.0),
+    color_g: float = Form(0.0),
+    color_b: float = Form(0.0),
+    fill_r: float = Form(1.0),
+    fill_g: float = Form(1.0),
+    fill_b: float = Form(1.0),
+    save_mode: str | None = Form(None, description="'full' rewrite or 'incremental' update."),
+    return_delta: bool = Form(False, description="Return only the appended bytes for incremental saves."),
+    save_profile: str | None = Form(None, description="'fast', 'balanced' or 'smallest' output."),
+) -> Response:
+    items = _parse_json_list(replacements, "replacements")
+    error = processor.validate_replacements(items)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    workdir = _mk_workdir()
+    try:
+        mode = _resolve_save_mode(save_mode)
+        profile = _resolve_save_profile(save_profile)
+        font_file = _font_file(font_id)
+        source, output_path = _pdf_source(pdf_file, workdir, mode)
+
+        result = await _run(
+            processor.replace_text_bulk,
+            source,
+            output_path,
+            items,
+            font_name=font_name,
+            font_size=font_size,
+            color=(color_r, color_g, color_b),
+            fill_color=(fill_r, fill_g, fill_b),
+            font_file=font_file,
+            save_mode=mode,
+            save_profile=profile,
+        )
+
+        download_name = f"replace-text-{pdf_file.filename or 'document'}.pdf"
+        return _file_result_response(
+            result=result,
+            background_tasks=background_tasks,
+            workdir=workdir,
+            download_name=download_name,
+            return_delta=return_delta,
+        )
+    except HTTPException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        _cleanup_and_raise(workdir, 500, str(exc))
+
+
+def _check_render_options(zoom: Any, width: Any, tile_size: Any) -> None:
+    def _number(value: Any) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    if not _number(zoom) or not 0 < zoom <= MAX_RENDER_ZOOM:
+        raise HTTPException(status_code=400, detail=f"zoom must be in (0, {MAX_RENDER_ZOOM:g}].")
+    if width is not None and (not _number(width) or not 0 < width <= MAX_RENDER_PIXELS):
+        raise HTTPException(status_code=400, detail=f"width must be in (0, {MAX_RENDER_PIXELS}].")
+    if tile_size is not None and (not _number(tile_size) or not 0 < tile_size <= MAX_RENDER_PIXELS):
+        raise HTTPException(status_code=400, detail=f"tile_size must be in (0, {MAX_RENDER_PIXELS}].")
+
+
+@app.post("/pdf/render")
+async def render_pages(
+    pdf_file: UploadFile | None = File(None, description="PDF to render; optional when document_hash is cached."),
+    document_hash: str | None = Form(None, description="SHA-256 returned by an earlier render."),
+    pages: str = Form("0", description='0-based pages or ranges, e.g. "0-4,9".'),
+    zoom: float = Form(1.0, description="Scale factor (1.0 = 72 dpi)."),
+    width: int | None = Form(None, description="Target width in pixels; overrides zoom."),
+    image_format: str = Form("png", description="png, jpeg or webp."),
+    tile_size: int | None = Form(None, description="Render one square tile of this many pixels."),
+    tile_x: int = Form(0),
+    tile_y: int = Form(0),
+) -> Response:
+    page_list = _parse_page_ranges(pages, "pages")
+    if not page_list:
+        raise HTTPException(status_code=400, detail="At least one page is required.")
+    if image_format not in RENDER_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid image_format '{image_format}'.")
+    _check_render_options(zoom, width, tile_size)
+    if pdf_file is None and not document_hash:
+        raise HTTPException(status_code=400, detail="Either pdf_file or document_hash is required.")
+
+    workdir = _mk_workdir()
+    try:
+        source = _pdf_input(pdf_file, workdir) if pdf_file is not None else None
+        result = await _run(
+            processor.render_pages,
+            source,
+            page_list,
+            zoom=zoom,
+            width=width,
+            image_format=image_format,
+            tile_size=tile_size,
+            tile=(tile_x, tile_y),
+            cache_dir=RENDER_CACHE_DIR,
+            cache_max_bytes=RENDER_CACHE_BYTES,
+            max_zoom=MAX_RENDER_ZOOM,
+            # An uploaded file is always hashed again rather than trusted.
+            document_hash=document_hash if source is None else None,
+        )
+        if result.get("not_cached"):
+            raise HTTPException(status_code=404, detail=result["error"])
+        _ensure_success(result)
+
+        images = result["images"]
+        headers = {
+            "X-Document-Hash": result["document_hash"],
+            "X-Cache-Hits": str(result["cached_count"]),
+        }
+        if len(images) == 1:
+            headers["X-Cache"] = "hit" if images[0]["cached"] else "miss"
+            return Response(
+                content=images[0]["data"],
+                media_type=RENDER_MEDIA_TYPES[image_format],
+                headers=headers,
+            )
+
+        def _entries() -> Iterator[Tuple[str, bytes]]:
+            # Let go of each image once it is written to the response.
+            for image in images:
+                data, image["data"] = image["data"], None
+                yield processor.image_name(image), data
+
+        headers["Content-Disposition"] = _content_disposition("pages.zip")
+        return StreamingResponse(_zip_chunks(_entries()), media_type="application/zip", headers=headers)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _apply_session_operation(session_id: str, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    session = session_cache.get(session_id)
+    result = processor.apply_to_document(session.doc, operation, params)
+    if result.get("success"):
+        session.operations_applied += 1
+        result["page_count"] = len(session.doc)
+        result["operations_applied"] = session.operations_applied
+    return result
+
+
+def _export_session(session_id: str, save_profile: str) -> Dict[str, Any]:
+    session = session_cache.get(session_id)
+    result = processor.export_document(session.doc, save_profile)
+    if result.get("success"):
+        session_cache.resize(session_id, result["output_bytes"])
+    return result
+
+
+@app.post("/sessions")
+async def open_session(pdf_file: UploadFile = File(...)) -> JSONResponse:
+    data = await pdf_file.read()
+    try:
+        session = await _run_on_document_thread(
+            session_cache.open, data, pdf_file.filename or "document.pdf"
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Could not open PDF: {exc}") from exc
+    return JSONResponse(content={"success": True, **session.describe()})
+
+
+@app.get("/sessions")
+async def session_stats() -> Dict[str, Any]:
+    return session_cache.stats()
+
+
+@app.get("/sessions/{session_id}")
+async def get_session(session_id: str) -> JSONResponse:
+    try:
+        session = session_cache.get(session_id)
+    except SessionNotFound as exc:
+        raise HTTPException(status_code=404, detail="Session not found or expired.") from exc
+    return JSONResponse(content={"success": True, **session.describe()})
+
+
+@app.post("/sessions/{session_id}/operations")
+async def apply_session_operation(
+    session_id: str,
+    operation: str = Form(..., description="Operation name, e.g. add_text or delete_pages."),
+    params: str = Form("{}", description="JSON object of operation parameters."),
+    image_file: UploadFile | None = File(None),
+) -> JSONResponse:
+    op_params = _parse_json_object(params, "params")
+    _reject_client_paths(op_params)
+    workdir = _mk_workdir()
+    try:
+        if image_file is not None:
+            op_params["image_path"] = str(_save_upload(image_file, workdir))
+
+        try:
+            result = await _run_on_document_thread(
+                _apply_session_operation, session_id, operation, op_params
+            )
+        except SessionNotFound as exc:
+            raise HTTPException(status_code=404, detail="Session not found or expired.") from exc
+
+        _ensure_success(result)
+        return JSONResponse(content=result)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@app.get("/sessions/{session_id}/export")
+async def export_session(
+    session_id: str,
+    save_profile: str | None = Query(
+        None, description="'fast', 'balanced' or 'smallest'; 'smallest' also downsamples the session's images."
+    ),
+) -> Response:
+    profile = _resolve_save_profile(save_profile)
+    try:
+        result = await _run_on_document_thread(_export_session, session_id, profile)
+    except SessionNotFound as exc:
+        raise HTTPException(status_code=404, detail="Session not found or expired.") from exc
+    _ensure_success(result)
+    return _stream_bytes(
+        result["output"],
+        media_type="application/pdf",
+        download_name=f"session-{session_id}.pdf",
+        headers={"X-Save-Profile": result["save_profile"], "X-Save-Ms": str(result["save_ms"])},
+    )
+
+
+@app.delete("/sessions/{session_id}")
+async def close_session(session_id: str) -> Dict[str, Any]:
+    closed = await _run_on_document_thread(session_cache.close, session_id)
+    if not closed:
+        raise HTTPException(status_code=404, detail="Session not found or expired.")
+    return {"success": True, "session_id": session_id}
+
+
+def _apply_job_limits(operation: str, params: Dict[str, Any]) -> None:
+    """
+    Hold job parameters to the limits of the matching synchronous endpoint.
+    """
+    if "workers" in params:
+        workers = params["workers"]
+        if workers is not None and (not isinstance(workers, int) or isinstance(workers, bool) or workers < 1):
+            raise HTTPException(status_code=400, detail="workers must be a positive integer.")
+        params["workers"] = _search_workers(workers)
+    if operation == "render":
+        for name in ("max_zoom", "document_hash"):
+            if name in params:
+                raise HTTPException(status_code=400, detail=f"'{name}' cannot be set by clients.")
+        _check_render_options(params.get("zoom", 1.0), params.get("width"), params.get("tile_size"))
+        params["max_zoom"] = MAX_RENDER_ZOOM
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    operation: str = Form(
+        ...,
+        description=(
+            "merge, redact-text, replace-text, replace-text-bulk, pipeline, optimize, extract-pages, split, render "
+            "or get-info."
+        ),
+    ),
+    params: str = Form(
+        "{}",
+        description=(
+            "JSON object of PDFProcessor arguments besides the files, e.g. "
+            '{"targets": ["secret"]} for redact-text or {"ranges": [[0, 1], [2]]} for split.'
+        ),
+    ),
+    files: List[UploadFile] = File(..., description="Input PDFs (two or more for merge)."),
+) -> JSONResponse:
+    job_params = _parse_json_object(params, "params")
+    _reject_client_paths(job_params)
+    _apply_job_limits(operation, job_params)
+    if operation == "pipeline":
+        steps = job_params.get("operations")
+        for step in steps if isinstance(steps, list) else []:
+            if isinstance(step, dict) and isinstance(step.get("params"), dict):
+                _reject_client_paths(step["params"])
+        error = processor.validate_operations(steps)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+
+    try:
+        with phase("upload"):
+            for upload in files:
+                upload.file.seek(0)
+            job = await asyncio.to_thread(job_queue.submit, operation, job_params, [upload.file for upload in files])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return JSONResponse(
+        status_code=202,
+        content={"success": True, **_job_links(job)},
+        headers={"Location": f"/jobs/{job['job_id']}"},
+    )
+
+
+def _job_links(job: Dict[str, Any]) -> Dict[str, Any]:
+    job["status_url"] = f"/jobs/{job['job_id']}"
+    if job["status"] == "succeeded":
+        job["result_url"] = f"/jobs/{job['job_id']}/result"
+    return job
+
+
+def _get_job(job_id: str) -> Dict[str, Any]:
+    try:
+        return job_queue.get(job_id)
+    except JobNotFound as exc:
+        raise HTTPException(status_code=404, detail="Job not found or expired.") from exc
+
+
+@app.get("/jobs")
+async def job_stats() -> Dict[str, Any]:
+    return job_queue.stats()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> JSONResponse:
+    return JSONResponse(content={"success": True, **_job_links(_get_job(job_id))})
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str) -> Response:
+    job = _get_job(job_id)
+    if job["status"] == "failed":
+        raise HTTPException(status_code=400, detail=job["error"] or "Job failed.")
+    if job["status"] != "succeeded":
+        raise HTTPException(
+            status_code=409, detail=f"Job is {job['status']}.", headers={"Retry-After": "1"}
+        )
+    if not job["has_file"]:
+        return JSONResponse(content=job["result"])
+
+    path, media_type = job_queue.result_file(job_id)
+    extension = "zip" if media_type == "application/zip" else "pdf"
+    return FileResponse(path=path, media_type=media_type, filename=f"{job['operation']}-{job_id}.{extension}")
+
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str) -> Dict[str, Any]:
+    job = _get_job(job_id)
+    if not job_queue.delete(job_id):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']} and cannot be deleted yet.")
+    return {"success": True, "job_id": job_id}
+
+
+@app.post("/fonts")
+async def upload_font(font_file: UploadFile = File(..., description="TrueType or OpenType font.")) -> JSONResponse:
+    with phase("upload"):
+        font_file.file.seek(0)
+        data = font_file.file.read()
+    try:
+        font = await asyncio.to_thread(font_store.put, data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return JSONResponse(content={"success": True, **font})
+
+
+@app.get("/fonts")
+async def list_fonts() -> Dict[str, Any]:
+    return {"success": True, "fonts": await asyncio.to_thread(font_store.fonts)}
+
+
 @app.get("/healthz")
 async def healthcheck() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/workers")
+async def worker_stats() -> Dict[str, Any]:
+    return worker_pool.stats()
+
+
+@app.get("/cache")
+async def cache_stats() -> Dict[str, Any]:
+    stats = result_cache.stats()
+    if document_store is not None:
+        stats["document_store"] = document_store.stats()
+    return stats
+
+
+@app.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (PDF_API_METRICS=0).")
+    cache = result_cache.stats()
+    sessions = session_cache.stats()
+    jobs = job_queue.stats()["jobs"]
+    samples = {
+        "pdf_api_worker_jobs_in_flight": ("gauge", "Jobs running or queued in the worker pool.", worker_pool.in_flight),
+        "pdf_api_worker_capacity": ("gauge", "Jobs the worker pool accepts before returning 429.", worker_pool.capacity),
+        "pdf_api_sessions_open": ("gauge", "Open /sessions documents.", sessions["sessions"]),
+        "pdf_api_sessions_bytes": ("gauge", "Estimated bytes held by open sessions.", sessions["total_bytes"]),
+        "pdf_api_jobs_queued": ("gauge", "Async jobs waiting for a job worker.", jobs["queued"]),
+        "pdf_api_jobs_running": ("gauge", "Async jobs being processed.", jobs["running"]),
+        "pdf_api_result_cache_hits_total": ("counter", "Result cache hits.", cache["hits"]),
+        "pdf_api_result_cache_misses_total": ("counter", "Result cache misses.", cache["misses"]),
+    }
+    if document_store is not None:
+        store = document_store.stats()
+        samples["pdf_api_document_store_bytes"] = ("gauge", "Bytes of documents in the shared store.", store["bytes"])
+        samples["pdf_api_document_store_documents"] = ("gauge", "Documents in the shared store.", store["documents"])
+    return PlainTextResponse(
+        metrics_registry.render(samples),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,27 @@
+import os
+import sys
+from typing import List
+
+import fitz
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """
+    Write a PDF with one page per list of lines and return its path.
+    """
+    def make(pages: List[List[str]], name: str = "input.pdf") -> str:
+        doc = fitz.open()
+        for lines in pages:
+            page = doc.new_page()
+            for number, line in enumerate(lines):
+                page.insert_text((72, 72 + 20 * number), line, fontsize=12)
+        path = str(tmp_path / name)
+        doc.save(path)
+        doc.close()
+        return path
+
+    return make
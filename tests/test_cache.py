@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+import pdf_cache
+from pdf_cache import DiskLRUCache, MemoryLRUCache, ResultCache
+
+
+@pytest.fixture(params=["memory", "disk"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryLRUCache(1024 * 1024)
+    return DiskLRUCache(str(tmp_path / "results"), 1024 * 1024)
+
+
+def test_result_cache_counts_hits_and_misses(backend):
+    cache = ResultCache(backend, ttl=60)
+    key = cache.make_key("search-text", ["abc"], {"query": "x", "max_hits": 0})
+    assert key == cache.make_key("search-text", ["abc"], {"max_hits": 0, "query": "x"})
+
+    assert cache.get(key) is None
+    cache.put(key, {"match_count": 1}, b"payload")
+    assert cache.get(key) == ({"match_count": 1}, b"payload")
+    assert cache.get(cache.make_key("search-text", ["abd"], {"query": "x", "max_hits": 0})) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["expired"]) == (1, 2, 1, 0)
+
+
+def test_result_cache_entries_expire_after_ttl(backend, monkeypatch):
+    cache = ResultCache(backend, ttl=10)
+    key = cache.make_key("get-info", ["abc"], {})
+    now = time.time()
+    monkeypatch.setattr(pdf_cache.time, "time", lambda: now)
+    cache.put(key, {}, b"payload")
+
+    monkeypatch.setattr(pdf_cache.time, "time", lambda: now + 9)
+    assert cache.get(key) is not None
+    monkeypatch.setattr(pdf_cache.time, "time", lambda: now + 11)
+    assert cache.get(key) is None
+    assert cache.get(key) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expired"]) == (1, 2, 1)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryLRUCache(10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.get("a")
+    cache.put("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,63 @@
+import io
+import os
+
+import pytest
+
+from pdf_document_store import DocumentNotFound, DocumentStore
+
+
+def test_identical_documents_share_one_file(tmp_path):
+    store = DocumentStore(str(tmp_path), 1024 * 1024)
+
+    first = store.put(io.BytesIO(b"%PDF-1.7 same"))
+    second = store.put(io.BytesIO(b"%PDF-1.7 same"))
+
+    assert first == second
+    assert store.refcount(first) == 2
+    with open(store.path(first), "rb") as handle:
+        assert handle.read() == b"%PDF-1.7 same"
+    stats = store.stats()
+    assert (stats["documents"], stats["stored"], stats["reused"], stats["references"]) == (1, 1, 1, 2)
+
+    store.release(first)
+    assert store.refcount(first) == 1
+    store.release(first)
+    assert store.refcount(first) == 0
+    store.close()
+
+
+def test_only_unreferenced_documents_are_evicted(tmp_path):
+    store = DocumentStore(str(tmp_path), 16)
+
+    held = store.put(io.BytesIO(b"held document body"))
+    assert os.path.exists(store.path(held))
+    released = store.put(io.BytesIO(b"released document body"))
+    store.release(released)
+
+    assert not os.path.exists(store.path(released))
+    assert os.path.exists(store.path(held))
+    with pytest.raises(DocumentNotFound):
+        store.acquire(released)
+
+    store.release(held)
+    assert not os.path.exists(store.path(held))
+    assert store.stats()["evicted"] == 2
+    store.close()
+
+
+def test_references_held_elsewhere_block_eviction(tmp_path):
+    # Two stores on one directory stand in for two processes.
+    owner = DocumentStore(str(tmp_path), 1024 * 1024)
+    other = DocumentStore(str(tmp_path), 0)
+    doc_id = owner.put(io.BytesIO(b"shared document"))
+
+    assert other.acquire(doc_id) == owner.path(doc_id)
+    other.release(doc_id)
+    assert other.evict() == 0
+    assert os.path.exists(owner.path(doc_id))
+
+    owner.release(doc_id)
+    assert other.evict() == 1
+    assert not os.path.exists(owner.path(doc_id))
+    owner.close()
+    other.close()
@@ -0,0 +1,53 @@
+import fitz
+import pytest
+
+from pdf_processor import PDFProcessor
+
+
+def page_fonts(doc: fitz.Document):
+    return [{font[0] for font in page.get_fonts()} for page in doc]
+
+
+@pytest.fixture
+def font_file(tmp_path):
+    path = tmp_path / "serif.otf"
+    path.write_bytes(fitz.Font("tiro").buffer)
+    return str(path)
+
+
+@pytest.mark.parametrize("custom", [False, True])
+def test_font_is_embedded_once_per_document(make_pdf, font_file, custom):
+    font = {"font_file": font_file} if custom else {"font_name": "helv"}
+    with fitz.open(make_pdf([["one"], ["two"], ["three"]])) as doc:
+        results = [
+            PDFProcessor.apply_to_document(
+                doc, "add_text", {"text": f"added {page}", "x": 72, "y": 300, "page": page, **font}
+            )
+            for page in range(3)
+        ]
+        fonts = page_fonts(doc)
+        text = doc[2].get_text()
+
+    assert all(result["success"] for result in results), results
+    assert results[-1]["font_embeds"] == 1
+    assert results[-1]["font_embeds_avoided"] == 2
+    # Every page references the same font objects as the first.
+    assert all(page == fonts[0] for page in fonts)
+    assert "added 2" in text
+
+
+def test_font_reuse_survives_save_and_reopen(make_pdf, tmp_path, font_file):
+    output = str(tmp_path / "output.pdf")
+    params = {"x": 72, "y": 300, "font_file": font_file}
+    operations = [
+        {"operation": "add_text", "params": {"text": f"page {page}", "page": page, **params}}
+        for page in range(2)
+    ]
+
+    result = PDFProcessor.apply_operations(make_pdf([["one"], ["two"]]), output, operations)
+
+    assert result["success"], result
+    with fitz.open(output) as doc:
+        fonts = page_fonts(doc)
+        assert "page 1" in doc[1].get_text()
+    assert fonts[0] == fonts[1]
@@ -0,0 +1,50 @@
+import fitz
+import pytest
+
+from pdf_processor import PDFProcessor
+
+
+@pytest.fixture
+def image_file(tmp_path):
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 40, 20), False)
+    pixmap.set_rect(pixmap.irect, (20, 120, 220))
+    path = tmp_path / "logo.png"
+    path.write_bytes(pixmap.tobytes("png"))
+    return str(path)
+
+
+def page_images(path: str):
+    with fitz.open(path) as doc:
+        return [[image[0] for image in page.get_images()] for page in doc]
+
+
+def test_image_on_many_pages_is_embedded_once(make_pdf, tmp_path, image_file):
+    source = make_pdf([["one"], ["two"], ["three"]])
+    output = str(tmp_path / "output.pdf")
+
+    result = PDFProcessor.add_image(source, output, image_file, 72, 72, pages="all")
+
+    assert result["success"], result
+    assert result["pages_changed"] == 3
+    assert (result["image_embeds"], result["image_embeds_avoided"]) == (1, 2)
+    images = page_images(output)
+    assert len(images[0]) == 1
+    assert images == [images[0]] * 3
+    with fitz.open(output) as doc:
+        # Natural size: 40 x 20 pixels at 96 dpi.
+        assert doc[1].get_image_rects(images[0][0])[0] == fitz.Rect(72, 72, 102, 87)
+
+
+def test_image_is_reused_by_later_operations(make_pdf, tmp_path, image_file):
+    output = str(tmp_path / "output.pdf")
+    operations = [
+        {"operation": "add_image", "params": {"image_path": image_file, "x": 72, "y": 72, "page": page}}
+        for page in range(2)
+    ]
+
+    result = PDFProcessor.apply_operations(make_pdf([["one"], ["two"]]), output, operations)
+
+    assert result["success"], result
+    images = page_images(output)
+    assert images[0] == images[1]
+    assert len(images[0]) == 1
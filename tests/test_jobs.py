@@ -0,0 +1,55 @@
+import time
+import zipfile
+
+from pdf_jobs import JobQueue
+from pdf_worker_pool import WorkerPool
+
+
+def wait_for(queue: JobQueue, job_id: str, timeout: float = 30) -> dict:
+    deadline = time.monotonic() + timeout
+    job = queue.get(job_id)
+    while job["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+        time.sleep(0.05)
+        job = queue.get(job_id)
+    return job
+
+
+def test_running_job_is_retried_after_restart(make_pdf, tmp_path):
+    source = make_pdf([["one"], ["two"], ["three"]])
+    directory = str(tmp_path / "jobs")
+
+    # A queue that dies after claiming the job leaves it marked running.
+    crashed = JobQueue(directory, WorkerPool(mode="thread", max_workers=1))
+    with open(source, "rb") as handle:
+        job_id = crashed.submit("split", {"ranges": [[0], [1, 2]]}, [handle])["job_id"]
+    assert crashed._claim_next() == job_id
+    assert crashed.get(job_id)["status"] == "running"
+
+    restarted = JobQueue(directory, WorkerPool(mode="thread", max_workers=1))
+    restarted.start()
+    try:
+        job = wait_for(restarted, job_id)
+    finally:
+        restarted.stop()
+
+    assert job["status"] == "succeeded", job
+    assert job["attempts"] == 2
+    path, media_type = restarted.result_file(job_id)
+    assert media_type == "application/zip"
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist() == ["part-1.pdf", "part-2.pdf"]
+
+
+def test_job_interrupted_too_often_fails(make_pdf, tmp_path):
+    source = make_pdf([["one"]])
+    queue = JobQueue(str(tmp_path / "jobs"), WorkerPool(mode="thread", max_workers=1))
+    with open(source, "rb") as handle:
+        job_id = queue.submit("get-info", {}, [handle])["job_id"]
+
+    for _ in range(JobQueue.MAX_ATTEMPTS):
+        assert queue._claim_next() == job_id
+        queue.recover()
+
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "Interrupted too many times."
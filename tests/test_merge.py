@@ -0,0 +1,53 @@
+import fitz
+
+from pdf_processor import PDFProcessor
+
+
+def image_pdf(path: str, text: str) -> str:
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+    pixmap.set_rect(pixmap.irect, (200, 30, 30))
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), text)
+    page.insert_image(fitz.Rect(72, 100, 172, 200), stream=pixmap.tobytes("png"))
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def page_texts(path: str):
+    with fitz.open(path) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+def image_xrefs(path: str):
+    with fitz.open(path) as doc:
+        return {image[0] for page in doc for image in page.get_images()}
+
+
+def test_streaming_merge_keeps_page_order_across_flushes(make_pdf, tmp_path):
+    inputs = [make_pdf([[f"doc {n} page {p}"] for p in range(2)], name=f"in-{n}.pdf") for n in range(3)]
+    output = str(tmp_path / "merged.pdf")
+
+    result = PDFProcessor.merge_pdfs(inputs, output, memory_limit=1, save_profile="fast")
+
+    assert result["success"], result
+    assert result["flushes"] == 3
+    assert page_texts(output) == [f"doc {n} page {p}" for n in range(3) for p in range(2)]
+
+
+def test_merge_deduplicates_shared_images(tmp_path):
+    first = image_pdf(str(tmp_path / "first.pdf"), "first")
+    second = image_pdf(str(tmp_path / "second.pdf"), "second")
+    plain = str(tmp_path / "plain.pdf")
+    deduplicated = str(tmp_path / "deduplicated.pdf")
+
+    assert PDFProcessor.merge_pdfs([first, second], plain, save_profile="fast")["success"]
+    result = PDFProcessor.merge_pdfs([first, second], deduplicated, deduplicate=True, save_profile="fast")
+
+    assert result["success"], result
+    assert result["deduplicated"]
+    assert page_texts(deduplicated) == ["first", "second"]
+    assert len(image_xrefs(plain)) == 2
+    assert len(image_xrefs(deduplicated)) == 1
+    assert result["bytes_saved"] > 0
@@ -0,0 +1,62 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from pdf_metrics import MetricsMiddleware, MetricsRegistry, count_pages, default_registry, phase
+
+
+def test_registry_renders_counters_histograms_and_samples():
+    registry = MetricsRegistry()
+    registry.describe("requests_total", "counter", "Requests.")
+    registry.describe("duration_seconds", "histogram", "Durations.", buckets=(0.1, 1.0))
+    registry.inc("requests_total", endpoint="/a", status=200)
+    registry.inc("requests_total", 2, endpoint="/a", status=200)
+    registry.inc("requests_total", endpoint='/"b"', status=500)
+    registry.observe("duration_seconds", 0.05, endpoint="/a")
+    registry.observe("duration_seconds", 0.5, endpoint="/a")
+    registry.observe("duration_seconds", 2.0, endpoint="/a")
+
+    lines = registry.render({"open_sessions": ("gauge", "Open sessions.", 4)}).splitlines()
+
+    assert lines == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{endpoint="/a",status="200"} 3',
+        'requests_total{endpoint="/\\"b\\"",status="500"} 1',
+        "# HELP duration_seconds Durations.",
+        "# TYPE duration_seconds histogram",
+        'duration_seconds_bucket{endpoint="/a",le="0.1"} 1',
+        'duration_seconds_bucket{endpoint="/a",le="1"} 2',
+        'duration_seconds_bucket{endpoint="/a",le="+Inf"} 3',
+        'duration_seconds_count{endpoint="/a"} 3',
+        'duration_seconds_sum{endpoint="/a"} 2.55',
+        "# HELP open_sessions Open sessions.",
+        "# TYPE open_sessions gauge",
+        "open_sessions 4",
+    ]
+
+
+def test_middleware_records_requests_by_route_template():
+    registry = default_registry()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.post("/items/{item_id}")
+    async def item(item_id: int, request: Request) -> dict:
+        await request.body()
+        with phase("render"):
+            count_pages(3)
+        return {"item": item_id}
+
+    client = TestClient(app)
+    response = client.post("/items/7", content=b"12345")
+    client.post("/items/8")
+
+    assert response.status_code == 200
+    assert "render;dur=" in response.headers["server-timing"]
+    assert "total;dur=" in response.headers["server-timing"]
+    text = registry.render()
+    assert 'pdf_api_requests_total{endpoint="/items/{item_id}",method="POST",status="200"} 2' in text
+    assert 'pdf_api_request_bytes_total{endpoint="/items/{item_id}"} 5' in text
+    assert 'pdf_api_pages_processed_total{endpoint="/items/{item_id}"} 6' in text
+    assert 'pdf_api_request_duration_seconds_count{endpoint="/items/{item_id}"} 2' in text
+    assert 'pdf_api_phase_duration_seconds_count{endpoint="/items/{item_id}",phase="render"} 2' in text
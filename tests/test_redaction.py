@@ -0,0 +1,17 @@
+import fitz
+
+from pdf_processor import PDFProcessor
+
+
+def test_literal_redaction_removes_whole_and_partial_word_matches(make_pdf, tmp_path):
+    source = make_pdf([["Invoice ACME page 0"], ["Call ACME Corp. about ACMEWidget"]])
+    output = str(tmp_path / "output.pdf")
+
+    result = PDFProcessor.redact_text(source, output, ["ACME"], case_sensitive=True)
+
+    assert result["success"], result
+    assert result["removed_count"] == 3
+    with fitz.open(output) as doc:
+        first, second = (" ".join(page.get_text().split()) for page in doc)
+    assert first == "Invoice page 0"
+    assert second == "Call Corp. about Widget"
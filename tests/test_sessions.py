@@ -0,0 +1,48 @@
+import pytest
+
+from pdf_sessions import DocumentSessionCache, SessionNotFound
+
+
+@pytest.fixture
+def pdf_bytes(make_pdf):
+    with open(make_pdf([["session page"]]), "rb") as handle:
+        return handle.read()
+
+
+def test_least_recently_used_session_is_evicted(pdf_bytes):
+    cache = DocumentSessionCache(max_documents=2)
+    first = cache.open(pdf_bytes)
+    second = cache.open(pdf_bytes)
+    cache.get(first.session_id)
+    third = cache.open(pdf_bytes)
+
+    with pytest.raises(SessionNotFound):
+        cache.get(second.session_id)
+    assert second.doc.is_closed
+    assert cache.get(first.session_id) is first
+    assert cache.get(third.session_id) is third
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sessions_are_evicted_by_size(pdf_bytes):
+    cache = DocumentSessionCache(max_documents=10, max_bytes=len(pdf_bytes) * 2)
+    first = cache.open(pdf_bytes)
+    second = cache.open(pdf_bytes)
+    cache.resize(second.session_id, len(pdf_bytes) * 2)
+
+    with pytest.raises(SessionNotFound):
+        cache.get(first.session_id)
+    # The session being resized is kept even when it alone is over budget.
+    cache.resize(second.session_id, len(pdf_bytes) * 5)
+    assert cache.get(second.session_id) is second
+    assert cache.stats()["sessions"] == 1
+
+
+def test_closed_session_is_gone(pdf_bytes):
+    cache = DocumentSessionCache()
+    session = cache.open(pdf_bytes)
+
+    assert cache.close(session.session_id)
+    assert not cache.close(session.session_id)
+    with pytest.raises(SessionNotFound):
+        cache.get(session.session_id)
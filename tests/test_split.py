@@ -0,0 +1,43 @@
+import fitz
+import pytest
+
+from pdf_processor import PDFProcessor
+
+
+def part_texts(part: dict):
+    source = {"stream": part["output"]} if "output" in part else {"filename": part["output_path"]}
+    with fitz.open(**source) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_split_writes_one_part_per_range(make_pdf, tmp_path, workers):
+    source = make_pdf([[f"page {number}"] for number in range(6)])
+
+    result = PDFProcessor.split_pdf(source, [[0, 1, 2], [5, 3], [4]], str(tmp_path), workers=workers)
+
+    assert result["success"], result
+    assert [part["index"] for part in result["parts"]] == [0, 1, 2]
+    assert [part_texts(part) for part in result["parts"]] == [
+        ["page 0", "page 1", "page 2"], ["page 5", "page 3"], ["page 4"]
+    ]
+    assert [part["output_path"] for part in result["parts"]] == [
+        str(tmp_path / f"part-{number}.pdf") for number in (1, 2, 3)
+    ]
+
+
+def test_split_returns_bytes_without_output_dir(make_pdf):
+    with open(make_pdf([["page 0"], ["page 1"]]), "rb") as handle:
+        data = handle.read()
+
+    result = PDFProcessor.split_pdf(data, [[1], [0]])
+
+    assert result["success"], result
+    assert [part_texts(part) for part in result["parts"]] == [["page 1"], ["page 0"]]
+
+
+def test_split_rejects_invalid_pages(make_pdf):
+    result = PDFProcessor.split_pdf(make_pdf([["page 0"]]), [[0], [3]])
+
+    assert not result["success"]
+    assert "Invalid page numbers: [3]" in result["error"]
@@ -0,0 +1,50 @@
+import fitz
+
+from pdf_processor import PDFProcessor
+
+
+def xobjects(page: fitz.Page):
+    return {xobject[0] for xobject in page.get_xobjects()}
+
+
+def test_stamp_shares_one_form_between_pages_of_a_size(make_pdf, tmp_path):
+    source = make_pdf([[f"page {number}"] for number in range(20)])
+    output = str(tmp_path / "output.pdf")
+
+    result = PDFProcessor.stamp(source, output, text="DRAFT", opacity=0.5, save_profile="fast")
+
+    assert result["success"], result
+    assert result["pages_changed"] == 20
+    assert result["stamp_forms"] == 1
+    with fitz.open(source) as original, fitz.open(output) as doc:
+        # The stamp adds a handful of objects, not a few per page.
+        assert doc.xref_length() - original.xref_length() < 20
+        assert all("DRAFT" in page.get_text() for page in doc)
+        assert xobjects(doc[0]) == xobjects(doc[19])
+
+
+def test_stamp_adds_a_form_per_page_geometry(tmp_path):
+    source = str(tmp_path / "input.pdf")
+    doc = fitz.open()
+    for width, height in [(612, 792), (612, 792), (842, 595), (612, 792)]:
+        doc.new_page(width=width, height=height).insert_text((72, 72), "body")
+    doc.save(source)
+    doc.close()
+    output = str(tmp_path / "output.pdf")
+
+    result = PDFProcessor.stamp(source, output, text="COPY", pages=[0, 1, 2, 3], overlay=False)
+
+    assert result["success"], result
+    assert result["stamp_forms"] == 2
+    with fitz.open(output) as stamped:
+        for page in stamped:
+            text = page.get_text()
+            # Behind the content, so the stamp comes first.
+            assert text.index("COPY") < text.index("body")
+
+
+def test_stamp_rejects_invalid_pages(make_pdf, tmp_path):
+    result = PDFProcessor.stamp(make_pdf([["one"]]), str(tmp_path / "output.pdf"), text="X", pages=[0, 4])
+
+    assert not result["success"]
+    assert result["error"] == "Invalid page numbers: [4]"
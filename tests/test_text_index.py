@@ -0,0 +1,82 @@
+import fitz
+import pytest
+
+from pdf_processor import PDFProcessor
+import pdf_text_index
+from pdf_text_index import TextIndex, get_text_index
+
+
+def page_text(path: str, page: int = 0) -> str:
+    with fitz.open(path) as doc:
+        return doc[page].get_text()
+
+
+def test_whole_word_replacement_keeps_adjacent_punctuation(make_pdf, tmp_path):
+    source = make_pdf([["The secret. Keep it secret, please.", "A (secret) plan"]])
+    output = str(tmp_path / "output.pdf")
+
+    result = PDFProcessor.replace_text_bulk(
+        source, output, [{"search": "secret", "replacement": "", "whole_word": True}]
+    )
+
+    assert result["success"], result
+    assert result["replaced_count"] == 3
+    text = page_text(output)
+    assert "secret" not in text
+    assert "The . Keep it , please." in " ".join(text.split())
+    assert "A ( ) plan" in " ".join(text.split())
+
+
+def test_whole_word_search_keeps_query_punctuation(make_pdf):
+    source = make_pdf([["The secret. Keep it secret, please.", "A (secret.) plan and a secret"]])
+
+    with fitz.open(source) as doc:
+        index = TextIndex.build(doc)
+    punctuated = index.search_page(0, "secret.", whole_word=True)
+    bare = index.search_page(0, "secret", whole_word=True)
+
+    assert [text for _rect, text, _first, _end in punctuated] == ["secret.", "secret."]
+    assert len(bare) == 4
+
+
+def test_partial_word_hits_use_glyph_boxes(make_pdf):
+    source = make_pdf([["Williams mmmiiillmmm", "The secret. plan"]])
+
+    with fitz.open(source) as doc:
+        page = doc[0]
+        for query in ("iii", "iam", "Williams", "ms mmm", "secret."):
+            result = PDFProcessor.search_text(source, query)
+            assert result["success"], result
+            expected = [value for rect in page.search_for(query) for value in rect]
+            found = [value for match in result["matches"] for value in match["rect"]]
+            assert found == pytest.approx(expected, abs=0.01), query
+
+
+@pytest.mark.parametrize(
+    "line, search, expected",
+    [("Williams", "iam", "Will s"), ("mmmiiillmmm", "iii", "mmm llmmm")],
+)
+def test_partial_word_replacement_removes_exactly_the_match(make_pdf, tmp_path, line, search, expected):
+    source = make_pdf([[line]])
+    output = str(tmp_path / "output.pdf")
+
+    result = PDFProcessor.replace_text_bulk(source, output, [{"search": search, "replacement": ""}])
+
+    assert result["success"], result
+    assert result["replaced_count"] == 1
+    assert " ".join(page_text(output).split()) == expected
+
+
+def test_text_index_cache_is_shared_by_files_and_buffers(make_pdf, monkeypatch):
+    source = make_pdf([["An indexed page"]])
+    with open(source, "rb") as handle:
+        data = handle.read()
+    monkeypatch.setattr(pdf_text_index, "_cache", pdf_text_index.TextIndexCache(4))
+
+    with PDFProcessor._open_document(source) as doc:
+        first = get_text_index(doc)
+    with PDFProcessor._open_document(data) as doc:
+        assert get_text_index(doc) is first
+    with PDFProcessor._open_document(memoryview(data)) as doc:
+        doc[0].insert_text((72, 200), "edited")
+        assert get_text_index(doc) is not first
@@ -0,0 +1,57 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from pdf_worker_pool import WorkerCrashed, WorkerPool, WorkerPoolFull, WorkerTimeout, default_start_method
+
+
+def process_pool(**options) -> WorkerPool:
+    return WorkerPool(mode="process", start_method=default_start_method(), **options)
+
+
+def test_full_pool_rejects_new_work():
+    pool = WorkerPool(mode="thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = pool.submit(release.wait)
+        queued = pool.submit(release.wait)
+        with pytest.raises(WorkerPoolFull):
+            pool.submit(release.wait)
+        assert pool.in_flight == 2
+
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        assert pool.submit(abs, -1).result(timeout=5) == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_timed_out_process_job_is_terminated():
+    pool = process_pool(max_workers=1, max_queue=0, timeout=0.5)
+    try:
+        with pytest.raises(WorkerTimeout):
+            asyncio.run(pool.run(time.sleep, 60))
+
+        deadline = time.monotonic() + 10
+        while pool.in_flight and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool.in_flight == 0
+        assert asyncio.run(pool.run(abs, -2)) == 2
+    finally:
+        pool.shutdown()
+
+
+def test_crashed_worker_is_replaced():
+    pool = process_pool(max_workers=1, timeout=30)
+    try:
+        with pytest.raises(WorkerCrashed):
+            asyncio.run(pool.run(os._exit, 1))
+        assert asyncio.run(pool.run(abs, -3)) == 3
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()